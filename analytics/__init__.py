@@ -5,8 +5,27 @@ from .performance import (
     max_drawdown,
     turnover,
     summarize_performance,
+    summarize_performance_batch,
+)
+from .rolling import (
+    rolling_volatility,
+    rolling_sharpe,
+    drawdown_curve,
+    rolling_turnover,
+    RollingSharpeTracker,
+    DrawdownTracker,
+    RollingTurnoverTracker,
+)
+from .bootstrap import (
+    bootstrap_indices,
+    path_metrics,
+    bootstrap_metrics,
+    bootstrap_confidence,
 )
 
 __all__ = [
-    'sharpe_ratio', 'cagr', 'max_drawdown', 'turnover', 'summarize_performance'
+    'sharpe_ratio', 'cagr', 'max_drawdown', 'turnover', 'summarize_performance',
+    'summarize_performance_batch', 'rolling_volatility', 'rolling_sharpe', 'drawdown_curve',
+    'rolling_turnover', 'RollingSharpeTracker', 'DrawdownTracker', 'RollingTurnoverTracker',
+    'bootstrap_indices', 'path_metrics', 'bootstrap_metrics', 'bootstrap_confidence',
 ]
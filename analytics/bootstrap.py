@@ -0,0 +1,123 @@
+from __future__ import annotations
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .performance import TRADING_DAYS, _infer_periods_per_year
+
+BOOTSTRAP_METHODS = ('stationary', 'block', 'iid')
+
+
+def bootstrap_indices(n: int, n_paths: int, block_size: float = 20, method: str = 'stationary',
+                      rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Row indices of `n_paths` resampled paths of length `n`, as one (n_paths, n) matrix.
+
+    - 'stationary': Politis-Romano stationary bootstrap; blocks start at
+      random offsets and have geometric lengths with mean `block_size`.
+    - 'block': circular moving-block bootstrap with fixed `block_size`.
+    - 'iid': independent draws (block size 1).
+
+    Blocks wrap around the end of the sample.
+    """
+    if method not in BOOTSTRAP_METHODS:
+        raise ValueError(f"method must be one of {BOOTSTRAP_METHODS}")
+    if n < 1 or n_paths < 1:
+        raise ValueError("n and n_paths must be >= 1")
+    rng = np.random.default_rng() if rng is None else rng
+    if method == 'iid':
+        return rng.integers(0, n, size=(n_paths, n))
+    if method == 'block':
+        size = max(int(block_size), 1)
+        starts = rng.integers(0, n, size=(n_paths, -(-n // size)))
+        idx = (starts[:, :, None] + np.arange(size)) % n
+        return idx.reshape(n_paths, -1)[:, :n]
+    # stationary: a new block starts at each row with probability 1 / block_size
+    new_block = rng.random((n_paths, n)) < 1.0 / max(float(block_size), 1.0)
+    new_block[:, 0] = True
+    offsets = rng.integers(0, n, size=(n_paths, n))
+    t = np.arange(n)
+    block_start = np.maximum.accumulate(np.where(new_block, t, 0), axis=1)
+    return (np.take_along_axis(offsets, block_start, axis=1) + t - block_start) % n
+
+
+def path_metrics(returns: np.ndarray, periods_per_year: int = TRADING_DAYS) -> pd.DataFrame:
+    """CAGR, Sharpe and MaxDrawdown of each row of a (paths, periods) return matrix.
+
+    Paths compound from 1.0, which also counts as the first peak. CAGR
+    annualizes by `periods / periods_per_year` years (-100% once a path is
+    wiped out); Sharpe uses the population stdev and is 0.0 for flat paths,
+    as in `sharpe_ratio`.
+    """
+    r = np.atleast_2d(np.asarray(returns, dtype=float))
+    n = r.shape[1]
+    growth = np.cumprod(1 + r, axis=1)
+    final = growth[:, -1]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cagr = np.where(final > 0, final ** (periods_per_year / n) - 1, -1.0)
+        mean = r.mean(axis=1)
+        vol = r.std(axis=1)
+        sharpe = np.where(np.isclose(vol, 0), 0.0, np.sqrt(periods_per_year) * mean / vol)
+        peak = np.maximum.accumulate(np.maximum(growth, 1.0), axis=1)
+        max_dd = (growth / peak - 1).min(axis=1)
+    return pd.DataFrame({'CAGR': cagr, 'Sharpe': sharpe, 'MaxDrawdown': max_dd})
+
+
+def bootstrap_metrics(returns: pd.Series, n_paths: int = 10_000, block_size: float = 20,
+                      method: str = 'stationary', periods_per_year: Optional[int] = None,
+                      chunk_size: int = 1_000, seed: Optional[int] = None) -> pd.DataFrame:
+    """CAGR/Sharpe/MaxDrawdown of `n_paths` bootstrap resamples of `returns`.
+
+    Paths are generated and evaluated `chunk_size` at a time (one index
+    matrix and one batched `path_metrics` call per chunk), bounding memory to
+    about `chunk_size * len(returns)` floats. NaN returns are dropped first.
+    Results are reproducible for a given `seed` and `chunk_size`.
+    """
+    clean = returns.dropna()
+    values = clean.to_numpy(dtype=float)
+    if len(values) == 0:
+        raise ValueError("returns has no non-NaN values")
+    ppy = _periods_per_year(clean, periods_per_year)
+    rng = np.random.default_rng(seed)
+    chunks = []
+    for start in range(0, n_paths, max(int(chunk_size), 1)):
+        count = min(chunk_size, n_paths - start)
+        idx = bootstrap_indices(len(values), count, block_size, method, rng)
+        chunks.append(path_metrics(values[idx], ppy))
+    return pd.concat(chunks, ignore_index=True)
+
+
+def bootstrap_confidence(returns: pd.Series, confidence: float = 0.95, n_paths: int = 10_000,
+                         block_size: float = 20, method: str = 'stationary',
+                         periods_per_year: Optional[int] = None, chunk_size: int = 1_000,
+                         seed: Optional[int] = None,
+                         metrics: Sequence[str] = ('CAGR', 'Sharpe', 'MaxDrawdown')) -> pd.DataFrame:
+    """Percentile confidence intervals for the strategy metrics.
+
+    Returns one row per metric with the point 'estimate' on the original
+    series, the bootstrap 'mean' and 'std', and the 'lower'/'upper' bounds of
+    the central `confidence` interval.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be in (0, 1)")
+    clean = returns.dropna()
+    ppy = _periods_per_year(clean, periods_per_year)
+    sims = bootstrap_metrics(clean, n_paths, block_size, method, ppy, chunk_size, seed)[list(metrics)]
+    tail = (1 - confidence) / 2
+    return pd.DataFrame({
+        'estimate': path_metrics(clean.to_numpy(dtype=float), ppy).iloc[0][list(metrics)],
+        'mean': sims.mean(),
+        'std': sims.std(),
+        'lower': sims.quantile(tail),
+        'upper': sims.quantile(1 - tail),
+    })
+
+
+def _periods_per_year(returns: pd.Series, periods_per_year: Optional[int]) -> int:
+    if periods_per_year is not None:
+        return periods_per_year
+    if isinstance(returns.index, pd.DatetimeIndex):
+        return _infer_periods_per_year(returns.index)
+    return TRADING_DAYS
+
+__all__ = ['bootstrap_indices', 'path_metrics', 'bootstrap_metrics', 'bootstrap_confidence']
@@ -1,7 +1,12 @@
 from __future__ import annotations
+import warnings
+from typing import Any, Mapping, Sequence, Tuple
+
 import pandas as pd
 import numpy as np
 
+from backtest.ledger import TradeLedger
+
 TRADING_DAYS = 252
 
 
@@ -91,30 +96,36 @@ def max_drawdown(equity: pd.Series) -> float:
     return dd.min()
 
 
-def turnover(trades: pd.DataFrame, equity_series: pd.Series | None = None) -> float:
+def turnover(trades: pd.DataFrame | TradeLedger, equity_series: pd.Series | None = None) -> float:
     """Approximate annualized turnover.
 
     Parameters
-    - trades: DataFrame with columns ['date','notional'] where notional is signed trade size.
+    - trades: DataFrame with columns ['date','notional'] where notional is signed trade size,
+      or a `backtest.ledger.TradeLedger` (aggregated without building a DataFrame).
     - equity_series: optional equity series used to scale daily notionals.
     """
-    if trades.empty:
-        return 0.0
-    notionals = trades.copy()
-    notionals['abs_notional'] = notionals['notional'].abs()
-    daily = notionals.groupby('date')['abs_notional'].sum()
+    if isinstance(trades, TradeLedger):
+        if len(trades) == 0:
+            return 0.0
+        daily = trades.daily_abs_notional()
+    else:
+        if trades.empty:
+            return 0.0
+        notionals = trades.copy()
+        notionals['abs_notional'] = notionals['notional'].abs()
+        daily = notionals.groupby('date')['abs_notional'].sum()
     if equity_series is not None and not equity_series.empty:
         equity_align = equity_series.reindex(daily.index).ffill()
         frac = (daily / equity_align).sum()
     else:
-        last_equity = equity_series.iloc[-1] if equity_series is not None and not equity_series.empty else notionals['abs_notional'].sum()
+        last_equity = equity_series.iloc[-1] if equity_series is not None and not equity_series.empty else daily.sum()
         frac = daily.sum() / last_equity
     days = (daily.index[-1] - daily.index[0]).days or 1
     annual_factor = 252 / (days if days > 0 else 1)
     return frac * annual_factor
 
 
-def summarize_performance(equity: pd.Series, returns: pd.Series, trades: pd.DataFrame | None = None) -> dict:
+def summarize_performance(equity: pd.Series, returns: pd.Series, trades: pd.DataFrame | TradeLedger | None = None) -> dict:
     return {
         'CAGR': cagr(equity),
         'Sharpe': sharpe_ratio(returns),
@@ -122,6 +133,103 @@ def summarize_performance(equity: pd.Series, returns: pd.Series, trades: pd.Data
         'Turnover': turnover(trades if trades is not None else pd.DataFrame(columns=['date','notional']), equity)
     }
 
+def _daily_abs_notional(trades: pd.DataFrame | TradeLedger | None) -> Tuple[np.ndarray, np.ndarray]:
+    """(sorted trade days, summed |notional| per day) of one run, NaNs counted as 0."""
+    if trades is None or len(trades) == 0:
+        return np.array([], dtype='datetime64[ns]'), np.array([], dtype=float)
+    if isinstance(trades, TradeLedger):
+        daily = trades.daily_abs_notional()
+        return daily.index.to_numpy(dtype='datetime64[ns]'), daily.to_numpy(dtype=float)
+    dates = pd.DatetimeIndex(trades['date']).to_numpy(dtype='datetime64[ns]')
+    days, inverse = np.unique(dates, return_inverse=True)
+    weights = np.nan_to_num(np.abs(trades['notional'].to_numpy(dtype=float)), nan=0.0)
+    return days, np.bincount(inverse, weights=weights, minlength=len(days))
+
+
+def summarize_performance_batch(equity: pd.DataFrame, returns: pd.DataFrame | None = None,
+                                trades: Sequence[Any] | Mapping[Any, Any] | None = None,
+                                risk_free: float = 0.0) -> pd.DataFrame:
+    """`summarize_performance` for many runs sharing one date index.
+
+    Parameters
+    - equity: dates x runs equity matrix.
+    - returns: matching periodic returns; defaults to `equity.pct_change().fillna(0)`
+      (the convention of the engines' equity frames).
+    - trades: per-run trade DataFrames or `TradeLedger`s (or None), as a
+      sequence in column order or a mapping keyed by column.
+
+    Returns one row per run with CAGR, Sharpe, MaxDrawdown and Turnover, equal
+    to calling `summarize_performance` on each column. The periodicity is
+    inferred once and every metric is a single NumPy pass over the matrix;
+    turnover looks up the equity on each run's trade days in one vectorized
+    `searchsorted`.
+    """
+    columns = equity.columns
+    values = equity.to_numpy(dtype=float)
+    n, m = values.shape
+    if returns is None:
+        returns = equity.pct_change().fillna(0)
+    rets = returns.to_numpy(dtype=float)
+    out = pd.DataFrame(0.0, index=columns, columns=['CAGR', 'Sharpe', 'MaxDrawdown', 'Turnover'])
+    with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        if n:
+            start, end = values[0], values[-1]
+            years = (equity.index[-1] - equity.index[0]).days / 365.25
+            if years > 0:
+                out['CAGR'] = np.where(start <= 0, 0.0, (end / start) ** (1 / years) - 1)
+            peak = np.fmax.accumulate(values, axis=0)
+            out['MaxDrawdown'] = np.nanmin(values / peak - 1, axis=0)
+        if len(rets):
+            ppy = _infer_periods_per_year(returns.index)
+            excess = rets - risk_free / ppy
+            vol = np.nanstd(excess, axis=0)
+            sharpe = np.sqrt(ppy) * np.nanmean(excess, axis=0) / vol
+            out['Sharpe'] = np.where((vol == 0) | np.isnan(vol), 0.0, sharpe)
+    if trades is not None:
+        out['Turnover'] = _turnover_batch(equity, values, trades)
+    return out
+
+
+def _turnover_batch(equity: pd.DataFrame, values: np.ndarray, trades: Sequence[Any] | Mapping[Any, Any]) -> np.ndarray:
+    """Vectorized `turnover(trades[j], equity.iloc[:, j])` for every run j."""
+    columns = equity.columns
+    per_run = [trades.get(c) for c in columns] if isinstance(trades, Mapping) else list(trades)
+    if len(per_run) != len(columns):
+        raise ValueError(f"expected trades for {len(columns)} runs, got {len(per_run)}")
+    daily = [_daily_abs_notional(t) for t in per_run]
+    counts = np.array([len(d) for d, _ in daily])
+    result = np.zeros(len(columns))
+    if not counts.any():
+        return result
+    run = np.repeat(np.arange(len(columns)), counts)
+    days = np.concatenate([d for d, _ in daily])
+    notional = np.concatenate([v for _, v in daily])
+    if len(values) == 0:
+        # no equity rows: turnover scales by the run's own total notional
+        frac = np.ones(len(columns))
+    else:
+        # equity on each trade day (exact date match), forward-filled over the
+        # run's earlier trade days like `equity.reindex(daily.index).ffill()`
+        index = equity.index.to_numpy(dtype='datetime64[ns]')
+        pos = np.clip(np.searchsorted(index, days), 0, len(index) - 1)
+        eq = np.where(index[pos] == days, values[pos, run], np.nan)
+        i = np.arange(len(days))
+        last_valid = np.maximum.accumulate(np.where(np.isnan(eq), -1, i))
+        first_of_run = np.repeat(np.cumsum(counts) - counts, counts)
+        eq = np.where(last_valid >= first_of_run, eq[np.maximum(last_valid, 0)], np.nan)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ratio = notional / eq
+        frac = np.bincount(run, weights=np.where(np.isnan(ratio), 0.0, ratio), minlength=len(columns))
+    first = np.cumsum(counts) - counts
+    last = np.cumsum(counts) - 1
+    traded = counts > 0
+    span = ((days[last[traded]] - days[first[traded]]) // np.timedelta64(1, 'D')).astype(float)
+    span[span <= 0] = 1
+    result[traded] = frac[traded] * (252 / span)
+    return result
+
 __all__ = [
-    'sharpe_ratio', 'cagr', 'max_drawdown', 'turnover', 'summarize_performance'
+    'sharpe_ratio', 'cagr', 'max_drawdown', 'turnover', 'summarize_performance',
+    'summarize_performance_batch',
 ]
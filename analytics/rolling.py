@@ -0,0 +1,229 @@
+from __future__ import annotations
+import math
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from backtest.ledger import TradeLedger
+from .performance import TRADING_DAYS, _daily_abs_notional, _infer_periods_per_year
+
+
+def _window(series: pd.Series, window: Optional[int], min_periods: Optional[int]):
+    """`rolling(window)` or, with `window=None`, `expanding()`."""
+    if window is None:
+        return series.expanding(min_periods=min_periods or 1)
+    return series.rolling(window, min_periods=min_periods)
+
+
+def _ppy(index: pd.Index, periods_per_year: Optional[int]) -> int:
+    return _infer_periods_per_year(index) if periods_per_year is None else periods_per_year
+
+
+def rolling_volatility(returns: pd.Series, window: Optional[int] = 63, periods_per_year: Optional[int] = None,
+                       min_periods: Optional[int] = None) -> pd.Series:
+    """Annualized volatility (population stdev, as in `sharpe_ratio`) over a trailing window.
+
+    `window=None` gives the expanding version. One O(n) pass; the
+    periodicity is inferred once from the index unless given.
+    """
+    ppy = _ppy(returns.index, periods_per_year)
+    return _window(returns, window, min_periods).std(ddof=0) * np.sqrt(ppy)
+
+
+def rolling_sharpe(returns: pd.Series, window: Optional[int] = 252, risk_free: float = 0.0,
+                   periods_per_year: Optional[int] = None, min_periods: Optional[int] = None) -> pd.Series:
+    """Annualized Sharpe ratio over a trailing window in one O(n) pass.
+
+    Row t equals `sharpe_ratio` on the window ending at t (with the
+    periodicity of the full series), including its 0.0 for exactly
+    zero-volatility windows (pandas' windowed std is exactly 0 on a
+    constant window); rows without `min_periods` observations are NaN.
+    """
+    ppy = _ppy(returns.index, periods_per_year)
+    excess = returns - risk_free / ppy
+    rolled = _window(excess, window, min_periods)
+    mean, vol = rolled.mean(), rolled.std(ddof=0)
+    sharpe = np.sqrt(ppy) * mean / vol
+    return sharpe.mask(vol == 0, 0.0).rename('sharpe')
+
+
+def drawdown_curve(equity: pd.Series) -> pd.DataFrame:
+    """Running peak, drawdown (underwater curve) and periods since the last peak.
+
+    Columns: 'peak', 'drawdown' (`equity / peak - 1`, as in `max_drawdown`)
+    and 'duration'; all from cumulative passes.
+    """
+    peak = equity.cummax()
+    values = equity.to_numpy(dtype=float)
+    at_peak = values >= peak.to_numpy(dtype=float)
+    pos = np.arange(len(values))
+    last_peak = np.maximum.accumulate(np.where(at_peak, pos, 0)) if len(values) else pos
+    return pd.DataFrame({'peak': peak, 'drawdown': equity / peak - 1, 'duration': pos - last_peak}, index=equity.index)
+
+
+def rolling_turnover(trades: pd.DataFrame | TradeLedger, equity: pd.Series, window: Optional[int] = 252,
+                     periods_per_year: Optional[int] = None) -> pd.Series:
+    """Annualized turnover over a trailing window of `equity` rows.
+
+    Each day's |notional| is scaled by that day's equity (trades between
+    equity dates count on the last preceding row), summed over the window and
+    annualized by `periods_per_year / window` (expanding: / rows so far).
+    """
+    ppy = _ppy(equity.index, periods_per_year)
+    days, notional = _daily_abs_notional(trades)
+    index = equity.index.to_numpy(dtype='datetime64[ns]')
+    rows = np.searchsorted(index, days, side='right') - 1
+    keep = rows >= 0
+    daily = np.bincount(rows[keep], weights=notional[keep], minlength=len(index))
+    frac = pd.Series(daily / equity.to_numpy(dtype=float), index=equity.index)
+    if window is None:
+        return (frac.cumsum() * ppy / np.arange(1, len(frac) + 1)).rename('turnover')
+    return (frac.rolling(window, min_periods=1).sum() * ppy / window).rename('turnover')
+
+
+class RollingSharpeTracker:
+    """Incremental rolling Sharpe and volatility: O(1) `update(ret)`.
+
+    Keeps the last `window` returns (all of them with `window=None`) as a
+    ring buffer plus Welford mean/M2 with add/remove updates; values match
+    `rolling_sharpe` / `rolling_volatility` with `min_periods=window` up to
+    float rounding. Like there, non-finite returns (e.g. the leading NaN of
+    `pct_change`) take a slot but are left out of the moments, so the
+    outputs are NaN until the window holds `window` finite returns. As in
+    pandas, a window whose finite returns are all equal has volatility
+    exactly 0 (and Sharpe 0.0, the `sharpe_ratio` convention) however the
+    running moments rounded.
+    """
+
+    def __init__(self, window: Optional[int] = 252, periods_per_year: int = TRADING_DAYS, risk_free: float = 0.0):
+        self.window = window
+        self.periods_per_year = periods_per_year
+        self.risk_free = risk_free
+        self._buf = [0.0] * (window or 0)
+        self._count = 0
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._last = math.nan
+        self._same = 0
+
+    def update(self, ret: float) -> float:
+        """Add one periodic return and return the current Sharpe."""
+        x = float(ret) - self.risk_free / self.periods_per_year
+        if not math.isfinite(x):
+            x = math.nan
+        if self.window is not None:
+            slot = self._count % self.window
+            old = self._buf[slot]
+            if self._count >= self.window and not math.isnan(old):
+                self._n -= 1
+                if self._n == 0:
+                    self._mean = self._m2 = 0.0
+                else:
+                    delta = old - self._mean
+                    self._mean -= delta / self._n
+                    self._m2 -= delta * (old - self._mean)
+            self._buf[slot] = x
+        self._count += 1
+        if math.isnan(x):
+            return self.sharpe
+        self._n += 1
+        self._same = self._same + 1 if x == self._last else 1
+        self._last = x
+        delta = x - self._mean
+        self._mean += delta / self._n
+        self._m2 += delta * (x - self._mean)
+        return self.sharpe
+
+    @property
+    def ready(self) -> bool:
+        return self._n >= (self.window or 1)
+
+    @property
+    def volatility(self) -> float:
+        """Annualized population stdev of the returns in the window."""
+        if not self.ready:
+            return math.nan
+        return self._vol() * math.sqrt(self.periods_per_year)
+
+    @property
+    def sharpe(self) -> float:
+        if not self.ready:
+            return math.nan
+        vol = self._vol()
+        if vol == 0:
+            return 0.0
+        return math.sqrt(self.periods_per_year) * self._mean / vol
+
+    def _vol(self) -> float:
+        # the last `_same` finite returns are equal; covering the window means it is constant
+        if self._same >= self._n:
+            return 0.0
+        return math.sqrt(max(self._m2, 0.0) / self._n)
+
+
+class DrawdownTracker:
+    """Incremental running peak, drawdown and drawdown duration.
+
+    Feed equity values with `update(equity)` or periodic returns with
+    `update_return(ret)`, compounded from `initial` (1.0 when unset). A given
+    `initial` also counts as the starting peak.
+    """
+
+    def __init__(self, initial: Optional[float] = None):
+        self.equity = 1.0 if initial is None else float(initial)
+        self.peak = -math.inf if initial is None else float(initial)
+        self.duration = 0
+        self.max_drawdown = 0.0
+
+    def update(self, equity: float) -> float:
+        """Add one equity value and return the current drawdown."""
+        self.equity = float(equity)
+        if self.equity >= self.peak:
+            self.peak = self.equity
+            self.duration = 0
+        else:
+            self.duration += 1
+        self.max_drawdown = min(self.max_drawdown, self.drawdown)
+        return self.drawdown
+
+    def update_return(self, ret: float) -> float:
+        return self.update(self.equity * (1 + float(ret)))
+
+    @property
+    def drawdown(self) -> float:
+        return self.equity / self.peak - 1 if self.peak > -math.inf else 0.0
+
+
+class RollingTurnoverTracker:
+    """Incremental `rolling_turnover`: `update(traded_notional, equity)` once per period.
+
+    A period whose notional or equity is not finite adds nothing, as NaN
+    rows are skipped by the batch sum.
+    """
+
+    def __init__(self, window: Optional[int] = 252, periods_per_year: int = TRADING_DAYS):
+        self.window = window
+        self.periods_per_year = periods_per_year
+        self._buf = [0.0] * (window or 0)
+        self._count = 0
+        self._sum = 0.0
+
+    def update(self, traded_notional: float, equity: float) -> float:
+        """Add one period's gross traded notional and equity; return the annualized turnover."""
+        frac = abs(float(traded_notional)) / float(equity) if float(equity) != 0 else math.nan
+        if not math.isfinite(frac):
+            frac = 0.0
+        if self.window is not None:
+            slot = self._count % self.window
+            self._sum -= self._buf[slot]
+            self._buf[slot] = frac
+        self._sum += frac
+        self._count += 1
+        return self._sum * self.periods_per_year / (self.window or self._count)
+
+__all__ = [
+    'rolling_volatility', 'rolling_sharpe', 'drawdown_curve', 'rolling_turnover',
+    'RollingSharpeTracker', 'DrawdownTracker', 'RollingTurnoverTracker',
+]
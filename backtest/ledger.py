@@ -0,0 +1,178 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+class TradeLedger:
+    """Columnar, append-only trade ledger backed by growable NumPy arrays.
+
+    Each trade is stored as one row across preallocated arrays (date,
+    symbol code, shares, price, notional); capacity doubles when full, so
+    appends are amortized O(1) and no per-trade dict is allocated. Symbols
+    are interned into integer codes.
+
+    `to_frame()` returns a DataFrame whose numeric and date columns are views
+    of the ledger arrays (no copy), with columns
+    ['date', <symbol_field>, 'shares', 'price', 'notional'] like the
+    list-of-dicts logs it replaces. For code written against those logs the
+    ledger also behaves as a list of dicts with the same keys: iteration,
+    indexing and slicing (`pd.DataFrame(list(ledger))`, `ledger[-1]`,
+    `ledger[:3]`), `len`, `==` and `+` with lists, `+=`, `clear`, and
+    `append`/`extend` with such dicts. `analytics.turnover` accepts a ledger
+    directly.
+    """
+
+    def __init__(self, capacity: int = 256, symbol_field: str = 'symbol'):
+        capacity = max(int(capacity), 1)
+        self.symbol_field = symbol_field
+        self._n = 0
+        self._dates = np.empty(capacity, dtype='datetime64[ns]')
+        self._codes = np.empty(capacity, dtype=np.int32)
+        self._shares = np.empty(capacity, dtype=float)
+        self._price = np.empty(capacity, dtype=float)
+        self._notional = np.empty(capacity, dtype=float)
+        self._symbols: List[str] = []
+        self._symbol_codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def symbols(self) -> List[str]:
+        """Categories in first-seen order (index = symbol code)."""
+        return list(self._symbols)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self._n):
+            yield self[i]
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """Trade `i` as a dict (negative indices count from the end), or a list of them for a slice."""
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._n))]
+        if not -self._n <= i < self._n:
+            raise IndexError("trade index out of range")
+        i %= self._n
+        return {
+            'date': pd.Timestamp(self._dates[i]),
+            self.symbol_field: self._symbols[self._codes[i]],
+            'shares': float(self._shares[i]),
+            'price': float(self._price[i]),
+            'notional': float(self._notional[i]),
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (TradeLedger, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # mutable, like the list it replaces
+
+    def __add__(self, other: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        return list(self) + list(other)
+
+    def __radd__(self, other: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        return list(other) + list(self)
+
+    def __iadd__(self, other: Iterable[Mapping[str, Any]]) -> 'TradeLedger':
+        self.extend(other)
+        return self
+
+    def append(self, date, symbol: str = None, shares: float = None, price: float = None) -> None:
+        """Record a single trade; notional is `shares * price`.
+
+        A single mapping with 'date', the symbol field, 'shares' and 'price'
+        keys (a list-of-dicts log entry) is accepted too.
+        """
+        if isinstance(date, Mapping):
+            record = date
+            date, symbol = record['date'], record[self.symbol_field]
+            shares, price = record['shares'], record['price']
+        self._reserve(1)
+        i = self._n
+        self._dates[i] = np.datetime64(pd.Timestamp(date), 'ns')
+        self._codes[i] = self._code(symbol)
+        self._shares[i] = shares
+        self._price[i] = price
+        self._notional[i] = shares * price
+        self._n += 1
+
+    def extend(self, date, symbols: Optional[Sequence[str]] = None, shares: Optional[Sequence[float]] = None,
+               prices: Optional[Sequence[float]] = None) -> None:
+        """Record several trades executed on the same `date` in one vectorized write.
+
+        Called with one argument, it takes an iterable of list-of-dicts log
+        entries instead (see `append`).
+        """
+        if symbols is None:
+            for record in date:
+                self.append(record)
+            return
+        k = len(symbols)
+        if k == 0:
+            return
+        self._reserve(k)
+        i, j = self._n, self._n + k
+        shares = np.asarray(shares, dtype=float)
+        prices = np.asarray(prices, dtype=float)
+        self._dates[i:j] = np.datetime64(pd.Timestamp(date), 'ns')
+        self._codes[i:j] = [self._code(s) for s in symbols]
+        self._shares[i:j] = shares
+        self._price[i:j] = prices
+        self._notional[i:j] = shares * prices
+        self._n = j
+
+    def clear(self) -> None:
+        """Drop all trades (symbol codes are kept)."""
+        self._n = 0
+
+    def to_frame(self, categorical: bool = False) -> pd.DataFrame:
+        """Trades as a DataFrame; date/shares/price/notional columns are views.
+
+        Symbols are plain strings, or a categorical column with
+        `categorical=True`.
+        """
+        n = self._n
+        symbols = pd.Categorical.from_codes(self._codes[:n], categories=pd.Index(self._symbols, dtype=object))
+        if not categorical:
+            symbols = np.asarray(symbols, dtype=object)
+        return pd.DataFrame({
+            'date': self._dates[:n],
+            self.symbol_field: symbols,
+            'shares': self._shares[:n],
+            'price': self._price[:n],
+            'notional': self._notional[:n],
+        }, copy=False)
+
+    def daily_abs_notional(self) -> pd.Series:
+        """Sum of |notional| per trade date (NaNs skipped), without a pandas groupby."""
+        n = self._n
+        days, inverse = np.unique(self._dates[:n], return_inverse=True)
+        weights = np.nan_to_num(np.abs(self._notional[:n]), nan=0.0)
+        totals = np.bincount(inverse, weights=weights, minlength=len(days))
+        return pd.Series(totals, index=pd.DatetimeIndex(days, name='date'), name='abs_notional')
+
+    def _code(self, symbol: str) -> int:
+        code = self._symbol_codes.get(symbol)
+        if code is None:
+            code = len(self._symbols)
+            self._symbol_codes[symbol] = code
+            self._symbols.append(symbol)
+        return code
+
+    def _reserve(self, k: int) -> None:
+        need = self._n + k
+        capacity = len(self._shares)
+        if need <= capacity:
+            return
+        while capacity < need:
+            capacity *= 2
+        for name in ('_dates', '_codes', '_shares', '_price', '_notional'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._n] = old[:self._n]
+            setattr(self, name, new)
+
+__all__ = ['TradeLedger']
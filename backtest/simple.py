@@ -1,11 +1,12 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List
+from typing import Any, Iterable, Iterator, List, Optional, Union
 
+import numpy as np
 import pandas as pd
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """Simple trade record for a filled buy order.
 
@@ -18,6 +19,122 @@ class Trade:
     size: float
 
 
+class LotQueue:
+    """FIFO queue of open lots stored in parallel NumPy arrays.
+
+    Lots live in a window `[head, tail)` of preallocated entry-price/size
+    arrays; appending writes at `tail` (doubling capacity when full, after
+    compacting consumed slots) and `popleft` just advances `head`, so both
+    are amortized O(1). The open size is kept as a running total, making
+    `total_size` O(1) instead of a sum over all lots.
+
+    Behaves like the list of `Trade` it replaces for `len`, iteration,
+    indexing and slicing, `==` against lists, `append`, `extend`, `pop` and
+    `clear`; items are `Trade` copies, so edit lots through these methods
+    rather than by mutating a returned `Trade`.
+    """
+
+    def __init__(self, capacity: int = 64):
+        capacity = max(int(capacity), 1)
+        self._price = np.empty(capacity, dtype=float)
+        self._size = np.empty(capacity, dtype=float)
+        self._head = 0
+        self._tail = 0
+        self.total_size = 0.0
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def __iter__(self) -> Iterator[Trade]:
+        for i in range(self._head, self._tail):
+            yield Trade(entry_price=float(self._price[i]), size=float(self._size[i]))
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[Trade, List[Trade]]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("lot index out of range")
+        j = self._head + i
+        return Trade(entry_price=float(self._price[j]), size=float(self._size[j]))
+
+    def __repr__(self) -> str:
+        return f"LotQueue({list(self)!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (LotQueue, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # mutable, like the list it replaces
+
+    def append(self, trade: Trade) -> None:
+        self.push(trade.entry_price, trade.size)
+
+    def extend(self, trades: Iterable[Trade]) -> None:
+        for trade in trades:
+            self.push(trade.entry_price, trade.size)
+
+    def clear(self) -> None:
+        self._head = self._tail = 0
+        self.total_size = 0.0
+
+    def push(self, entry_price: float, size: float) -> None:
+        """Open a lot at the back of the queue."""
+        if self._tail == len(self._size):
+            self._make_room()
+        self._price[self._tail] = entry_price
+        self._size[self._tail] = size
+        self._tail += 1
+        self.total_size += size
+
+    def popleft(self) -> Trade:
+        """Close and return the earliest open lot."""
+        if self._head == self._tail:
+            raise IndexError("pop from an empty LotQueue")
+        trade = self[0]
+        self._head += 1
+        if self._head == self._tail:
+            # reset so the running total cannot accumulate rounding drift
+            self._head = self._tail = 0
+            self.total_size = 0.0
+        else:
+            self.total_size -= trade.size
+        return trade
+
+    def pop(self, i: int = -1) -> Trade:
+        """Remove and return lot `i` (default: the latest), like `list.pop`.
+
+        `pop(0)` is `popleft`; other positions shift the later lots, O(n).
+        """
+        n = len(self)
+        if not n:
+            raise IndexError("pop from an empty LotQueue")
+        trade = self[i]
+        j = self._head + (i + n if i < 0 else i)
+        if j == self._head:
+            return self.popleft()
+        self._price[j:self._tail - 1] = self._price[j + 1:self._tail]
+        self._size[j:self._tail - 1] = self._size[j + 1:self._tail]
+        self._tail -= 1
+        self.total_size -= trade.size
+        return trade
+
+    def _make_room(self) -> None:
+        n = len(self)
+        capacity = len(self._size)
+        if n * 2 > capacity:
+            capacity *= 2
+        for name in ('_price', '_size'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=float)
+            new[:n] = old[self._head:self._tail]
+            setattr(self, name, new)
+        self._head, self._tail = 0, n
+
+
 @dataclass
 class SimpleFIFOBacktester:
     """Very small FIFO backtester used by unit tests.
@@ -27,7 +144,10 @@ class SimpleFIFOBacktester:
     - On signal == 1, sells the earliest opened trade (FIFO) and realizes P&L.
     - Commission and slippage are applied as basis points of notional.
 
-    The backtester stores `open_trades`, `cash`, and `cost_paid` for inspection.
+    The backtester stores `open_trades` (a `LotQueue`; a list of `Trade`
+    passed in is converted), `cash`, and `cost_paid` for inspection. Each `step` and `mark_to_market` is O(1) in the number of
+    open lots. `run_many` runs many independent series at once and leaves
+    their final state in `batch_state`.
     """
 
     initial_cash: float = 100.0
@@ -35,13 +155,18 @@ class SimpleFIFOBacktester:
     min_cash: float = 10.0
     commission_bps: float = 0.0
     slippage_bps: float = 0.0
-    open_trades: List[Trade] = field(default_factory=list)
+    open_trades: LotQueue = field(default_factory=LotQueue)
     cash: float | None = None
     cost_paid: float = 0.0
+    batch_state: Optional[pd.DataFrame] = field(default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
         """Initialize runtime state."""
         self.cash = float(self.initial_cash)
+        if not isinstance(self.open_trades, LotQueue):
+            lots = LotQueue(len(self.open_trades))
+            lots.extend(self.open_trades)
+            self.open_trades = lots
 
     def step(self, price: float, signal: int) -> None:
         """Execute one-step of trading given a market price and signal.
@@ -60,10 +185,10 @@ class SimpleFIFOBacktester:
             cost = notional * (self.commission_bps + self.slippage_bps) / 10_000
             self.cash -= (to_deploy + cost)
             self.cost_paid += cost
-            self.open_trades.append(Trade(entry_price=price, size=size))
+            self.open_trades.push(price, size)
 
         elif signal == 1 and self.open_trades:
-            trade = self.open_trades.pop(0)
+            trade = self.open_trades.popleft()
             proceeds = trade.size * price
             cost = proceeds * (self.commission_bps + self.slippage_bps) / 10_000
             self.cash += (proceeds - cost)
@@ -71,7 +196,7 @@ class SimpleFIFOBacktester:
 
     def mark_to_market(self, price: float) -> float:
         """Return mark-to-market equity (cash + current exposure)."""
-        exposure = sum(t.size for t in self.open_trades) * price
+        exposure = self.open_trades.total_size * price
         return float((self.cash or 0.0) + exposure)
 
     def run(self, prices: pd.Series, signals: pd.Series) -> pd.Series:
@@ -84,3 +209,80 @@ class SimpleFIFOBacktester:
             self.step(price, signal)
             equity_curve.append(self.mark_to_market(price))
         return pd.Series(equity_curve, index=prices.index, name="equity")
+
+    def run_many(self, prices: pd.DataFrame | pd.Series, signals: Any, trade_fraction: Any = None,
+                 min_cash: Any = None, commission_bps: Any = None, slippage_bps: Any = None,
+                 initial_cash: Any = None) -> pd.DataFrame:
+        """Run independent backtests for every column of a price/signal block.
+
+        `prices` is a date x series frame (a Series is broadcast to every
+        signal column, e.g. one ticker under many signal sets) and `signals`
+        a frame or array of the same shape. The parameters default to this
+        backtester's and may also be given per column. Cash, costs and FIFO
+        lot queues are kept in per-column arrays, so each bar is a handful of
+        vectorized operations across all series instead of one `run` per
+        series; column j equals `run` on (prices[j], signals[j]) with a fresh
+        backtester.
+
+        Returns the date x series equity matrix. The final per-column cash,
+        cost paid, open lot count and open size are stored in `batch_state`;
+        `cash`, `cost_paid` and `open_trades` are left untouched.
+        """
+        sig = signals.to_numpy(dtype=float) if isinstance(signals, pd.DataFrame) else np.asarray(signals, dtype=float)
+        if sig.ndim == 1:
+            sig = sig[:, None]
+        if isinstance(prices, pd.Series):
+            index = prices.index
+            columns = signals.columns if isinstance(signals, pd.DataFrame) else pd.RangeIndex(sig.shape[1])
+            px = np.repeat(prices.to_numpy(dtype=float)[:, None], sig.shape[1], axis=1)
+        else:
+            index, columns = prices.index, prices.columns
+            px = prices.to_numpy(dtype=float)
+        if px.shape != sig.shape:
+            raise ValueError(f"prices {px.shape} and signals {sig.shape} must have the same shape")
+        n, m = px.shape
+
+        def _param(value: Any, default: float) -> np.ndarray:
+            return np.broadcast_to(np.asarray(default if value is None else value, dtype=float), (m,))
+
+        fraction = _param(trade_fraction, self.trade_fraction)
+        floor = _param(min_cash, self.min_cash)
+        cost_bps = _param(commission_bps, self.commission_bps) + _param(slippage_bps, self.slippage_bps)
+        cash = _param(initial_cash, self.initial_cash).copy()
+        cost_paid = np.zeros(m)
+        # lot slots are only ever appended, so the buy count bounds each column's queue
+        capacity = max(int((sig == -1).sum(axis=0).max(initial=0)), 1)
+        lot_size = np.empty((capacity, m))
+        head = np.zeros(m, dtype=int)
+        tail = np.zeros(m, dtype=int)
+        open_size = np.zeros(m)
+        equity = np.empty((n, m))
+        cols = np.arange(m)
+        for t in range(n):
+            price = px[t]
+            to_deploy = cash * fraction
+            buy = (sig[t] == -1) & (cash > floor) & (to_deploy > 0)
+            if buy.any():
+                b = cols[buy]
+                size = to_deploy[b] / price[b]
+                cost = to_deploy[b] * cost_bps[b] / 10_000
+                cash[b] -= to_deploy[b] + cost
+                cost_paid[b] += cost
+                lot_size[tail[b], b] = size
+                tail[b] += 1
+                open_size[b] += size
+            sell = (sig[t] == 1) & (tail > head)
+            if sell.any():
+                s = cols[sell]
+                size = lot_size[head[s], s]
+                proceeds = size * price[s]
+                cost = proceeds * cost_bps[s] / 10_000
+                cash[s] += proceeds - cost
+                cost_paid[s] += cost
+                head[s] += 1
+                # mirror LotQueue: subtract, or reset to exactly 0 once empty
+                open_size[s] = np.where(head[s] == tail[s], 0.0, open_size[s] - size)
+            equity[t] = cash + open_size * price
+        self.batch_state = pd.DataFrame({'cash': cash, 'cost_paid': cost_paid, 'open_lots': tail - head,
+                                         'open_size': open_size}, index=columns)
+        return pd.DataFrame(equity, index=index, columns=columns)
@@ -2,11 +2,25 @@
 
 Exports:
  - get_sp500_tickers
+ - UniverseSnapshots / cached_sp500_tickers / MembershipIndex: TTL-cached,
+   offline-safe constituent snapshots and point-in-time universe lookup
  - download_prices
- - get_cached_prices
+ - get_cached_prices / get_cached_ohlcv: one field or all OHLCV fields from the
+   local store
+ - PriceStore: append-only, memory-mapped field x date x ticker OHLCV cache
+ - ChunkedDownloader: concurrent chunked fetching with retry/backoff over a
+   PriceProvider (YFinanceProvider, or the offline SyntheticProvider)
+ - PriceCache / load_prices: in-process LRU of panels with TTL freshness in
+   front of the on-disk store
 """
-from .sp500 import get_sp500_tickers, download_prices, get_cached_prices
+from .sp500 import get_sp500_tickers, download_prices, get_cached_prices, get_cached_ohlcv
+from .store import PriceStore, FIELDS
+from .providers import PriceProvider, YFinanceProvider, SyntheticProvider, ChunkedDownloader
+from .access import PriceCache, load_prices
+from .universe import UniverseSnapshots, MembershipIndex, cached_sp500_tickers
 
 __all__ = [
-    'get_sp500_tickers', 'download_prices', 'get_cached_prices'
+    'get_sp500_tickers', 'download_prices', 'get_cached_prices', 'get_cached_ohlcv', 'PriceStore', 'FIELDS',
+    'PriceProvider', 'YFinanceProvider', 'SyntheticProvider', 'ChunkedDownloader',
+    'PriceCache', 'load_prices', 'UniverseSnapshots', 'MembershipIndex', 'cached_sp500_tickers'
 ]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Callable, Dict, Hashable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .providers import PriceProvider
+from .sp500 import CACHE_DIR_DEFAULT, get_cached_prices
+from .store import PriceStore
+
+
+class PriceCache:
+    """Tiered price access: an in-process LRU of panels over the on-disk `PriceStore`.
+
+    Panels are keyed by (tickers, start, end, field) and served from memory
+    while younger than `ttl` seconds, so a repeated load is a dict lookup.
+    The store's "is it up to date" check (and any download it triggers via
+    `get_cached_prices`) also runs at most once per `ttl`: in between,
+    requests for tickers the store already holds, up to a date it already
+    covers (or that an earlier check this period reached), are read straight
+    from the memory-mapped files. Cached values are read-only and every call
+    returns a shallow copy over them: adding or replacing columns only
+    affects the caller's frame, and in-place edits of values raise instead
+    of changing what later callers get (`.copy()` gives a writable frame).
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR_DEFAULT, provider: Optional[PriceProvider] = None,
+                 maxsize: int = 32, ttl: float = 6 * 3600, clock: Callable[[], float] = time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.cache_dir = cache_dir
+        self.provider = provider
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._panels: OrderedDict = OrderedDict()
+        self._store: Optional[PriceStore] = None
+        self._checked_at = -float('inf')
+        self._synced: Dict[str, date] = {}
+
+    def __len__(self) -> int:
+        return len(self._panels)
+
+    def get(self, tickers: Sequence[str], start: str, end: str, field: str = 'Close') -> pd.DataFrame:
+        """`field` prices for `tickers` over [start, end] (see `get_cached_prices`)."""
+        key = (tuple(tickers), start, end, field)
+        now = self.clock()
+        entry = self._panels.get(key)
+        if entry is not None and now - entry[1] < self.ttl:
+            self._panels.move_to_end(key)
+            self.hits += 1
+            return entry[0].copy(deep=False)
+        self.misses += 1
+        panel = _read_only(self._load(list(tickers), start, end, field, now))
+        self._insert(key, panel, now)
+        return panel.copy(deep=False)
+
+    def invalidate(self) -> None:
+        """Drop the in-memory panels and force a freshness check on the next load."""
+        self._panels.clear()
+        self._store = None
+        self._checked_at = -float('inf')
+        self._synced.clear()
+
+    def _load(self, tickers: list, start: str, end: str, field: str, now: float) -> pd.DataFrame:
+        needed = min(datetime.strptime(end, "%Y-%m-%d").date(), datetime.today().date())
+        if now - self._checked_at >= self.ttl:
+            self._synced.clear()
+        elif self._store is not None and all(t in self._store for t in tickers):
+            covered = len(self._store) and self._store.last_date.date() >= needed
+            if covered or all(self._synced.get(t, date.min) >= needed for t in tickers):
+                return self._store.read(tickers, start, end, field)
+        panel = get_cached_prices(tickers, start, end, cache_dir=self.cache_dir, provider=self.provider, field=field)
+        self._store = PriceStore(self.cache_dir)
+        if not self._synced:
+            self._checked_at = now
+        for t in tickers:
+            self._synced[t] = max(self._synced.get(t, date.min), needed)
+        return panel
+
+    def _insert(self, key: Hashable, panel: pd.DataFrame, now: float) -> None:
+        self._panels[key] = (panel, now)
+        self._panels.move_to_end(key)
+        while len(self._panels) > self.maxsize:
+            self._panels.popitem(last=False)
+
+
+def _read_only(panel: pd.DataFrame) -> pd.DataFrame:
+    values = panel.to_numpy(dtype=float)
+    values.flags.writeable = False
+    return pd.DataFrame(values, index=panel.index, columns=panel.columns, copy=False)
+
+
+_CACHES: Dict[str, PriceCache] = {}
+
+
+def load_prices(tickers: Sequence[str], start: str, end: str, field: str = 'Close',
+                cache_dir: str = CACHE_DIR_DEFAULT) -> pd.DataFrame:
+    """`PriceCache.get` on a process-wide cache per `cache_dir`."""
+    cache = _CACHES.get(cache_dir)
+    if cache is None:
+        cache = _CACHES[cache_dir] = PriceCache(cache_dir)
+    return cache.get(tickers, start, end, field)
+
+__all__ = ['PriceCache', 'load_prices']
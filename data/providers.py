@@ -0,0 +1,186 @@
+from __future__ import annotations
+import threading
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Protocol, Sequence, runtime_checkable
+
+import numpy as np
+import pandas as pd
+
+
+@runtime_checkable
+class PriceProvider(Protocol):
+    """Source of daily prices.
+
+    `fetch` returns dates in [start, end), following `yf.download`'s
+    exclusive end: a wide frame of closes (date index, one column per
+    ticker) when `fields` is None, otherwise (field, ticker) MultiIndex
+    columns for the requested OHLCV `fields`. Tickers without data may be
+    missing or all-NaN, and a range with no trading days gives an empty
+    frame; only a failed request raises.
+    """
+
+    def fetch(self, tickers: Sequence[str], start: str, end: str,
+              fields: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        ...
+
+
+class YFinanceProvider:
+    """Adjusted prices from `yfinance`.
+
+    The import happens on construction, so a missing package fails fast
+    instead of being retried as a download error.
+    """
+
+    def __init__(self):
+        import yfinance
+        self._yf = yfinance
+
+    def fetch(self, tickers: Sequence[str], start: str, end: str,
+              fields: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        data = self._yf.download(list(tickers), start=start, end=end, auto_adjust=True, progress=False, threads=False)
+        if data is None or data.empty:
+            return pd.DataFrame() if fields is None else pd.DataFrame(columns=pd.MultiIndex.from_product([list(fields), []]))
+        if not isinstance(data.columns, pd.MultiIndex):
+            data.columns = pd.MultiIndex.from_product([data.columns, [tickers[0]]])
+        if fields is None:
+            return data["Close"]
+        return data[list(fields)]
+
+
+class SyntheticProvider:
+    """Offline stand-in provider serving deterministic random-walk prices.
+
+    Each ticker's path depends only on its name, `seed` and the date, so
+    overlapping requests agree. `latency` seconds are slept per call to
+    mimic a network round trip; each ticker in `flaky` makes the first
+    `flaky[t]` calls that include it raise `ConnectionError`, and tickers in
+    `missing` never return data. `calls` records every requested chunk.
+    """
+
+    def __init__(self, seed: int = 0, latency: float = 0.0, flaky: Optional[Dict[str, int]] = None,
+                 missing: Iterable[str] = ()):
+        self.seed = seed
+        self.latency = latency
+        self.flaky = dict(flaky or {})
+        self.missing = set(missing)
+        self.calls: List[List[str]] = []
+        self._lock = threading.Lock()
+
+    def fetch(self, tickers: Sequence[str], start: str, end: str,
+              fields: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls.append(list(tickers))
+            for t in tickers:
+                if self.flaky.get(t, 0) > 0:
+                    self.flaky[t] -= 1
+                    raise ConnectionError(f"synthetic failure fetching {t}")
+        days = np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D'))
+        days = days[np.is_busday(days)]
+        offset = int(np.busday_count(np.datetime64('2000-01-03'), days[0])) if len(days) else 0
+        index = pd.DatetimeIndex(days.astype('datetime64[ns]'))
+        offset = max(offset, 0)
+        bars = {}
+        for t in tickers:
+            if t in self.missing:
+                continue
+            rng = np.random.default_rng([self.seed, zlib.crc32(t.encode())])
+            steps = rng.normal(0.0003, 0.015, offset + len(index))
+            close = 100 * np.exp(np.cumsum(steps))
+            if fields is None:
+                bars[t] = close[offset:]
+                continue
+            # a separate stream, so the draws for a date do not depend on the request length
+            noise_rng = np.random.default_rng([self.seed, zlib.crc32(t.encode()), 1])
+            noise = noise_rng.normal(0.0, 1.0, (offset + len(index), 4))
+            prev = np.concatenate([[100.0], close[:-1]])
+            open_ = prev * np.exp(0.003 * noise[:, 0])
+            bars[t] = {
+                'Open': open_,
+                'High': np.maximum(open_, close) * (1 + 0.005 * np.abs(noise[:, 1])),
+                'Low': np.minimum(open_, close) * (1 - 0.005 * np.abs(noise[:, 2])),
+                'Close': close,
+                'Volume': np.round(1e6 * np.exp(0.3 * noise[:, 3])),
+            }
+        if fields is None:
+            return pd.DataFrame(bars, index=index)
+        columns = pd.MultiIndex.from_product([list(fields), list(bars)])
+        values = [bars[t][f][offset:] for f, t in columns]
+        return pd.DataFrame(dict(zip(columns, values)), index=index, columns=columns)
+
+
+class ChunkedDownloader:
+    """Split a universe into chunks and fetch them concurrently with retries.
+
+    Chunks of `chunk_size` tickers run on a pool of `max_workers` threads.
+    A failed fetch is retried up to `retries` more times with exponential
+    backoff (`backoff * 2**attempt`, capped at `max_backoff` seconds). A chunk
+    that still fails is split in half and the halves are re-queued, so one
+    bad symbol only costs its own request; single tickers that exhaust their
+    retries are listed in `failed` after `download`. An empty result (no
+    bars in the range) is not a failure and is neither retried nor split.
+    """
+
+    def __init__(self, provider: Optional[PriceProvider] = None, chunk_size: int = 50, max_workers: int = 8,
+                 retries: int = 3, backoff: float = 0.5, max_backoff: float = 8.0,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.provider = YFinanceProvider() if provider is None else provider
+        self.chunk_size = max(int(chunk_size), 1)
+        self.max_workers = max(int(max_workers), 1)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.sleep = sleep
+        self.failed: List[str] = []
+
+    def download(self, tickers: Sequence[str], start: str, end: str,
+                 fields: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Merged prices for `tickers` (see `PriceProvider.fetch`); all-NaN columns are dropped."""
+        tickers = list(dict.fromkeys(tickers))
+        chunks = [tickers[i:i + self.chunk_size] for i in range(0, len(tickers), self.chunk_size)]
+        self.failed = []
+        frames = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {pool.submit(self._fetch, c, start, end, fields): c for c in chunks}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = pending.pop(future)
+                    try:
+                        frame = future.result()
+                    except Exception:
+                        if len(chunk) == 1:
+                            self.failed.append(chunk[0])
+                            continue
+                        mid = len(chunk) // 2
+                        for half in (chunk[:mid], chunk[mid:]):
+                            pending[pool.submit(self._fetch, half, start, end, fields)] = half
+                        continue
+                    if not frame.empty:
+                        frames.append(frame)
+        if not frames:
+            return pd.DataFrame()
+        data = pd.concat(frames, axis=1)
+        data = data.loc[:, ~data.columns.duplicated()]
+        if fields is None:
+            data = data[[t for t in tickers if t in data.columns]]
+        else:
+            present = set(data.columns.get_level_values(1))
+            data = data.reindex(columns=pd.MultiIndex.from_product([list(fields), [t for t in tickers if t in present]]))
+        return data.dropna(axis=1, how='all').sort_index()
+
+    def _fetch(self, chunk: Sequence[str], start: str, end: str, fields: Optional[Sequence[str]]) -> pd.DataFrame:
+        for attempt in range(self.retries + 1):
+            try:
+                if fields is None:
+                    return self.provider.fetch(chunk, start, end)
+                return self.provider.fetch(chunk, start, end, fields)
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                self.sleep(min(self.backoff * 2 ** attempt, self.max_backoff))
+
+__all__ = ['PriceProvider', 'YFinanceProvider', 'SyntheticProvider', 'ChunkedDownloader']
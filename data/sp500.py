@@ -1,16 +1,18 @@
 from __future__ import annotations
-import os
 from datetime import datetime, timedelta
-from typing import List
+from typing import Dict, List, Optional, Sequence
+import numpy as np
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-import yfinance as yf
 
-CACHE_FILE_DEFAULT = "sp500_data.csv"
+from .providers import ChunkedDownloader, PriceProvider
+from .store import PriceStore
+
+CACHE_DIR_DEFAULT = "sp500_store"
 
 
 def get_sp500_tickers() -> list[str]:
+    import requests
+    from bs4 import BeautifulSoup
     url = 'https://en.wikipedia.org/wiki/List_of_S%26P_500_companies'
     resp = requests.get(url, timeout=30)
     resp.raise_for_status()
@@ -24,30 +26,73 @@ def get_sp500_tickers() -> list[str]:
     return tickers
 
 
-def download_prices(tickers: list[str], start: str, end: str) -> pd.DataFrame:
-    data = yf.download(tickers, start=start, end=end, auto_adjust=True, progress=False)["Close"]
-    if isinstance(data, pd.Series):
-        data = data.to_frame()
-    return data.dropna(axis=1, how='all').sort_index()
+def download_prices(tickers: list[str], start: str, end: str, provider: Optional[PriceProvider] = None,
+                    chunk_size: int = 50, max_workers: int = 8, fields: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Prices for `tickers`, fetched in concurrent chunks with retries.
+
+    Closes as a wide frame by default, or (field, ticker) columns for the
+    given OHLCV `fields`. Uses `yfinance` unless another `provider` is given;
+    see `ChunkedDownloader`.
+    """
+    downloader = ChunkedDownloader(provider, chunk_size=chunk_size, max_workers=max_workers)
+    return downloader.download(tickers, start, end, fields)
+
 
+def _sync_store(store: PriceStore, tickers: list[str], start: str, end: str,
+                provider: Optional[PriceProvider]) -> None:
+    """Download what `store` lacks for `tickers` up to `end` (all stored fields).
 
-def get_cached_prices(tickers: list[str], start: str, end: str, cache_file: str = CACHE_FILE_DEFAULT) -> pd.DataFrame:
+    That is the full history of tickers it has not seen and the days after
+    its last date; both are appended without rewriting stored data. New
+    days are fetched for every stored ticker, not just `tickers`, since the
+    store's rows are shared and never revisited. No request is made when
+    the days still missing hold no business day (weekends, or a store
+    already current up to yesterday).
+    """
     user_end = datetime.strptime(end, "%Y-%m-%d").date()
     today = datetime.today().date()
     latest_needed = min(user_end, today)
+    fields = store.fields
 
-    if os.path.exists(cache_file):
-        data = pd.read_csv(cache_file, index_col=0, parse_dates=True)
-        last_date = data.index[-1].date()
-        if last_date >= latest_needed:  # up to date
-            return data.loc[start:end]
+    if not len(store):
+        store.append(download_prices(tickers, start, end, provider, fields=fields))
+        return
+    missing = [t for t in tickers if t not in store]
+    if missing:
+        first = store.dates[0].strftime("%Y-%m-%d")
+        last = (store.last_date + timedelta(days=1)).strftime("%Y-%m-%d")
+        store.append(download_prices(missing, first, last, provider, fields=fields))
+    last_date = store.last_date.date()
+    if np.busday_count(last_date + timedelta(days=1), latest_needed) > 0:
         update_start = (last_date + timedelta(days=1)).strftime("%Y-%m-%d")
-        new_data = download_prices(tickers, update_start, latest_needed.strftime("%Y-%m-%d"))
+        universe = list(dict.fromkeys(store.tickers + list(tickers)))
+        new_data = download_prices(universe, update_start, latest_needed.strftime("%Y-%m-%d"), provider, fields=fields)
         if not new_data.empty:
-            data = pd.concat([data, new_data])
-            data = data[~data.index.duplicated(keep='last')]
-            data.to_csv(cache_file)
-        return data.loc[start:end]
-    data = download_prices(tickers, start, end)
-    data.to_csv(cache_file)
-    return data
+            store.append(new_data)
+
+
+def get_cached_prices(tickers: list[str], start: str, end: str, cache_dir: str = CACHE_DIR_DEFAULT,
+                      provider: Optional[PriceProvider] = None, field: str = 'Close') -> pd.DataFrame:
+    """`field` prices for `tickers` over [start, end], served from a `PriceStore` in `cache_dir`.
+
+    The store keeps every OHLCV field, so only what it lacks is downloaded
+    (see `_sync_store`) and only the requested tickers and dates are read
+    back.
+    """
+    store = PriceStore(cache_dir)
+    _sync_store(store, tickers, start, end, provider)
+    return store.read(tickers, start, end, field)
+
+
+def get_cached_ohlcv(tickers: list[str], start: str, end: str, cache_dir: str = CACHE_DIR_DEFAULT,
+                     provider: Optional[PriceProvider] = None,
+                     fields: Optional[Sequence[str]] = None, copy: bool = True) -> Dict[str, pd.DataFrame]:
+    """{field: date x ticker frame} for `fields` (default: all stored), like `get_cached_prices`.
+
+    The frames can be passed straight to e.g. `stochastic_oscillator_panel`.
+    With `copy=False` they are read-only views of the memory-mapped store
+    where possible.
+    """
+    store = PriceStore(cache_dir)
+    _sync_store(store, tickers, start, end, provider)
+    return store.read_fields(tickers, start, end, fields, copy)
@@ -0,0 +1,265 @@
+from __future__ import annotations
+import json
+import os
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+META_FILE = 'meta.json'
+DATES_FILE = 'dates.i8'
+FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+STORE_VERSION = 2
+
+PriceInput = Union[pd.DataFrame, Mapping[str, pd.DataFrame]]
+
+
+class PriceStore:
+    """Append-only columnar OHLCV store on disk, memory-mapped on read.
+
+    Layout of the `root` directory:
+     - `dates.i8`: the shared date index as raw int64 nanoseconds, ascending
+     - `<field>_<group>.f8`: per field, a row-major float64 date x ticker
+       block for one group of tickers, aligned to the date index (NaN where a
+       ticker has no value); stacked over `fields` this is a
+       field x date x ticker array
+     - `meta.json`: the layout version, the fields, the ticker groups and
+       the committed row count
+
+    Tickers are added in groups: the ones present at creation form the first
+    group and each later batch of new tickers gets its own, so neither a new
+    day nor a new ticker rewrites stored bytes. `read` copies only the
+    requested cells; with `copy=False` it instead returns a read-only view of
+    the memory-mapped block when the requested tickers are a contiguous run
+    of one group (e.g. the whole universe after `compact`).
+
+    Stores written before the version key (one Close file per ticker) are
+    upgraded in place on open by rewriting `meta.json` only: each ticker
+    becomes a Close-only group. Rebuild such a cache to store all fields.
+
+    `append` only adds bytes at the end of files (or new files for a new
+    group); `meta.json` is replaced atomically last, so an interrupted
+    append leaves the previous state readable and the stray tail is trimmed
+    on the next append.
+    """
+
+    def __init__(self, root: str, fields: Sequence[str] = FIELDS):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.fields: Tuple[str, ...] = tuple(fields)
+        self._groups: List[Dict] = []
+        self._next_group = 0
+        self._rows = 0
+        path = os.path.join(root, META_FILE)
+        if os.path.exists(path):
+            with open(path) as fh:
+                meta = json.load(fh)
+            if 'version' not in meta:
+                meta = _upgrade_v1(meta)
+            elif meta['version'] != STORE_VERSION:
+                raise ValueError(f"price store at {root!r} has layout version {meta['version']}, "
+                                 f"expected {STORE_VERSION}; delete the directory to rebuild the cache")
+            self.fields = tuple(meta['fields'])
+            self._groups = meta['groups']
+            self._next_group = int(meta['next_group'])
+            self._rows = int(meta['rows'])
+            if meta.get('upgraded'):
+                self._write_meta()
+        self._locate()
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._where
+
+    @property
+    def tickers(self) -> List[str]:
+        return [t for g in self._groups for t in g['tickers']]
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self._dates_ns().copy().view('datetime64[ns]'))
+
+    @property
+    def last_date(self) -> Optional[pd.Timestamp]:
+        return pd.Timestamp(int(self._dates_ns()[-1])) if self._rows else None
+
+    def read(self, tickers: Optional[Sequence[str]] = None, start=None, end=None, field: str = 'Close',
+             copy: bool = True) -> pd.DataFrame:
+        """`field` values for `tickers` (default: all) between `start` and `end`, inclusive.
+
+        Tickers not in the store are skipped; the result has the store's date
+        index restricted to the range, like `DataFrame.loc[start:end]`. With
+        `copy=False` the frame may be a read-only view of the mapped file.
+        """
+        if field not in self.fields:
+            raise KeyError(f"field {field!r} not stored; have {self.fields}")
+        names = self.tickers if tickers is None else [t for t in tickers if t in self._where]
+        lo, hi = self._row_range(start, end)
+        index = pd.DatetimeIndex(np.array(self._dates_ns()[lo:hi]).view('datetime64[ns]'))
+        columns = pd.Index(names)
+        spots = [self._where[t] for t in names]
+        groups = {g for g, _ in spots}
+        if not copy and len(groups) == 1:
+            g = spots[0][0]
+            first = spots[0][1]
+            if [p for _, p in spots] == list(range(first, first + len(spots))):
+                block = self._block(g, field)[lo:hi, first:first + len(spots)]
+                return pd.DataFrame(block, index=index, columns=columns, copy=False)
+        values = np.empty((hi - lo, len(names)))
+        for g in groups:
+            cols = [j for j, (gg, _) in enumerate(spots) if gg == g]
+            values[:, cols] = self._block(g, field)[lo:hi][:, [spots[j][1] for j in cols]]
+        return pd.DataFrame(values, index=index, columns=columns)
+
+    def read_fields(self, tickers: Optional[Sequence[str]] = None, start=None, end=None,
+                    fields: Optional[Sequence[str]] = None, copy: bool = True) -> Dict[str, pd.DataFrame]:
+        """{field: date x ticker frame}, as taken by `stochastic_oscillator_panel`."""
+        return {f: self.read(tickers, start, end, f, copy) for f in (fields or self.fields)}
+
+    def read_array(self, tickers: Optional[Sequence[str]] = None, start=None, end=None,
+                   fields: Optional[Sequence[str]] = None) -> np.ndarray:
+        """The field x date x ticker array for the selection (a copy)."""
+        frames = self.read_fields(tickers, start, end, fields, copy=False)
+        return np.stack([f.to_numpy() for f in frames.values()])
+
+    def append(self, prices: PriceInput) -> int:
+        """Add rows dated after `last_date` and columns for new tickers; return rows added.
+
+        `prices` is a wide frame of closes, a frame with (field, ticker)
+        MultiIndex columns (as from `yfinance.download`) or a dict of
+        field -> frame; stored fields it lacks are NaN. New tickers get their
+        values at the already stored dates; rows on or before `last_date` are
+        otherwise ignored (history is never rewritten). Tickers absent from
+        `prices` are NaN on the new rows.
+        """
+        frames = _as_fields(prices)
+        index = pd.DatetimeIndex(sorted(set().union(*(f.index for f in frames.values())))) if frames else pd.DatetimeIndex([])
+        tickers = list(dict.fromkeys(t for f in frames.values() for t in f.columns))
+        self._trim()
+        old = self.dates
+        new_tickers = [t for t in tickers if t not in self._where]
+        if new_tickers:
+            group = {'id': self._next_group, 'tickers': new_tickers}
+            for field in self.fields:
+                history = _field_frame(frames, field, old, new_tickers)
+                with open(self._path(group, field), 'wb') as fh:
+                    fh.write(np.ascontiguousarray(history, dtype='<f8').tobytes())
+            self._groups.append(group)
+            self._next_group += 1
+            self._locate()
+        new_index = index[index > old[-1]] if len(old) else index
+        if len(new_index):
+            stamps = new_index.as_unit('ns').asi8
+            with open(os.path.join(self.root, DATES_FILE), 'ab') as fh:
+                fh.write(stamps.astype('<i8').tobytes())
+            for group in self._groups:
+                for field in self.fields:
+                    block = _field_frame(frames, field, new_index, group['tickers'])
+                    with open(self._path(group, field), 'ab') as fh:
+                        fh.write(np.ascontiguousarray(block, dtype='<f8').tobytes())
+        self._rows += len(new_index)
+        self._write_meta()
+        return len(new_index)
+
+    def compact(self) -> None:
+        """Merge all ticker groups into one so whole-universe reads are zero-copy.
+
+        Writes new files before switching `meta.json`, then removes the old
+        ones; the only operation here that rewrites stored values.
+        """
+        if len(self._groups) <= 1:
+            return
+        old_groups = self._groups
+        group = {'id': self._next_group, 'tickers': self.tickers}
+        for field in self.fields:
+            block = self.read(field=field, copy=False).to_numpy()
+            with open(self._path(group, field), 'wb') as fh:
+                fh.write(np.ascontiguousarray(block, dtype='<f8').tobytes())
+        self._groups = [group]
+        self._next_group += 1
+        self._locate()
+        self._write_meta()
+        for g in old_groups:
+            for field in self.fields:
+                os.remove(self._path(g, field))
+
+    def import_csv(self, path: str) -> int:
+        """Load a legacy wide price CSV (date index, one column of closes per ticker)."""
+        return self.append(pd.read_csv(path, index_col=0, parse_dates=True))
+
+    def _locate(self) -> None:
+        self._where = {t: (i, j) for i, g in enumerate(self._groups) for j, t in enumerate(g['tickers'])}
+
+    def _path(self, group: Dict, field: str) -> str:
+        name = group.get('files', {}).get(field, f"{field}_{group['id']:05d}.f8")
+        return os.path.join(self.root, name)
+
+    def _row_range(self, start, end) -> Tuple[int, int]:
+        dates = self._dates_ns()
+        lo = 0 if start is None else int(np.searchsorted(dates, pd.Timestamp(start).value, side='left'))
+        hi = self._rows if end is None else int(np.searchsorted(dates, pd.Timestamp(end).value, side='right'))
+        return lo, max(hi, lo)
+
+    def _dates_ns(self) -> np.ndarray:
+        if not self._rows:
+            return np.empty(0, dtype='<i8')
+        return np.memmap(os.path.join(self.root, DATES_FILE), dtype='<i8', mode='r', shape=(self._rows,))
+
+    def _block(self, g: int, field: str) -> np.ndarray:
+        group = self._groups[g]
+        shape = (self._rows, len(group['tickers']))
+        if not self._rows:
+            return np.empty(shape)
+        return np.memmap(self._path(group, field), dtype='<f8', mode='r', shape=shape)
+
+    def _trim(self) -> None:
+        """Drop bytes past the committed row count left by an interrupted append."""
+        sizes = [(os.path.join(self.root, DATES_FILE), self._rows * 8)]
+        sizes += [(self._path(g, f), self._rows * len(g['tickers']) * 8) for g in self._groups for f in self.fields]
+        for path, size in sizes:
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                os.truncate(path, size)
+
+    def _write_meta(self) -> None:
+        path = os.path.join(self.root, META_FILE)
+        tmp = path + '.tmp'
+        meta = {'version': STORE_VERSION, 'rows': self._rows, 'fields': list(self.fields), 'groups': self._groups, 'next_group': self._next_group}
+        with open(tmp, 'w') as fh:
+            json.dump(meta, fh)
+        os.replace(tmp, path)
+
+
+def _upgrade_v1(meta: Dict) -> Dict:
+    """Map the original layout ({'columns': {ticker: file}, 'rows'}) onto Close-only groups."""
+    columns = meta['columns']
+    groups = [{'id': i, 'tickers': [t], 'files': {'Close': name}} for i, (t, name) in enumerate(columns.items())]
+    return {'version': STORE_VERSION, 'rows': meta['rows'], 'fields': ['Close'], 'groups': groups,
+            'next_group': len(groups), 'upgraded': True}
+
+
+def _as_fields(prices: PriceInput) -> Dict[str, pd.DataFrame]:
+    """Normalize append input to {field: date x ticker frame} with unique, sorted dates."""
+    if isinstance(prices, pd.DataFrame):
+        if isinstance(prices.columns, pd.MultiIndex):
+            frames = {f: prices.xs(f, axis=1, level=0) for f in prices.columns.get_level_values(0).unique()}
+        else:
+            frames = {'Close': prices}
+    else:
+        frames = dict(prices)
+    out = {}
+    for field, frame in frames.items():
+        frame = frame.sort_index()
+        frame.index = pd.DatetimeIndex(frame.index)
+        out[field] = frame[~frame.index.duplicated(keep='last')]
+    return out
+
+
+def _field_frame(frames: Dict[str, pd.DataFrame], field: str, index: pd.DatetimeIndex, tickers: List[str]) -> np.ndarray:
+    frame = frames.get(field)
+    if frame is None:
+        return np.full((len(index), len(tickers)), np.nan)
+    return frame.reindex(index=index, columns=tickers).to_numpy(dtype=float)
+
+__all__ = ['PriceStore', 'FIELDS', 'STORE_VERSION']
@@ -0,0 +1,159 @@
+from __future__ import annotations
+import glob
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .sp500 import get_sp500_tickers
+
+UNIVERSE_DIR_DEFAULT = "sp500_universe"
+STATE_FILE = "refresh_state.json"
+
+
+class MembershipIndex:
+    """Point-in-time universe lookup over dated constituent snapshots.
+
+    The universe on date D is the latest snapshot dated on or before D.
+    Dates before the first snapshot map to an empty universe, or to the
+    first snapshot with `backfill=True`. Every calendar day between the
+    first and last snapshot is mapped to its snapshot up front, so `as_of`
+    is an index computation rather than a search.
+    """
+
+    def __init__(self, dates: Sequence, universes: Sequence[Sequence[str]], backfill: bool = False):
+        if len(dates) != len(universes):
+            raise ValueError("dates and universes must have the same length")
+        order = np.argsort(pd.DatetimeIndex(dates).normalize().asi8, kind='stable')
+        self.dates = pd.DatetimeIndex(dates).normalize()[order]
+        self.universes: List[Tuple[str, ...]] = [tuple(universes[i]) for i in order]
+        self.backfill = backfill
+        self.tickers: List[str] = list(dict.fromkeys(t for u in self.universes for t in u))
+        if len(self.dates):
+            days = pd.date_range(self.dates[0], self.dates[-1], freq='D')
+            self._slot = np.searchsorted(self.dates.asi8, days.asi8, side='right') - 1
+        else:
+            self._slot = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.universes)
+
+    def as_of(self, date) -> Tuple[str, ...]:
+        """Constituents on `date`."""
+        if not len(self.universes):
+            return ()
+        offset = (pd.Timestamp(date).normalize() - self.dates[0]).days
+        if offset < 0:
+            return self.universes[0] if self.backfill else ()
+        return self.universes[self._slot[min(offset, len(self._slot) - 1)]]
+
+    def mask(self, index: pd.DatetimeIndex, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Boolean date x ticker membership matrix, e.g. for `prices.where(mask)`."""
+        columns = self.tickers if columns is None else list(columns)
+        pos = {t: j for j, t in enumerate(columns)}
+        member = np.zeros((len(self.universes) + 1, len(columns)), dtype=bool)
+        for i, universe in enumerate(self.universes):
+            cols = [pos[t] for t in universe if t in pos]
+            member[i + 1, cols] = True
+        slots = np.searchsorted(self.dates.asi8, pd.DatetimeIndex(index).normalize().asi8, side='right')
+        if self.backfill and len(self.universes):
+            slots = np.maximum(slots, 1)
+        return pd.DataFrame(member[slots], index=index, columns=pd.Index(columns))
+
+
+class UniverseSnapshots:
+    """Versioned, TTL-refreshed on-disk snapshots of the S&P 500 constituents.
+
+    Each refresh that changes the list writes `sp500_<date>.json` under
+    `root`; an unchanged list only bumps the latest snapshot's fetch time.
+    `current()` returns the latest snapshot while it is younger than `ttl`
+    seconds and otherwise refetches with `fetch` (default
+    `get_sp500_tickers`), falling back to the latest snapshot when the fetch
+    fails (e.g. offline). A failed fetch is recorded in `refresh_state.json`,
+    and no new attempt is made, in this or any other process, until
+    `retry_interval` seconds have passed. `index()` builds a
+    `MembershipIndex` over all snapshots.
+    """
+
+    def __init__(self, root: str = UNIVERSE_DIR_DEFAULT, ttl: float = 24 * 3600,
+                 fetch: Optional[Callable[[], List[str]]] = None, clock: Callable[[], float] = time.time,
+                 retry_interval: float = 3600):
+        self.root = root
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self.fetch = get_sp500_tickers if fetch is None else fetch
+        self.clock = clock
+        self._snapshots: Optional[List[Dict]] = None
+        os.makedirs(root, exist_ok=True)
+
+    def snapshots(self) -> List[Dict]:
+        """All snapshots as dicts with 'as_of', 'fetched_at' and 'tickers', oldest first."""
+        if self._snapshots is None:
+            snaps = []
+            for path in glob.glob(os.path.join(self.root, 'sp500_*.json')):
+                with open(path) as fh:
+                    snaps.append(json.load(fh))
+            self._snapshots = sorted(snaps, key=lambda s: s['as_of'])
+        return self._snapshots
+
+    def save(self, tickers: Sequence[str], as_of=None) -> Dict:
+        """Record `tickers` as the constituents on `as_of` (default: today)."""
+        now = self.clock()
+        as_of = pd.Timestamp(as_of if as_of is not None else pd.Timestamp.fromtimestamp(now)).strftime('%Y-%m-%d')
+        snaps = self.snapshots()
+        latest = snaps[-1] if snaps else None
+        if latest is not None and latest['tickers'] == list(tickers) and latest['as_of'] <= as_of:
+            snap = dict(latest, fetched_at=now)
+        else:
+            snap = {'as_of': as_of, 'fetched_at': now, 'tickers': list(tickers)}
+        path = os.path.join(self.root, f"sp500_{snap['as_of']}.json")
+        with open(path + '.tmp', 'w') as fh:
+            json.dump(snap, fh)
+        os.replace(path + '.tmp', path)
+        self._snapshots = sorted([s for s in snaps if s['as_of'] != snap['as_of']] + [snap], key=lambda s: s['as_of'])
+        return snap
+
+    def current(self) -> List[str]:
+        """Latest constituents, refetched when the newest snapshot is older than `ttl`."""
+        snaps = self.snapshots()
+        now = self.clock()
+        if snaps and now - snaps[-1]['fetched_at'] < self.ttl:
+            return list(snaps[-1]['tickers'])
+        if snaps and now - self._failed_at() < self.retry_interval:
+            return list(snaps[-1]['tickers'])
+        try:
+            tickers = self.fetch()
+        except Exception:
+            self._write_state({'failed_at': now})
+            if not snaps:
+                raise
+            return list(snaps[-1]['tickers'])
+        self._write_state({})
+        return list(self.save(tickers)['tickers'])
+
+    def index(self, backfill: bool = False) -> MembershipIndex:
+        snaps = self.snapshots()
+        return MembershipIndex([s['as_of'] for s in snaps], [s['tickers'] for s in snaps], backfill=backfill)
+
+    def _failed_at(self) -> float:
+        path = os.path.join(self.root, STATE_FILE)
+        if not os.path.exists(path):
+            return -float('inf')
+        with open(path) as fh:
+            return float(json.load(fh).get('failed_at', -float('inf')))
+
+    def _write_state(self, state: Dict) -> None:
+        path = os.path.join(self.root, STATE_FILE)
+        with open(path + '.tmp', 'w') as fh:
+            json.dump(state, fh)
+        os.replace(path + '.tmp', path)
+
+
+def cached_sp500_tickers(root: str = UNIVERSE_DIR_DEFAULT, ttl: float = 24 * 3600) -> List[str]:
+    """`get_sp500_tickers` through `UniverseSnapshots`: at most one fetch per `ttl`, offline-safe."""
+    return UniverseSnapshots(root, ttl).current()
+
+__all__ = ['MembershipIndex', 'UniverseSnapshots', 'cached_sp500_tickers']
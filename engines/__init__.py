@@ -1,4 +1,5 @@
 """Portfolio engines (factor, allocation, rebalancing)."""
 from .factor_engine import FactorConfig, FactorPortfolioEngine
+from .streaming import StreamingFactorEngine
 
-__all__ = ['FactorConfig', 'FactorPortfolioEngine']
+__all__ = ['FactorConfig', 'FactorPortfolioEngine', 'StreamingFactorEngine']
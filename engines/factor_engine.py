@@ -2,32 +2,32 @@ from __future__ import annotations
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass, field
-from typing import Dict, Callable, List, Any
-from factors import (
-    momentum_factor,
-    volatility_factor,
-    value_factor,
-    quality_factor,
-    size_factor,
-    composite_rank,
-)
-from analytics.performance import summarize_performance
+from typing import Dict, Callable, List, Any, Optional
+from factors import composite_rank
+from factors.core import _zscore_columns, top_bottom_indices
+from factors.cache import FactorCache, factor_key, price_fingerprint
+from factors.context import FactorContext
+from factors.registry import DEFAULT_REGISTRY, FactorSpec, fill_starts
+from analytics.performance import summarize_performance, summarize_performance_batch
+from backtest.ledger import TradeLedger
+from utils.schedule import RebalanceSchedule
 
 FactorFunc = Callable[[pd.DataFrame], pd.Series]
+PanelFactorFunc = Callable[[pd.DataFrame], pd.DataFrame]
 
-DEFAULT_FACTORS: Dict[str, FactorFunc] = {
-    'momentum': lambda px: momentum_factor(px, lookback=126),
-    'low_vol': lambda px: volatility_factor(px, lookback=126),
-    'value': lambda px: value_factor(px),
-    'quality': lambda px: quality_factor(px),
-    'size': lambda px: size_factor(px),
-}
+# Callable `FactorSpec`s from the default registry; their declared lookbacks
+# let the engine hand each factor only the tail window it reads.
+DEFAULT_FACTORS: Dict[str, FactorFunc] = DEFAULT_REGISTRY.factor_funcs()
+
+# Whole-panel counterparts of DEFAULT_FACTORS: row t of each panel equals the
+# per-date factor evaluated on prices.loc[:t].
+DEFAULT_PANEL_FACTORS: Dict[str, PanelFactorFunc] = DEFAULT_REGISTRY.panel_funcs()
 
 @dataclass
 class FactorConfig:
     weights: Dict[str, float]
     top_n: int = 20
-    rebalance_freq: str = 'M'  # monthly end
+    rebalance_freq: str = 'M'  # monthly end; 'W-FRI' and 'Q' also supported
     long_short: bool = False
     short_fraction: float = 0.0  # fraction of long notional to allocate to shorts
     """Configuration for a factor-based portfolio.
@@ -35,97 +35,353 @@ class FactorConfig:
     Attributes
     - weights: mapping of factor name to weight used when combining factor scores.
     - top_n: number of assets to select for longs/shorts.
-    - rebalance_freq: pandas resample rule string (e.g., 'M' for monthly).
+    - rebalance_freq: pandas resample rule string ('M' monthly, 'W-FRI' weekly, 'Q' quarterly).
     - long_short: whether to construct symmetric long/short positions.
     - short_fraction: fraction of long notional to allocate to shorts when `long_short` is True.
     """
 
+def _target_positions(composite: pd.Series, config: FactorConfig, capital: float, prices_d: pd.Series) -> Dict[str, float]:
+    """Equal-weight share targets for the top (and optionally bottom) names of `composite`."""
+    longs = composite.head(config.top_n).index.tolist()
+    shorts: List[str] = []
+    if config.long_short and config.short_fraction > 0:
+        shorts = composite.tail(config.top_n).index.tolist()
+    # equal weight sizing (placeholder for future risk parity / volatility targeting)
+    target_long_notional = capital
+    target_short_notional = capital * config.short_fraction if shorts else 0
+    per_long = target_long_notional / len(longs) if longs else 0
+    per_short = target_short_notional / len(shorts) if shorts else 0
+    target_positions: Dict[str, float] = {}
+    for sym in longs:
+        target_positions[sym] = per_long / prices_d.get(sym, np.nan)
+    for sym in shorts:
+        target_positions[sym] = - per_short / prices_d.get(sym, np.nan)
+    return target_positions
+
+
+def _rebalance_trades(positions: Dict[str, float], target_positions: Dict[str, float], d, prices_d: pd.Series,
+                      ledger: TradeLedger) -> None:
+    """Record into `ledger` the trades moving `positions` to `target_positions` at date `d`."""
+    syms = list(dict.fromkeys([*positions, *target_positions]))
+    prev = np.array([positions.get(sym, 0.0) for sym in syms], dtype=float)
+    new = np.array([target_positions.get(sym, 0.0) for sym in syms], dtype=float)
+    delta = new - prev
+    keep = np.abs(delta) > 1e-9
+    if not keep.any():
+        return
+    traded = [sym for sym, k in zip(syms, keep) if k]
+    ledger.extend(d, traded, delta[keep], prices_d.reindex(traded).to_numpy(dtype=float))
+
+
+def _book_performance(equity_df: pd.DataFrame, trade_log: TradeLedger) -> Dict[str, float]:
+    return summarize_performance(equity_df['equity'] if 'equity' in equity_df else pd.Series(dtype=float),
+                                 equity_df['returns'] if 'returns' in equity_df else pd.Series(dtype=float), trade_log)
+
+
 @dataclass
 class FactorPortfolioEngine:
     factor_funcs: Dict[str, FactorFunc] = field(default_factory=lambda: DEFAULT_FACTORS)
     config: FactorConfig = field(default_factory=lambda: FactorConfig(weights={'momentum':0.6,'low_vol':0.4}))
     initial_capital: float = 1_000_000
+    panel: bool = False
+    panel_funcs: Dict[str, PanelFactorFunc] = field(default_factory=lambda: DEFAULT_PANEL_FACTORS)
+    cache: Optional[FactorCache] = None
+    schedule: Optional[RebalanceSchedule] = None
     """A lightweight factor portfolio engine used in examples and tests.
 
     The engine is intentionally simple: it evaluates configured factor
     functions on historical prices, forms a composite ranking using
     `factors.composite_rank`, sizes equally across selected names, and
     simulates mark-to-market equity between rebalances.
+
+    With `panel=True` each factor found in `panel_funcs` is computed once over
+    the full date x asset panel and the engine reads the cross-section at each
+    rebalance row instead of re-running the factor on `prices.loc[:d]`. This
+    keeps runtime linear in history length; factors without a panel
+    counterpart fall back to per-date evaluation. When overriding an entry of
+    `factor_funcs`, override the matching `panel_funcs` entry as well.
+
+    Passing a shared `cache` (a `factors.cache.FactorCache`) memoizes factor
+    scores across runs, keyed by factor name, factor parameters, as-of date and
+    a fingerprint of `prices`; repeated runs over the same prices with
+    different weights only redo the combination and simulation steps.
+
+    Factors given as `factors.registry.FactorSpec` receive a zero-copy view of
+    only their declared `lookback` rows (of close prices, or of returns
+    computed once per run when the spec declares a 'returns' input), so memory
+    per rebalance scales with the largest lookback rather than full history.
+    Where a column is missing at the start of that view, the view reaches
+    back to the column's last price (see `factors.registry.fill_starts`), so
+    forward-filled returns and scores match evaluating on the full history.
+    Specs declaring a 'context' input share one `factors.context.FactorContext`
+    per evaluation (the whole panel in panel mode, the longest declared
+    lookback per rebalance otherwise), so returns and rolling moments are
+    computed once for all of them.
+    Plain callables still receive the whole history up to the rebalance date.
+
+    Rebalance points come from `schedule` (a `utils.schedule.RebalanceSchedule`,
+    which also accepts custom calendars) or, when unset, from
+    `config.rebalance_freq`.
     """
 
     def run(self, prices: pd.DataFrame) -> Dict[str, Any]:
         prices = prices.sort_index()
-        rebal_dates = prices.resample(self._freq_to_rule()).last().index
+        active = {name: f for name, f in self.factor_funcs.items() if name in self.config.weights}
+        steps = self._rebalance_steps(prices)
+        scores = self._step_scores(prices, steps, active)
+        composites = [composite_rank(factor_scores, self.config.weights, top_n=self.config.top_n) for factor_scores in scores]
+        return self._simulate(prices, steps, composites, self.config)
+
+    def run_batch(self, prices: pd.DataFrame, weights: Any, top_n: Any = None, long_short: Any = None,
+                  short_fraction: Any = None, factor_names: Optional[List[str]] = None) -> pd.DataFrame:
+        """Evaluate many factor weightings over the same prices in one pass.
+
+        `weights` is a list of `FactorConfig`, a list of weight dicts, a
+        DataFrame (rows = configurations, columns = factor names) or a 2D array
+        whose columns follow `factor_names`. `top_n`, `long_short` and
+        `short_fraction` may be scalars or one value per configuration and
+        default to `self.config`; all configurations share its rebalance
+        frequency.
+
+        Factor scores and their cross-sectional z-scores are computed once per
+        rebalance date; each configuration then only adds a matrix multiply
+        and its own selection/simulation. Returns one row per configuration
+        with its parameters and CAGR, Sharpe, MaxDrawdown and Turnover, equal
+        to calling `run` with that configuration.
+        """
+        prices = prices.sort_index()
+        configs = self._batch_configs(weights, top_n, long_short, short_fraction, factor_names)
+        names = [name for name in self.factor_funcs if any(name in c.weights for c in configs)]
+        active = {name: self.factor_funcs[name] for name in names}
+        steps = self._rebalance_steps(prices)
+        scores = self._step_scores(prices, steps, active)
+        w = np.array([[c.weights.get(name, 0.0) for name in names] for c in configs], dtype=float).reshape(len(configs), len(names))
+        totals = np.array([sum(c.weights.values()) for c in configs], dtype=float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            w = w / totals[:, None]
+        uses_factors = [any(name in c.weights for name in names) for c in configs]
+        composites: List[List[pd.Series]] = [[] for _ in configs]
+        for factor_scores in scores:
+            aligned = pd.DataFrame(factor_scores)
+            zed = np.nan_to_num(_zscore_columns(aligned.to_numpy(dtype=float)), nan=0.0)
+            combined = zed @ w[:, [names.index(c) for c in aligned.columns]].T
+            for j, used in enumerate(uses_factors):
+                if not used or aligned.empty:
+                    composites[j].append(pd.Series(dtype=float))
+                    continue
+                top, bottom = top_bottom_indices(combined[:, j], configs[j].top_n)
+                order = np.concatenate([top, bottom[~np.isin(bottom, top)]])
+                composites[j].append(pd.Series(combined[order, j], index=aligned.index[order]))
+        books = [self._mark_book(prices, steps, cfg_composites, cfg) for cfg, cfg_composites in zip(configs, composites)]
+        perfs = self._batch_performance(books)
+        rows = []
+        for cfg, perf in zip(configs, perfs):
+            row: Dict[str, Any] = {name: cfg.weights.get(name, 0.0) for name in names}
+            row.update({'top_n': cfg.top_n, 'long_short': cfg.long_short, 'short_fraction': cfg.short_fraction})
+            row.update(perf)
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    @staticmethod
+    def _batch_performance(books: List[tuple]) -> List[Dict[str, float]]:
+        """Performance of each (equity frame, ledger) book.
+
+        Books marked on the same dates (every configuration that trades, as
+        they share rebalance steps) are summarized together in one
+        `summarize_performance_batch` call; any others individually.
+        """
+        perfs: List[Optional[Dict[str, float]]] = [None] * len(books)
+        shared = [j for j, (equity_df, _) in enumerate(books) if not equity_df.empty]
+        if shared and all(books[j][0].index.equals(books[shared[0]][0].index) for j in shared):
+            equity = pd.concat({j: books[j][0]['equity'] for j in shared}, axis=1)
+            returns = pd.concat({j: books[j][0]['returns'] for j in shared}, axis=1)
+            batch = summarize_performance_batch(equity, returns, {j: books[j][1] for j in shared})
+            for j in shared:
+                perfs[j] = batch.loc[j].to_dict()
+        for j, (equity_df, ledger) in enumerate(books):
+            if perfs[j] is None:
+                perfs[j] = _book_performance(equity_df, ledger)
+        return perfs
+
+    def _batch_configs(self, weights: Any, top_n: Any, long_short: Any, short_fraction: Any,
+                       factor_names: Optional[List[str]]) -> List[FactorConfig]:
+        """Normalize the `run_batch` inputs into a list of `FactorConfig`."""
+        if isinstance(weights, (list, tuple)) and weights and all(isinstance(c, FactorConfig) for c in weights):
+            configs = list(weights)
+            if any(c.rebalance_freq != self.config.rebalance_freq for c in configs):
+                raise ValueError("all batch configurations must share the engine's rebalance_freq")
+            return configs
+        if isinstance(weights, pd.DataFrame):
+            weight_dicts = [dict(zip(weights.columns, row)) for row in weights.to_numpy(dtype=float)]
+        elif isinstance(weights, (list, tuple)) and weights and all(isinstance(w, dict) for w in weights):
+            weight_dicts = [dict(w) for w in weights]
+        else:
+            arr = np.atleast_2d(np.asarray(weights, dtype=float))
+            if factor_names is None or len(factor_names) != arr.shape[1]:
+                raise ValueError("factor_names must name each column of a weight array")
+            weight_dicts = [dict(zip(factor_names, row)) for row in arr]
+        n = len(weight_dicts)
+
+        def _per_config(value: Any, default: Any) -> List[Any]:
+            value = default if value is None else value
+            if np.ndim(value) == 0:
+                return [value] * n
+            if len(value) != n:
+                raise ValueError(f"expected {n} values, got {len(value)}")
+            return list(value)
+
+        return [
+            FactorConfig(weights=wd, top_n=int(tn), rebalance_freq=self.config.rebalance_freq,
+                         long_short=bool(ls), short_fraction=float(sf))
+            for wd, tn, ls, sf in zip(weight_dicts,
+                                      _per_config(top_n, self.config.top_n),
+                                      _per_config(long_short, self.config.long_short),
+                                      _per_config(short_fraction, self.config.short_fraction))
+        ]
+
+    def _rebalance_steps(self, prices: pd.DataFrame) -> List[tuple]:
+        """(date, row position, holding-period end row) for each usable rebalance."""
+        plan = self._schedule().map(prices.index)
+        return [(prices.index[pos], pos, end) for pos, end in zip(plan.pos, plan.end_pos) if pos + 1 >= 30]
+
+    def _step_scores(self, prices: pd.DataFrame, steps: List[tuple], active: Dict[str, FactorFunc]) -> List[Dict[str, pd.Series]]:
+        """Factor scores for every rebalance step."""
+        fingerprint = price_fingerprint(prices) if self.cache is not None else None
+        inputs = self._factor_inputs(prices, active)
+        panels = self._factor_panels(inputs, active, fingerprint) if self.panel else {}
+        starts = fill_starts(prices)
+        return [self._factor_scores(inputs, pos, active, panels, fingerprint, starts) for _, pos, _ in steps]
+
+    def _factor_inputs(self, prices: pd.DataFrame, active: Dict[str, FactorFunc]) -> Dict[str, Any]:
+        """Whole-panel inputs declared by the active factor specs, computed once per run."""
+        specs = [f for f in active.values() if isinstance(f, FactorSpec)]
+        needed = {i for f in specs for i in f.inputs}
+        if 'ohlc' in needed:
+            raise ValueError("FactorPortfolioEngine runs on close prices only; 'ohlc' factors are not supported")
+        self._context_rows = max((f.lookback for f in specs if 'context' in f.inputs), default=0)
+        inputs: Dict[str, Any] = {'close': prices}
+        if needed & {'returns', 'context'}:
+            inputs['context'] = FactorContext(prices)
+        if 'returns' in needed:
+            inputs['returns'] = inputs['context'].returns()
+        return inputs
+
+    def _simulate(self, prices: pd.DataFrame, steps: List[tuple], composites: List[pd.Series],
+                  config: FactorConfig) -> Dict[str, Any]:
+        """Size, trade and mark the book to market given a composite ranking per step."""
+        equity_df, trade_log = self._mark_book(prices, steps, composites, config)
+        return {
+            'equity': equity_df,
+            'performance': _book_performance(equity_df, trade_log),
+            'trades': trade_log.to_frame(),
+        }
+
+    def _mark_book(self, prices: pd.DataFrame, steps: List[tuple], composites: List[pd.Series],
+                   config: FactorConfig) -> tuple:
+        """(equity frame, trade ledger) of one configuration."""
         capital = self.initial_capital
         positions: Dict[str, float] = {}
-        history = []
-        trade_log = []
-        prev_equity_series = []
-        for d in rebal_dates:
-            if d not in prices.index:
-                # align to nearest previous trading day
-                locs = prices.index.get_indexer([d], method='nearest')
-                d = prices.index[locs[0]]
-            window_px = prices.loc[:d]
-            if len(window_px) < 30:
-                continue
-            factor_scores = {name: f(window_px) for name, f in self.factor_funcs.items() if name in self.config.weights}
-            composite = composite_rank(factor_scores, self.config.weights)
-            # basic attribution: store z-scored weighted components for long list
-            attribution = None
+        trade_log = TradeLedger()
+        px_values = prices.to_numpy(dtype=float)
+        equity_rows: List[np.ndarray] = []
+        equity_values: List[np.ndarray] = []
+        last_marked = -1
+        for (d, pos, end), composite in zip(steps, composites):
             if composite.empty:
                 continue
-            longs = composite.head(self.config.top_n).index.tolist()
-            shorts: List[str] = []
-            if self.config.long_short and self.config.short_fraction > 0:
-                shorts = composite.tail(self.config.top_n).index.tolist()
-            # equal weight sizing (placeholder for future risk parity / volatility targeting)
-            target_long_notional = capital
-            target_short_notional = capital * self.config.short_fraction if shorts else 0
-            per_long = target_long_notional / len(longs) if longs else 0
-            per_short = target_short_notional / len(shorts) if shorts else 0
             prices_d = prices.loc[d]
-            target_positions: Dict[str, float] = {}
-            for sym in longs:
-                target_positions[sym] = per_long / prices_d.get(sym, np.nan)
-            for sym in shorts:
-                target_positions[sym] = - per_short / prices_d.get(sym, np.nan)
-            # record trades
-            all_syms = set(positions) | set(target_positions)
-            for sym in all_syms:
-                prev = positions.get(sym, 0.0)
-                new = target_positions.get(sym, 0.0)
-                delta = new - prev
-                if abs(delta) > 1e-9:
-                    trade_log.append({'date': d, 'symbol': sym, 'shares': delta, 'price': prices_d.get(sym, np.nan), 'notional': delta * prices_d.get(sym, np.nan)})
+            target_positions = _target_positions(composite, config, capital, prices_d)
+            _rebalance_trades(positions, target_positions, d, prices_d, trade_log)
             positions = target_positions
-            # compute equity until next rebalance
-            next_idx = list(rebal_dates).index(d) + 1
-            end_date = rebal_dates[next_idx] if next_idx < len(rebal_dates) else prices.index[-1]
-            segment = prices.loc[d:end_date]
-            # mark to market each day
-            for day, row in segment.iterrows():
-                equity_day = sum(shares * row.get(sym, np.nan) for sym, shares in positions.items())
-                prev_equity_series.append({'date': day, 'equity': equity_day})
-            capital = prev_equity_series[-1]['equity'] if prev_equity_series else capital
-        equity_df = pd.DataFrame(prev_equity_series).drop_duplicates('date').set_index('date').sort_index()
+            if end < pos:
+                continue
+            # mark to market the whole holding period as one positions x prices product
+            cols = prices.columns.get_indexer(list(positions))
+            shares = np.fromiter(positions.values(), dtype=float, count=len(positions))
+            held_px = px_values[pos:end + 1, cols]
+            held_px[:, cols < 0] = np.nan  # a symbol missing from `prices` has no price, not the last column's
+            segment_equity = held_px @ shares
+            capital = segment_equity[-1]
+            # the boundary row already marked by the previous period keeps its value
+            start = max(pos, last_marked + 1)
+            if start <= end:
+                equity_rows.append(np.arange(start, end + 1))
+                equity_values.append(segment_equity[start - pos:])
+                last_marked = end
+        rows = np.concatenate(equity_rows) if equity_rows else np.array([], dtype=int)
+        values = np.concatenate(equity_values) if equity_values else np.array([], dtype=float)
+        equity_df = pd.DataFrame({'equity': values}, index=pd.Index(prices.index[rows], name='date'))
         if not equity_df.empty:
             equity_df['returns'] = equity_df['equity'].pct_change().fillna(0)
             equity_df['drawdown'] = equity_df['equity'] / equity_df['equity'].cummax() - 1
-        perf = summarize_performance(equity_df['equity'] if 'equity' in equity_df else pd.Series(dtype=float), equity_df['returns'] if 'returns' in equity_df else pd.Series(dtype=float), pd.DataFrame(trade_log))
-        return {
-            'equity': equity_df,
-            'performance': perf,
-            'trades': pd.DataFrame(trade_log),
-        }
+        return equity_df, trade_log
+
+    def _factor_panels(self, inputs: Dict[str, Any], active: Dict[str, FactorFunc],
+                       fingerprint: Optional[str]) -> Dict[str, pd.DataFrame]:
+        """Compute whole-panel factor scores for active factors that have a panel form."""
+        panels = {}
+        prices = inputs['close']
+        for name, f in active.items():
+            if name in self.panel_funcs:
+                func = self.panel_funcs[name]
+                data = inputs[f.inputs[0]] if isinstance(f, FactorSpec) else prices
+                panels[name] = self._cached(name, func, ('panel', prices.index[-1]), fingerprint, lambda: func(data))
+        return panels
+
+    def _cached(self, name: str, func: Callable, as_of, fingerprint: Optional[str],
+                compute: Callable[[], Any]) -> Any:
+        """Look up (or compute and store) a factor result in `self.cache`.
+
+        Factors `factor_key` cannot describe are always recomputed.
+        """
+        func_key = factor_key(func) if self.cache is not None else None
+        if func_key is None:
+            return compute()
+        return self.cache.get_or_compute((name, func_key, as_of, fingerprint), compute)
+
+    def _factor_scores(self, inputs: Dict[str, Any], pos: int, active: Dict[str, FactorFunc],
+                       panels: Dict[str, pd.DataFrame], fingerprint: Optional[str],
+                       starts: np.ndarray) -> Dict[str, pd.Series]:
+        """Cross-sectional factor scores as of row `pos`.
+
+        Reads the row from a precomputed panel when available. Otherwise a
+        `FactorSpec` is evaluated on a tail view of its declared lookback (specs
+        with a 'context' input share one context over the longest such tail)
+        and a plain callable on the full history `prices.iloc[:pos + 1]`.
+        """
+        prices = inputs['close']
+        as_of = prices.index[pos]
+        scores: Dict[str, pd.Series] = {}
+        context: Optional[FactorContext] = None
+        for name, f in active.items():
+            if name in panels:
+                scores[name] = panels[name].iloc[pos]
+            elif isinstance(f, FactorSpec) and f.inputs[0] == 'context':
+                if context is None:
+                    context = FactorContext(prices.iloc[starts[max(0, pos + 1 - self._context_rows)]:pos + 1])
+                scores[name] = self._cached(name, f, as_of, fingerprint, lambda: f(context))
+            elif isinstance(f, FactorSpec):
+                window = f.tail(inputs[f.inputs[0]], pos, starts)
+                scores[name] = self._cached(name, f, as_of, fingerprint, lambda: f(window))
+            else:
+                window = prices.iloc[:pos + 1]
+                scores[name] = self._cached(name, f, as_of, fingerprint, lambda: f(window))
+        return scores
+
+    def _schedule(self) -> RebalanceSchedule:
+        if self.schedule is not None:
+            return self.schedule
+        return RebalanceSchedule(freq=self._freq_to_rule())
 
     def _freq_to_rule(self) -> str:
         if self.config.rebalance_freq.upper() in ('M','MS'):
             return 'M'
         if self.config.rebalance_freq.upper() in ('W','W-FRI'):
             return 'W-FRI'
+        if self.config.rebalance_freq.upper() in ('Q','QS','Q-DEC'):
+            return 'Q'
         return 'M'
 
 __all__ = [
-    'FactorConfig', 'FactorPortfolioEngine'
+    'FactorConfig', 'FactorPortfolioEngine', 'DEFAULT_FACTORS', 'DEFAULT_PANEL_FACTORS'
 ]
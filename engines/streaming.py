@@ -0,0 +1,242 @@
+from __future__ import annotations
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from factors import composite_rank
+from factors.registry import DEFAULT_REGISTRY
+from analytics.performance import summarize_performance
+from backtest.ledger import TradeLedger
+from .factor_engine import FactorConfig, _target_positions, _rebalance_trades
+
+# Rolling windows used by DEFAULT_FACTORS in `engines.factor_engine`.
+MOMENTUM_LOOKBACK = DEFAULT_REGISTRY['momentum'].params['lookback']
+LOW_VOL_LOOKBACK = DEFAULT_REGISTRY['low_vol'].params['lookback']
+QUALITY_LOOKBACK = DEFAULT_REGISTRY['quality'].params['lookback']
+SIZE_LOOKBACK = DEFAULT_REGISTRY['size'].lookback
+
+STREAMING_FACTORS = ('momentum', 'low_vol', 'value', 'quality', 'size')
+
+
+class _RingBuffer:
+    """Fixed-size ring of the last `size` rows for a vector of assets."""
+
+    def __init__(self, size: int, n_assets: int):
+        self.buf = np.full((size, n_assets), np.nan)
+        self.count = 0
+
+    def push(self, row: np.ndarray) -> np.ndarray:
+        """Store `row` and return the row it overwrote (NaN while filling)."""
+        slot = self.count % len(self.buf)
+        evicted = self.buf[slot].copy()
+        self.buf[slot] = row
+        self.count += 1
+        return evicted
+
+    def ago(self, k: int) -> np.ndarray:
+        """Row pushed `k` updates before the latest one."""
+        return self.buf[(self.count - 1 - k) % len(self.buf)]
+
+
+class _RollingMoments:
+    """NaN-aware rolling count/sum/sum-of-squares over the last `window` rows.
+
+    Matches pandas `rolling(window, min_periods=...)` statistics, which skip
+    missing values inside the window.
+    """
+
+    def __init__(self, window: int, n_assets: int):
+        self.ring = _RingBuffer(window, n_assets)
+        self.n = np.zeros(n_assets)
+        self.s1 = np.zeros(n_assets)
+        self.s2 = np.zeros(n_assets)
+
+    def push(self, row: np.ndarray) -> None:
+        old = self.ring.push(row)
+        out = np.isfinite(old)
+        self.n -= out
+        self.s1 -= np.where(out, old, 0.0)
+        self.s2 -= np.where(out, old * old, 0.0)
+        inc = np.isfinite(row)
+        self.n += inc
+        self.s1 += np.where(inc, row, 0.0)
+        self.s2 += np.where(inc, row * row, 0.0)
+
+    def mean(self) -> np.ndarray:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.n >= 1, self.s1 / self.n, np.nan)
+
+    def std(self) -> np.ndarray:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            var = (self.s2 - self.s1 * self.s1 / self.n) / (self.n - 1)
+        return np.where(self.n >= 2, np.sqrt(np.clip(var, 0.0, None)), np.nan)
+
+
+@dataclass
+class StreamingFactorEngine:
+    config: FactorConfig = field(default_factory=lambda: FactorConfig(weights={'momentum':0.6,'low_vol':0.4}))
+    initial_capital: float = 1_000_000
+    universe: Optional[List[str]] = None
+    min_history: int = 30
+    """Incremental counterpart of `FactorPortfolioEngine` for the default factors.
+
+    Feed one bar (a price Series indexed by symbol) at a time with `update`.
+    The engine keeps only the rolling state each factor in `DEFAULT_FACTORS`
+    needs (ring buffers and running sums), so a bar costs O(universe)
+    regardless of how much history has been ingested. The book is marked to
+    market on every bar; when a bar opens a new rebalance period the portfolio
+    is rebalanced at the close of the previous bar, i.e. the last trading day
+    of the period that just ended.
+
+    The universe is fixed by the first bar (or `universe`); later bars are
+    reindexed to it and unknown symbols are ignored. Unlike the batch engine,
+    the still-open final period is not rebalanced until its successor starts.
+    """
+
+    def __post_init__(self) -> None:
+        unsupported = set(self.config.weights) - set(STREAMING_FACTORS)
+        if unsupported:
+            raise ValueError(f"no streaming state for factors: {sorted(unsupported)}")
+        self.capital = float(self.initial_capital)
+        self.positions: Dict[str, float] = {}
+        self.trade_log = TradeLedger()
+        self._dates: List[pd.Timestamp] = []
+        self._equity: List[float] = []
+        self._rows = 0
+        self._last_date: Optional[pd.Timestamp] = None
+        self._last_period: Optional[pd.Period] = None
+        self._last_px: Optional[np.ndarray] = None
+        if self.universe is not None:
+            self._init_state(list(self.universe))
+
+    def _init_state(self, universe: List[str]) -> None:
+        n = len(universe)
+        self.universe = universe
+        self._columns = pd.Index(universe)
+        self._held_idx = np.array([], dtype=int)
+        self._held_shares = np.array([], dtype=float)
+        self._first_px = np.full(n, np.nan)
+        self._mom_window = _RingBuffer(MOMENTUM_LOOKBACK + 1, n)
+        self._last_valid = np.full(n, np.nan)
+        self._vol = {
+            'low_vol': _RollingMoments(LOW_VOL_LOOKBACK, n),
+            'quality': _RollingMoments(QUALITY_LOOKBACK, n),
+        }
+        self._size = _RollingMoments(SIZE_LOOKBACK, n)
+
+    def update(self, bar: pd.Series, date=None) -> float:
+        """Ingest one bar of prices and return the marked equity.
+
+        `date` defaults to `bar.name`. Bars must arrive in increasing date order.
+        """
+        date = pd.Timestamp(bar.name if date is None else date)
+        if self._last_date is not None and date <= self._last_date:
+            raise ValueError(f"bar dated {date} is not after {self._last_date}")
+        if self.universe is None:
+            self._init_state(list(bar.index))
+        px = bar.reindex(self._columns).to_numpy(dtype=float)
+        period = date.to_period(self._period_freq())
+        if self._last_period is not None and period != self._last_period and self._rows >= self.min_history:
+            self._rebalance()
+        self._ingest(px)
+        self._last_date, self._last_period, self._last_px = date, period, px
+        if self.positions:
+            self._mark(date, px)
+        return self.capital
+
+    def warm_up(self, prices: pd.DataFrame) -> 'StreamingFactorEngine':
+        """Feed a history of bars in date order; returns the engine for chaining."""
+        for date, row in prices.sort_index().iterrows():
+            self.update(row, date)
+        return self
+
+    def factor_scores(self) -> Dict[str, pd.Series]:
+        """Cross-sectional scores of the configured factors as of the latest bar."""
+        scores: Dict[str, pd.Series] = {}
+        for name in STREAMING_FACTORS:
+            if name in self.config.weights:
+                scores[name] = pd.Series(self._score(name), index=self._columns)
+        return scores
+
+    @property
+    def equity(self) -> pd.DataFrame:
+        """Equity curve with returns and drawdown, shaped like `FactorPortfolioEngine.run`."""
+        equity_df = pd.DataFrame({'equity': np.asarray(self._equity, dtype=float)},
+                                 index=pd.DatetimeIndex(self._dates, name='date'))
+        if not equity_df.empty:
+            equity_df['returns'] = equity_df['equity'].pct_change().fillna(0)
+            equity_df['drawdown'] = equity_df['equity'] / equity_df['equity'].cummax() - 1
+        return equity_df
+
+    @property
+    def trades(self) -> pd.DataFrame:
+        return self.trade_log.to_frame()
+
+    def performance(self) -> Dict[str, float]:
+        equity_df = self.equity
+        if equity_df.empty:
+            return summarize_performance(pd.Series(dtype=float), pd.Series(dtype=float), self.trade_log)
+        return summarize_performance(equity_df['equity'], equity_df['returns'], self.trade_log)
+
+    def _ingest(self, px: np.ndarray) -> None:
+        if self._rows == 0:
+            self._first_px = px.copy()
+        self._mom_window.push(px)
+        # pct_change semantics: returns against the last valid (forward-filled) price
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rets = np.where(np.isfinite(px), px, self._last_valid) / self._last_valid - 1
+        self._last_valid = np.where(np.isfinite(px), px, self._last_valid)
+        # the per-date volatility factors skip the first available return
+        if self._rows >= 2:
+            for moments in self._vol.values():
+                moments.push(rets)
+        self._size.push(px)
+        self._rows += 1
+
+    def _score(self, name: str) -> np.ndarray:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if name == 'momentum':
+                if self._rows < MOMENTUM_LOOKBACK + 1:
+                    base = self._first_px
+                else:
+                    base = self._mom_window.ago(MOMENTUM_LOOKBACK)
+                out = self._mom_window.ago(0) / base - 1
+            elif name in self._vol:
+                out = -self._vol[name].std()
+            elif name == 'size':
+                out = -self._size.mean()
+            else:
+                last = self._last_px
+                out = 1 / np.where(last == 0, np.nan, last)
+        return np.where(np.isinf(out), np.nan, out)
+
+    def _rebalance(self) -> None:
+        composite = composite_rank(self.factor_scores(), self.config.weights, top_n=self.config.top_n)
+        if composite.empty:
+            return
+        prices_d = pd.Series(self._last_px, index=self._columns)
+        target_positions = _target_positions(composite, self.config, self.capital, prices_d)
+        _rebalance_trades(self.positions, target_positions, self._last_date, prices_d, self.trade_log)
+        first = not self.positions
+        self.positions = target_positions
+        self._held_idx = self._columns.get_indexer(list(target_positions))
+        self._held_shares = np.fromiter(target_positions.values(), dtype=float, count=len(target_positions))
+        if first:
+            # the first rebalance day is marked with the new book
+            self._mark(self._last_date, self._last_px)
+
+    def _mark(self, date: pd.Timestamp, px: np.ndarray) -> None:
+        held_px = px[self._held_idx]
+        held_px[self._held_idx < 0] = np.nan  # a symbol outside the stream's columns has no price
+        self.capital = float(held_px @ self._held_shares)
+        self._dates.append(date)
+        self._equity.append(self.capital)
+
+    def _period_freq(self) -> str:
+        if self.config.rebalance_freq.upper() in ('W','W-FRI'):
+            return 'W-FRI'
+        if self.config.rebalance_freq.upper() in ('Q','QS','Q-DEC'):
+            return 'Q'
+        return 'M'
+
+__all__ = ['StreamingFactorEngine']
@@ -4,14 +4,26 @@ Public API:
  - momentum_factor(prices, lookback)
  - volatility_factor(prices, lookback)
  - zscore(df)
- - composite_rank(factor_dfs, weights)
+ - composite_rank(factor_dfs, weights, top_n=None)
+ - composite_scores / top_bottom_indices: NumPy core of composite_rank
+   (vectorized z-scores, argpartition top/bottom-N selection)
+ - FactorSpec / FactorRegistry / DEFAULT_REGISTRY: factors with declared
+   lookbacks, inputs and parameters
+ - FactorCache: bounded LRU (optionally disk-spilled) cache of factor scores
+ - FactorContext: lazily computed, memoized intermediates (returns, rolling
+   means/stds) shared by the factors of one evaluation
+ - *_factor_panel(prices, ...): date x asset panels whose row t matches the
+   per-date factor evaluated on prices.loc[:t]
 """
-from .momentum import momentum_factor
-from .volatility import volatility_factor
-from .value import value_factor
-from .quality import quality_factor
-from .size import size_factor
-from .core import zscore, composite_rank
+from .momentum import momentum_factor, momentum_factor_panel
+from .volatility import volatility_factor, volatility_factor_panel
+from .value import value_factor, value_factor_panel
+from .quality import quality_factor, quality_factor_panel
+from .size import size_factor, size_factor_panel
+from .core import zscore, composite_rank, composite_scores, top_bottom_indices
+from .registry import FactorSpec, FactorRegistry, DEFAULT_REGISTRY
+from .cache import FactorCache
+from .context import FactorContext
 
 __all__ = [
     "momentum_factor",
@@ -19,6 +31,18 @@ __all__ = [
     "value_factor",
     "quality_factor",
     "size_factor",
+    "momentum_factor_panel",
+    "volatility_factor_panel",
+    "value_factor_panel",
+    "quality_factor_panel",
+    "size_factor_panel",
     "zscore",
     "composite_rank",
+    "composite_scores",
+    "top_bottom_indices",
+    "FactorSpec",
+    "FactorRegistry",
+    "DEFAULT_REGISTRY",
+    "FactorCache",
+    "FactorContext",
 ]
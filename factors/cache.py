@@ -0,0 +1,183 @@
+from __future__ import annotations
+import hashlib
+import os
+import types
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .registry import FactorSpec
+
+_SIMPLE = (int, float, str, bool, type(None))
+
+
+def price_fingerprint(prices: pd.DataFrame) -> str:
+    """Content hash of a price panel (values, dates and column labels).
+
+    One vectorized pass over the panel; any change to a price, a date or the
+    column set yields a different fingerprint.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(pd.util.hash_pandas_object(prices, index=True).to_numpy().tobytes())
+    h.update(repr(list(prices.columns)).encode())
+    return h.hexdigest()
+
+
+class _Unkeyable(Exception):
+    """A factor parameter that `factor_key` cannot describe reliably."""
+
+
+def _value_key(value: Any) -> Hashable:
+    if isinstance(value, (str, type(None))):
+        return value
+    if isinstance(value, _SIMPLE):
+        return (type(value).__name__, value)
+    if isinstance(value, np.generic):
+        return (type(value).__name__, value.item())
+    if isinstance(value, (tuple, list, frozenset)):
+        items = sorted(value, key=repr) if isinstance(value, frozenset) else value
+        return (type(value).__name__, tuple(_value_key(v) for v in items))
+    if isinstance(value, dict):
+        return ('dict', tuple((_value_key(k), _value_key(v)) for k, v in sorted(value.items(), key=repr)))
+    if isinstance(value, types.CodeType):
+        return (value.co_code, value.co_names, tuple(_value_key(c) for c in value.co_consts))
+    if callable(value):
+        return _func_key(value)
+    raise _Unkeyable(type(value).__name__)
+
+
+def _func_key(func: Callable) -> tuple:
+    spec = func if isinstance(func, FactorSpec) else getattr(func, '__self__', None)
+    if isinstance(spec, FactorSpec):
+        form = 'date' if spec is func else getattr(func, '__name__', '')
+        return ('spec', spec.name, form, _func_key(spec.func), _value_key(sorted(spec.params.items())),
+                spec.lookback, spec.inputs)
+    if isinstance(func, partial):
+        return (_func_key(func.func), _value_key(func.args), _value_key(sorted(func.keywords.items())))
+    if isinstance(func, types.MethodType):
+        return (_func_key(func.__func__), _value_key(func.__self__))
+    name = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}"
+    code = getattr(func, '__code__', None)
+    if code is None:
+        if not isinstance(func, (type, types.BuiltinFunctionType, np.ufunc)):
+            raise _Unkeyable(name)
+        return (name,)
+    closure = tuple(c.cell_contents for c in (func.__closure__ or ()))
+    kwdefaults = sorted((func.__kwdefaults__ or {}).items())
+    return (name, _value_key(code), _value_key(func.__defaults__ or ()), _value_key(kwdefaults),
+            _value_key(closure))
+
+
+def factor_key(func: Callable) -> Optional[tuple]:
+    """Describe a factor callable and its parameters as a hashable key, or None.
+
+    `factors.registry.FactorSpec` objects (as used by `DEFAULT_FACTORS`) and
+    their bound `panel` methods are keyed by the wrapped function, bound
+    parameters and declared lookback/inputs; `functools.partial` objects by
+    the wrapped function plus its bound arguments. Plain functions and
+    lambdas are keyed by qualified name, bytecode, defaults, constants and
+    closure values, so `lambda px: f(px, 126)` and `lambda px: f(px, 63)`
+    do not collide. Parameters are keyed when they are scalars (including
+    numpy scalars), sequences or dicts of such, or functions keyed the same
+    way; for any other value (an array, a frame, a stateful callable
+    object) the key is None and the result must not be cached.
+    """
+    try:
+        return _func_key(func)
+    except (_Unkeyable, RecursionError):
+        return None
+
+
+@dataclass
+class FactorCache:
+    maxsize: int = 4096
+    spill_dir: Optional[str] = None
+    """Bounded LRU cache for factor scores with optional on-disk spill.
+
+    Keys are arbitrary hashable tuples; `FactorPortfolioEngine` uses
+    (factor name, `factor_key(func)`, as-of date, `price_fingerprint(prices)`)
+    and bypasses the cache for factors whose `factor_key` is None.
+    When `spill_dir` is set, entries evicted from memory are pickled there
+    and reloaded on a later miss, and `flush()` writes the in-memory entries
+    too so another process can reuse them. The spill directory is not
+    size-bounded.
+    """
+
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    _store: OrderedDict = field(default_factory=OrderedDict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        if self.spill_dir is not None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._store or (self.spill_dir is not None and os.path.exists(self._path(key)))
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        if key in self._store:
+            self._store.move_to_end(key)
+            self.hits += 1
+            return self._store[key]
+        if self.spill_dir is not None:
+            path = self._path(key)
+            if os.path.exists(path):
+                value = pd.read_pickle(path)
+                self.hits += 1
+                self._insert(key, value)
+                return value
+        self.misses += 1
+        return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._insert(key, value)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for `key`, computing and storing it on a miss."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self._insert(key, value)
+        return value
+
+    def flush(self) -> None:
+        """Write every in-memory entry to `spill_dir` (no-op without one)."""
+        if self.spill_dir is None:
+            return
+        for key, value in self._store.items():
+            self._spill(key, value)
+
+    def clear(self) -> None:
+        """Drop the in-memory entries and reset hit/miss counters."""
+        self._store.clear()
+        self.hits = self.misses = 0
+
+    def _insert(self, key: Hashable, value: Any) -> None:
+        self._store[key] = value
+        self._store.move_to_end(key)
+        while len(self._store) > self.maxsize:
+            old_key, old_value = self._store.popitem(last=False)
+            self._spill(old_key, old_value)
+
+    def _spill(self, key: Hashable, value: Any) -> None:
+        if self.spill_dir is None:
+            return
+        path = self._path(key)
+        if not os.path.exists(path):
+            pd.to_pickle(value, path)
+
+    def _path(self, key: Hashable) -> str:
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.spill_dir, f"{digest}.pkl")
+
+__all__ = ['FactorCache', 'factor_key', 'price_fingerprint']
@@ -0,0 +1,97 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class FactorContext:
+    """Lazy, memoized graph of intermediates shared by factors over one panel.
+
+    Wraps a close-price panel and computes derived nodes on first use only:
+    simple and log returns, and rolling means/stds at any window. Rolling
+    statistics use pandas' windowed aggregations, which update each window
+    incrementally without the cancellation of whole-history cumulative
+    sums on long or high-priced panels. Every node is memoized for the lifetime of the
+    context (one engine evaluation), so factors asking for the same
+    intermediate share a single computation.
+
+    Factor functions in `factors/` accept either a price DataFrame or a
+    `FactorContext`; `FactorContext.of` normalizes both.
+    """
+
+    def __init__(self, prices: pd.DataFrame):
+        self.close = prices
+        self._memo: Dict[Hashable, Any] = {}
+
+    @classmethod
+    def of(cls, data: 'pd.DataFrame | FactorContext') -> 'FactorContext':
+        return data if isinstance(data, FactorContext) else cls(data)
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def node(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the memoized intermediate `key`, computing it on first use."""
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    def returns(self) -> pd.DataFrame:
+        """Simple returns over forward-filled closes (`pct_change`'s former default fill)."""
+        return self.node(('returns',), lambda: self.close.ffill().pct_change(fill_method=None))
+
+    def log_returns(self) -> pd.DataFrame:
+        """Log returns derived from the simple returns node."""
+        return self.node(('log_returns',), lambda: np.log1p(self.returns()))
+
+    def rolling_mean(self, window: int, source: str = 'close', min_periods: int = 1, skip: int = 0) -> pd.DataFrame:
+        """NaN-skipping rolling mean of `source` ('close', 'returns' or 'log_returns').
+
+        Rows before position `skip` are treated as missing.
+        """
+        def compute() -> pd.DataFrame:
+            values, poisoned = self._windows(source, skip, window)
+            mean = values.rolling(window, min_periods=min(max(min_periods, 1), window)).mean()
+            return mean.mask(poisoned)
+        return self.node(('rolling_mean', source, window, min_periods, skip), compute)
+
+    def rolling_std(self, window: int, source: str = 'returns', min_periods: int = 2, skip: int = 0) -> pd.DataFrame:
+        """NaN-skipping rolling sample stdev (ddof=1) of `source`.
+
+        Rows before position `skip` are treated as missing, so early rows
+        see an expanding window over rows `skip..t`.
+        """
+        def compute() -> pd.DataFrame:
+            values, poisoned = self._windows(source, skip, window)
+            std = values.rolling(window, min_periods=min(max(min_periods, 2), window)).std()
+            return std.mask(poisoned)
+        return self.node(('rolling_std', source, window, min_periods, skip), compute)
+
+    def _source(self, source: str) -> pd.DataFrame:
+        if source == 'close':
+            return self.close
+        if source == 'returns':
+            return self.returns()
+        if source == 'log_returns':
+            return self.log_returns()
+        raise ValueError(f"unknown source {source!r}")
+
+    def _finite(self, source: str, skip: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """`source` with rows before `skip` and infinities set to NaN, and a 0/1 frame marking the infinities."""
+        def compute():
+            values = self._source(source).astype(float)
+            values.iloc[:skip] = np.nan
+            inf = np.isinf(values)
+            return values.mask(inf), inf.astype(float)
+        return self.node(('finite', source, skip), compute)
+
+    def _windows(self, source: str, skip: int, window: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Finite values of `source` and a mask of the `window`-row windows holding an infinity."""
+        def compute():
+            values, inf = self._finite(source, skip)
+            # like pandas, an infinite value poisons every window containing it
+            return values, inf.rolling(window, min_periods=1).sum() > 0
+        return self.node(('windows', source, skip, window), compute)
+
+__all__ = ['FactorContext']
@@ -1,5 +1,7 @@
+import warnings
 import pandas as pd
-from typing import Dict, List
+import numpy as np
+from typing import Dict, List, Optional, Tuple
 
 from utils import zscore as _zscore
 
@@ -12,14 +14,86 @@ def zscore(series: pd.Series) -> pd.Series:
     """
     return _zscore(series, window=None)
 
-def composite_rank(factors: Dict[str, pd.Series], weights: Dict[str, float]) -> pd.Series:
+def composite_rank(factors: Dict[str, pd.Series], weights: Dict[str, float],
+                   top_n: Optional[int] = None) -> pd.Series:
     """Combine multiple factor score Series via weighted z-scored sum.
     Missing values are ignored per factor.
+
+    Returns the composite sorted descending (ties keep input order). With
+    `top_n`, only the `top_n` highest and lowest names are selected (by
+    `argpartition`, without sorting the whole cross-section) and returned in
+    that same order, so `head(top_n)` and `tail(top_n)` match the full ranking.
     """
-    aligned = pd.DataFrame({k: v for k,v in factors.items()})
-    zed = aligned.apply(lambda col: _zscore(col, window=None))
-    w = pd.Series(weights)
+    if not factors:
+        return pd.Series(dtype=float)
+    names = list(factors)
+    series = list(factors.values())
+    index = series[0].index
+    if all(s.index.equals(index) for s in series[1:]):
+        values = np.column_stack([s.to_numpy(dtype=float) for s in series])
+    else:
+        aligned = pd.DataFrame(factors)
+        index, values = aligned.index, aligned.to_numpy(dtype=float)
+    w = pd.Series(weights, dtype=float)
     w = w / w.sum()
-    composite = (zed * w).sum(axis=1)
-    return composite.sort_values(ascending=False)
+    composite = composite_scores(values, w.reindex(names).fillna(0.0).to_numpy())
+    if top_n is None:
+        order = np.lexsort((np.arange(len(composite)), -composite))
+    else:
+        top, bottom = top_bottom_indices(composite, top_n)
+        order = np.concatenate([top, bottom[~np.isin(bottom, top)]])
+    return pd.Series(composite[order], index=index[order])
+
+
+def composite_scores(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weighted sum of column z-scores for an (assets x factors) array.
+
+    NumPy core of `composite_rank`: all columns are z-scored in one call and
+    NaN z-scores are skipped in the sum (an all-NaN row scores 0).
+    """
+    zed = _zscore_columns(np.asarray(values, dtype=float))
+    with np.errstate(invalid='ignore'):
+        return np.nansum(zed * np.asarray(weights, dtype=float), axis=1)
+
 
+def top_bottom_indices(composite: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Positions of the `n` highest and `n` lowest entries of `composite`.
+
+    Both are ordered like the full descending ranking (ties in input order),
+    i.e. the first and last `n` positions of a stable descending sort, in
+    O(len + n log n) via `argpartition`. The two sets overlap when
+    `2 * n > len(composite)`.
+    """
+    composite = np.asarray(composite, dtype=float)
+    m = len(composite)
+    n = min(max(int(n), 0), m)
+    if n == 0:
+        empty = np.array([], dtype=np.intp)
+        return empty, empty
+    if n == m:
+        top = bottom = np.arange(m)
+    else:
+        kth = composite[np.argpartition(composite, m - n)[m - n]]
+        above = np.flatnonzero(composite > kth)
+        top = np.concatenate([above, np.flatnonzero(composite == kth)[:n - len(above)]])
+        kth = composite[np.argpartition(composite, n - 1)[n - 1]]
+        below = np.flatnonzero(composite < kth)
+        ties = np.flatnonzero(composite == kth)
+        bottom = np.concatenate([ties[len(ties) - (n - len(below)):], below])
+    return (top[np.lexsort((top, -composite[top]))],
+            bottom[np.lexsort((bottom, -composite[bottom]))])
+
+
+def _zscore_columns(values: np.ndarray) -> np.ndarray:
+    """Column-wise global z-score of a 2D array, matching `zscore` per column.
+
+    NaNs are skipped in the moments and stay NaN; columns with zero spread
+    map to all zeros.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mu = np.nanmean(values, axis=0)
+        sigma = np.nanstd(values, axis=0)
+        out = (values - mu) / sigma
+    out[:, np.isclose(sigma, 0)] = 0.0
+    return out
@@ -1,11 +1,27 @@
 import pandas as pd
 import numpy as np
 
+from .context import FactorContext
+
 def momentum_factor(prices: pd.DataFrame, lookback: int = 252) -> pd.Series:
     """Compute simple price momentum: return over lookback window.
     Returns a cross-sectional Series for the last available date.
     """
+    prices = FactorContext.of(prices).close
     if prices.shape[0] < lookback + 1:
         lookback = prices.shape[0] - 1
     returns = prices.iloc[-1] / prices.iloc[-lookback-1] - 1
     return returns.replace([np.inf, -np.inf], np.nan)
+
+
+def momentum_factor_panel(prices: pd.DataFrame, lookback: int = 252) -> pd.DataFrame:
+    """Whole-panel counterpart of `momentum_factor`.
+
+    Row t equals `momentum_factor(prices.loc[:t], lookback)`, including the
+    shortened lookback used while fewer than `lookback + 1` rows are available.
+    """
+    prices = FactorContext.of(prices).close
+    returns = prices / prices.shift(lookback) - 1
+    warmup = min(lookback, len(prices))
+    returns.iloc[:warmup] = prices.iloc[:warmup] / prices.iloc[0] - 1
+    return returns.replace([np.inf, -np.inf], np.nan)
@@ -1,17 +1,27 @@
 import pandas as pd
 import numpy as np
 
+from .context import FactorContext
+from .volatility import volatility_factor_panel
+
 # Placeholder quality factor: stability of returns (lower volatility => higher quality)
 # Implemented as negative rolling std of returns across last 63 trading days (~quarter)
 def quality_factor(prices: pd.DataFrame, lookback: int = 63) -> pd.Series:
     """Quality factor proxy: negative realized volatility over `lookback` days.
 
     Lower volatility yields a higher quality score (we return negative vol).
+    `prices` may also be a `FactorContext`.
     """
-    if prices.shape[0] < lookback + 2:
-        lookback = prices.shape[0] - 2
-    rets = prices.pct_change().iloc[-lookback:]
+    ctx = FactorContext.of(prices)
+    if len(ctx) < lookback + 2:
+        lookback = len(ctx) - 2
+    rets = ctx.returns().iloc[-lookback:]
     vol = rets.std()
     return (-vol).replace([np.inf, -np.inf], np.nan)
 
-__all__ = ['quality_factor']
+
+def quality_factor_panel(prices: pd.DataFrame, lookback: int = 63) -> pd.DataFrame:
+    """Whole-panel counterpart of `quality_factor` (row t matches the per-date call)."""
+    return volatility_factor_panel(prices, lookback=lookback)
+
+__all__ = ['quality_factor', 'quality_factor_panel']
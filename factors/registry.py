@@ -0,0 +1,140 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .momentum import momentum_factor, momentum_factor_panel
+from .volatility import volatility_factor, volatility_factor_panel
+from .value import value_factor, value_factor_panel
+from .quality import quality_factor, quality_factor_panel
+from .size import size_factor, size_factor_panel
+
+FACTOR_INPUTS = ('close', 'returns', 'ohlc', 'context')
+
+
+@dataclass(frozen=True)
+class FactorSpec:
+    name: str
+    func: Callable[..., pd.Series]
+    lookback: int
+    inputs: Tuple[str, ...] = ('close',)
+    params: Dict[str, Any] = field(default_factory=dict)
+    panel_func: Optional[Callable[..., pd.DataFrame]] = None
+    """Declarative description of a cross-sectional factor.
+
+    Attributes
+    - name: registry key (also the weight name in `FactorConfig.weights`).
+    - func: per-date factor `func(data, **params) -> Series`.
+    - lookback: number of trailing rows (including the as-of row) the factor
+      reads; evaluating it on that tail gives the same scores as on the full
+      history. A forward fill (as in `pct_change`) can reach further back
+      over a gap, so `tail` with `fill_starts` extends the tail to cover it.
+    - inputs: data the factor consumes, from `FACTOR_INPUTS` ('close' prices,
+      simple 'returns' of close, an 'ohlc' field mapping, or a shared
+      `factors.context.FactorContext` over close prices whose memoized
+      returns and rolling statistics other factors reuse).
+    - params: keyword arguments bound to `func` and `panel_func`.
+    - panel_func: optional whole-panel counterpart whose row t matches `func`
+      on the history up to t.
+
+    Specs are callable like the plain factor functions they wrap.
+    """
+
+    def __post_init__(self) -> None:
+        if self.lookback < 1:
+            raise ValueError(f"factor {self.name!r}: lookback must be >= 1")
+        unknown = set(self.inputs) - set(FACTOR_INPUTS)
+        if unknown:
+            raise ValueError(f"factor {self.name!r}: unknown inputs {sorted(unknown)}")
+
+    def __call__(self, data: Any) -> pd.Series:
+        return self.func(data, **self.params)
+
+    def panel(self, data: Any) -> pd.DataFrame:
+        if self.panel_func is None:
+            raise ValueError(f"factor {self.name!r} has no panel form")
+        return self.panel_func(data, **self.params)
+
+    def tail(self, data: pd.DataFrame, pos: int, starts: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Zero-copy view of the `lookback` rows ending at row `pos`.
+
+        With `starts` (from `fill_starts(data)`) the view begins early enough
+        that every column's last value before a leading gap is included.
+        """
+        start = max(0, pos + 1 - self.lookback)
+        if starts is not None:
+            start = int(starts[start])
+        return data.iloc[start:pos + 1]
+
+
+def fill_starts(data: pd.DataFrame) -> np.ndarray:
+    """For each row r, the first row a tail beginning at r must include for forward fills to match.
+
+    That is r itself, or earlier when some column is missing at r: the row
+    of that column's last value before r. Columns with no value up to r do
+    not extend the tail (there is nothing to fill from).
+    """
+    n = len(data)
+    rows = np.arange(n)
+    last = np.maximum.accumulate(np.where(data.notna().to_numpy(), rows[:, None], -1), axis=0)
+    if not last.size:
+        return rows
+    return np.minimum(rows, np.where(last >= 0, last, n).min(axis=1))
+
+
+class FactorRegistry:
+    """Ordered collection of `FactorSpec` keyed by name."""
+
+    def __init__(self, specs: Iterable[FactorSpec] = ()):
+        self._specs: Dict[str, FactorSpec] = {}
+        for spec in specs:
+            self.register(spec)
+
+    def register(self, spec: FactorSpec) -> FactorSpec:
+        """Add (or replace) a factor; returns the spec for chaining."""
+        self._specs[spec.name] = spec
+        return spec
+
+    def __getitem__(self, name: str) -> FactorSpec:
+        return self._specs[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._specs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._specs)
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def max_lookback(self, names: Optional[Iterable[str]] = None) -> int:
+        """Largest declared lookback among `names` (all factors by default)."""
+        names = list(self._specs) if names is None else [n for n in names if n in self._specs]
+        return max((self._specs[n].lookback for n in names), default=0)
+
+    def factor_funcs(self) -> Dict[str, FactorSpec]:
+        """Name -> callable spec mapping, usable as `FactorPortfolioEngine.factor_funcs`."""
+        return dict(self._specs)
+
+    def panel_funcs(self) -> Dict[str, Callable[[pd.DataFrame], pd.DataFrame]]:
+        """Name -> whole-panel callable for specs that define `panel_func`."""
+        return {name: spec.panel for name, spec in self._specs.items() if spec.panel_func is not None}
+
+
+# The default factor set used by the engines. Lookbacks are the rows each
+# per-date function reads: momentum needs lookback + 1 prices, the volatility
+# proxies lookback + 2 (pct_change drops a row and shorter windows switch to
+# a warm-up branch), size its 63-row mean and value only the last row. The
+# volatility proxies and size read a shared FactorContext so one evaluation
+# computes returns and rolling moments once for all of them.
+DEFAULT_REGISTRY = FactorRegistry([
+    FactorSpec('momentum', momentum_factor, lookback=127, params={'lookback': 126}, panel_func=momentum_factor_panel),
+    FactorSpec('low_vol', volatility_factor, lookback=128, inputs=('context',), params={'lookback': 126}, panel_func=volatility_factor_panel),
+    FactorSpec('value', value_factor, lookback=1, panel_func=value_factor_panel),
+    FactorSpec('quality', quality_factor, lookback=65, inputs=('context',), params={'lookback': 63}, panel_func=quality_factor_panel),
+    FactorSpec('size', size_factor, lookback=63, inputs=('context',), panel_func=size_factor_panel),
+])
+
+__all__ = ['FactorSpec', 'FactorRegistry', 'DEFAULT_REGISTRY', 'FACTOR_INPUTS', 'fill_starts']
@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+from .context import FactorContext
+
 # Placeholder size factor: assume column names include market cap ordering or proxy by average dollar price *not implemented*
 # For demo we use average price (lower price treated as smaller size => size factor returns negative avg price so large negative = large cap)
 
@@ -9,9 +11,17 @@ def size_factor(prices: pd.DataFrame) -> pd.Series:
 
     This is a placeholder: lower average price is treated as smaller size and
     therefore receives a higher factor (more negative value -> higher rank).
+    `prices` may also be a `FactorContext`.
     """
+    prices = FactorContext.of(prices).close
     avg_price = prices.tail(63).mean() if prices.shape[0] >= 63 else prices.mean()
     # Return negative so that smaller average price => higher factor (treating small-cap preference)
     return (-avg_price).replace([np.inf, -np.inf], np.nan)
 
-__all__ = ['size_factor']
+
+def size_factor_panel(prices: pd.DataFrame) -> pd.DataFrame:
+    """Whole-panel counterpart of `size_factor`: trailing 63-row mean per date."""
+    avg_price = FactorContext.of(prices).rolling_mean(63, source='close', min_periods=1)
+    return (-avg_price).replace([np.inf, -np.inf], np.nan)
+
+__all__ = ['size_factor', 'size_factor_panel']
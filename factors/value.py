@@ -1,15 +1,26 @@
 import pandas as pd
 import numpy as np
 
+from .context import FactorContext
+
 # Placeholder value factor: inverse of price (proxy for cheapness when fundamentals absent)
 def value_factor(prices: pd.DataFrame) -> pd.Series:
     """Value factor proxy: inverse of last price as a cheapness measure.
 
     This is a placeholder where lower-priced assets receive higher scores.
     """
+    prices = FactorContext.of(prices).close
     last = prices.iloc[-1]
     with np.errstate(divide='ignore'):
         val = 1 / last.replace(0, np.nan)
     return val.replace([np.inf, -np.inf], np.nan)
 
-__all__ = ['value_factor']
+
+def value_factor_panel(prices: pd.DataFrame) -> pd.DataFrame:
+    """Whole-panel counterpart of `value_factor`: inverse price on every date."""
+    prices = FactorContext.of(prices).close
+    with np.errstate(divide='ignore'):
+        val = 1 / prices.replace(0, np.nan)
+    return val.replace([np.inf, -np.inf], np.nan)
+
+__all__ = ['value_factor', 'value_factor_panel']
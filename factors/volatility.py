@@ -1,12 +1,29 @@
 import pandas as pd
 import numpy as np
 
+from .context import FactorContext
+
 def volatility_factor(prices: pd.DataFrame, lookback: int = 252) -> pd.Series:
     """Compute (negative) realized volatility over lookback (higher vol => lower score).
     We return -stdev of daily returns so that higher is better (low vol preference).
+    `prices` may also be a `FactorContext`, whose returns are shared with other factors.
     """
-    if prices.shape[0] < lookback + 2:
-        lookback = prices.shape[0] - 2
-    rets = prices.pct_change().iloc[-lookback:]
+    ctx = FactorContext.of(prices)
+    if len(ctx) < lookback + 2:
+        lookback = len(ctx) - 2
+    rets = ctx.returns().iloc[-lookback:]
     vol = rets.std()
     return (-vol).replace([np.inf, -np.inf], np.nan)
+
+
+def volatility_factor_panel(prices: pd.DataFrame, lookback: int = 252) -> pd.DataFrame:
+    """Whole-panel counterpart of `volatility_factor`.
+
+    Row t equals `volatility_factor(prices.loc[:t], lookback)`: a rolling
+    `lookback`-day stdev once enough history exists, and before that the
+    expanding stdev the per-date function falls back to. Both are one window
+    over returns from row 2 on (the per-date function never sees the first
+    return), read from the shared moments of a `FactorContext`.
+    """
+    vol = FactorContext.of(prices).rolling_std(lookback, source='returns', min_periods=2, skip=2)
+    return (-vol).replace([np.inf, -np.inf], np.nan)
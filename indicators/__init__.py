@@ -3,8 +3,16 @@
 Public exports:
  - bollinger_bands
  - stochastic_oscillator
+ - bollinger_bands_panel / stochastic_oscillator_panel: batched versions over
+   wide date x ticker panels, returning (field, ticker) MultiIndex columns
+ - OnlineBollinger / OnlineStochastic: stateful per-bar versions for live data
+ - rolling_max / rolling_min: O(n) rolling extreme kernels for 1D/2D arrays
 """
 
 from .indicator import bollinger_bands, stochastic_oscillator  # noqa: F401
+from .indicator import bollinger_bands_panel, stochastic_oscillator_panel  # noqa: F401
+from .kernels import rolling_max, rolling_min  # noqa: F401
+from .online import OnlineBollinger, OnlineStochastic  # noqa: F401
 
-__all__ = ["bollinger_bands", "stochastic_oscillator"]
+__all__ = ["bollinger_bands", "stochastic_oscillator", "bollinger_bands_panel",
+           "stochastic_oscillator_panel", "rolling_max", "rolling_min", "OnlineBollinger", "OnlineStochastic"]
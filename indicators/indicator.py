@@ -1,5 +1,7 @@
 import pandas as pd
 
+from .kernels import rolling_max, rolling_min
+
 def bollinger_bands(close: pd.Series, window: int = 20, num_std: float = 2.0) -> pd.DataFrame:
     """Compute Bollinger Bands (SMA +/- num_std * STD).
 
@@ -33,4 +35,38 @@ def stochastic_oscillator(df: pd.DataFrame, k_period: int = 14, d_period: int =
     d = k.rolling(d_period).mean()
     return pd.DataFrame({"k": k, "d": d})
 
-__all__ = ["bollinger_bands", "stochastic_oscillator"]
+
+def bollinger_bands_panel(close: pd.DataFrame, window: int = 20, num_std: float = 2.0) -> pd.DataFrame:
+    """Bollinger Bands for every column of a wide date x ticker close panel.
+
+    One vectorized rolling pass over the whole panel instead of a
+    `bollinger_bands` call per ticker. Returns a DataFrame with
+    (field, ticker) MultiIndex columns, fields 'sma', 'upper', 'lower';
+    `out['sma']` is again a date x ticker frame, and each ticker matches
+    `bollinger_bands(close[ticker], window, num_std)`.
+    """
+    sma = close.rolling(window).mean()
+    std = close.rolling(window).std(ddof=0)
+    return pd.concat({"sma": sma, "upper": sma + num_std * std, "lower": sma - num_std * std}, axis=1)
+
+
+def stochastic_oscillator_panel(data, k_period: int = 14, d_period: int = 3) -> pd.DataFrame:
+    """Stochastic %K and %D for many tickers at once.
+
+    `data` maps 'High', 'Low' and 'Close' to date x ticker frames: a dict of
+    frames or a DataFrame with (field, ticker) MultiIndex columns, as returned
+    by a multi-ticker `yfinance.download`. Rolling extremes use the O(n)
+    kernels in `indicators.kernels` across all tickers. Returns
+    (field, ticker) columns with fields 'k' and 'd'; each ticker matches
+    `stochastic_oscillator` on its own High/Low/Close frame.
+    """
+    close = data['Close']
+    high = data['High'].reindex(index=close.index, columns=close.columns)
+    low = data['Low'].reindex(index=close.index, columns=close.columns)
+    n_high = rolling_max(high.to_numpy(dtype=float), k_period)
+    n_low = rolling_min(low.to_numpy(dtype=float), k_period)
+    k = (close - n_low) / (n_high - n_low)
+    d = k.rolling(d_period).mean()
+    return pd.concat({'k': k.fillna(0), 'd': d.fillna(0)}, axis=1)
+
+__all__ = ["bollinger_bands", "stochastic_oscillator", "bollinger_bands_panel", "stochastic_oscillator_panel"]
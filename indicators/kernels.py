@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+def _rolling_extreme(values: np.ndarray, window: int, op: np.ufunc, fill: float) -> np.ndarray:
+    """van Herk/Gil-Werman running extreme along axis 0.
+
+    The rows are cut into blocks of `window`; a window ending at row t spans
+    the suffix of one block and the prefix of the next, so its extreme is
+    `op(suffix[t - window + 1], prefix[t])`. That is O(n) with ~3 comparisons
+    per element regardless of `window`, and vectorized across columns.
+    """
+    if window < 1:
+        raise ValueError("window must be >= 1")
+    x = np.asarray(values, dtype=float)
+    squeeze = x.ndim == 1
+    if squeeze:
+        x = x[:, None]
+    n, m = x.shape
+    out = np.full((n, m), np.nan)
+    if n < window:
+        return out[:, 0] if squeeze else out
+    blocks = -(-n // window)
+    padded = np.full((blocks * window, m), fill)
+    padded[:n] = x
+    padded = padded.reshape(blocks, window, m)
+    prefix = op.accumulate(padded, axis=1).reshape(-1, m)
+    suffix = op.accumulate(padded[:, ::-1], axis=1)[:, ::-1].reshape(-1, m)
+    out[window - 1:] = op(suffix[:n - window + 1], prefix[window - 1:n])
+    return out[:, 0] if squeeze else out
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling max over the last `window` rows of a 1D or 2D array.
+
+    Matches `DataFrame.rolling(window).max()`: the first `window - 1` rows
+    and any window containing a NaN are NaN.
+    """
+    return _rolling_extreme(values, window, np.maximum, -np.inf)
+
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling min counterpart of `rolling_max`."""
+    return _rolling_extreme(values, window, np.minimum, np.inf)
+
+__all__ = ['rolling_max', 'rolling_min']
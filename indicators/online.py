@@ -0,0 +1,156 @@
+from __future__ import annotations
+import math
+from collections import deque
+from typing import Deque, Tuple
+
+import pandas as pd
+
+
+class OnlineBollinger:
+    """Streaming `bollinger_bands`: O(1) `update(price)` per bar.
+
+    Keeps the last `window` prices in a ring buffer and their mean/M2 with
+    Welford's add/remove updates. Outputs follow the batch function: NaN
+    until `window` prices are seen and while any price in the window is NaN;
+    afterwards they equal `bollinger_bands(history)` up to float rounding.
+    """
+
+    def __init__(self, window: int = 20, num_std: float = 2.0):
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.window = window
+        self.num_std = num_std
+        self._buf = [math.nan] * window
+        self._count = 0
+        self._n = 0  # valid (non-NaN) prices in the window
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.sma = self.upper = self.lower = math.nan
+
+    def update(self, price: float) -> Tuple[float, float, float]:
+        """Add one close and return (sma, upper, lower)."""
+        price = float(price)
+        slot = self._count % self.window
+        if self._count >= self.window:
+            self._remove(self._buf[slot])
+        self._buf[slot] = price
+        self._count += 1
+        if not math.isnan(price):
+            self._n += 1
+            delta = price - self._mean
+            self._mean += delta / self._n
+            self._m2 += delta * (price - self._mean)
+        if self._n == self.window:
+            std = math.sqrt(max(self._m2, 0.0) / self._n)
+            self.sma = self._mean
+            self.upper = self._mean + self.num_std * std
+            self.lower = self._mean - self.num_std * std
+        else:
+            self.sma = self.upper = self.lower = math.nan
+        return self.sma, self.upper, self.lower
+
+    def warm_up(self, close: pd.Series) -> 'OnlineBollinger':
+        """Seed the state from a price history; only its last `window` rows are read."""
+        for price in close.iloc[-self.window:].to_numpy(dtype=float):
+            self.update(price)
+        return self
+
+    def _remove(self, price: float) -> None:
+        if math.isnan(price):
+            return
+        self._n -= 1
+        if self._n == 0:
+            self._mean = self._m2 = 0.0
+            return
+        delta = price - self._mean
+        self._mean -= delta / self._n
+        self._m2 -= delta * (price - self._mean)
+
+
+class _MonotonicWindow:
+    """Rolling max (or min) over the last `window` pushes via a monotonic deque.
+
+    Each value enters and leaves the deque once, so a push is amortized O(1).
+    Like pandas' `rolling(window).max()`, the result is NaN until the window
+    is full and while it holds a NaN.
+    """
+
+    def __init__(self, window: int, largest: bool = True):
+        self.window = window
+        self.largest = largest
+        self._deque: Deque[Tuple[int, float]] = deque()
+        self._count = 0
+        self._last_nan = -1
+
+    def push(self, value: float) -> float:
+        i = self._count
+        self._count += 1
+        if math.isnan(value):
+            self._last_nan = i
+        else:
+            dq = self._deque
+            if self.largest:
+                while dq and dq[-1][1] <= value:
+                    dq.pop()
+            else:
+                while dq and dq[-1][1] >= value:
+                    dq.pop()
+            dq.append((i, value))
+        while self._deque and self._deque[0][0] <= i - self.window:
+            self._deque.popleft()
+        if self._count < self.window or self._last_nan > i - self.window:
+            return math.nan
+        return self._deque[0][1]
+
+
+class OnlineStochastic:
+    """Streaming `stochastic_oscillator`: amortized O(1) `update(high, low, close)`.
+
+    Rolling high/low come from monotonic deques and %D from a running window
+    of the last `d_period` raw %K values. Like the batch function, NaN %K/%D
+    are reported as 0; values otherwise equal `stochastic_oscillator(history)`
+    up to float rounding.
+    """
+
+    def __init__(self, k_period: int = 14, d_period: int = 3):
+        if k_period < 1 or d_period < 1:
+            raise ValueError("k_period and d_period must be >= 1")
+        self.k_period = k_period
+        self.d_period = d_period
+        self._high = _MonotonicWindow(k_period, largest=True)
+        self._low = _MonotonicWindow(k_period, largest=False)
+        self._k: Deque[float] = deque(maxlen=d_period)
+        self.k = self.d = 0.0
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, float]:
+        """Add one bar and return (k, d)."""
+        n_high = self._high.push(float(high))
+        n_low = self._low.push(float(low))
+        k = _divide(float(close) - n_low, n_high - n_low)
+        self._k.append(k)
+        d = math.nan
+        # pandas' rolling mean is NaN for any window holding a NaN or an infinity
+        if len(self._k) == self.d_period and all(math.isfinite(v) for v in self._k):
+            d = math.fsum(self._k) / self.d_period
+        self.k = 0.0 if math.isnan(k) else k
+        self.d = 0.0 if math.isnan(d) else d
+        return self.k, self.d
+
+    def warm_up(self, df: pd.DataFrame) -> 'OnlineStochastic':
+        """Seed the state from a High/Low/Close history; only the rows that still
+        affect the next outputs (`k_period + d_period - 1`) are read."""
+        tail = df[['High', 'Low', 'Close']].iloc[-(self.k_period + self.d_period - 1):]
+        for high, low, close in tail.to_numpy(dtype=float):
+            self.update(high, low, close)
+        return self
+
+
+def _divide(num: float, den: float) -> float:
+    """Float division with pandas semantics (x/0 -> +/-inf, 0/0 -> NaN)."""
+    if den == 0:
+        if num == 0 or math.isnan(num):
+            return math.nan
+        return math.copysign(math.inf, num) * math.copysign(1.0, den)
+    return num / den
+
+__all__ = ['OnlineBollinger', 'OnlineStochastic']
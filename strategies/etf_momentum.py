@@ -2,9 +2,12 @@ from __future__ import annotations
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass, field
+from functools import partial
 from typing import List, Dict, Any, Iterable, Tuple
 from .momentum import MonthlyTopNMomentum, MomentumRebalanceEngine
 from analytics.performance import summarize_performance
+from utils.grid import iter_parameter_grid
+from utils.search import run_search
 
 @dataclass
 class ETFFixedUniverseMomentum:
@@ -25,39 +28,31 @@ def run_etf_momentum(prices: pd.DataFrame, config: ETFFixedUniverseMomentum, ini
     strat = config.to_strategy()
     engine = MomentumRebalanceEngine(strategy=strat, initial_capital=initial_capital)
     result = engine.run(px)
-    perf = summarize_performance(result['equity'], result['returns'], pd.DataFrame(engine.trade_log))
+    perf = summarize_performance(result['equity'], result['returns'], engine.trade_log)
     return {
         'config': config,
         'equity_curve': result,
         'performance': perf,
-        'trades': pd.DataFrame(engine.trade_log)
+        'trades': engine.trade_log.to_frame()
     }
 
 
-def parameter_grid(param_dict: Dict[str, Iterable]) -> List[Dict[str, Any]]:
-    from itertools import product
-    keys = list(param_dict.keys())
-    grids = []
-    for combo in product(*param_dict.values()):
-        grids.append({k: v for k, v in zip(keys, combo)})
-    return grids
+def _evaluate_etf(params: Dict[str, Any], prices: pd.DataFrame, universe: List[str], initial_capital: float) -> Dict[str, Any]:
+    cfg = ETFFixedUniverseMomentum(universe=universe, n=params['n'], lookback=params['lookback'])
+    perf = run_etf_momentum(prices, cfg, initial_capital=initial_capital)['performance']
+    return {k: perf[k] for k in ('CAGR', 'Sharpe', 'MaxDrawdown', 'Turnover')}
 
 
-def optimize_etf_momentum(prices: pd.DataFrame, universe: List[str], param_space: Dict[str, Iterable], top_k: int = 5, initial_capital: float = 100_000) -> pd.DataFrame:
-    rows = []
-    for params in parameter_grid(param_space):
-        cfg = ETFFixedUniverseMomentum(universe=universe, n=params['n'], lookback=params['lookback'])
-        out = run_etf_momentum(prices, cfg, initial_capital=initial_capital)
-        perf = out['performance']
-        rows.append({
-            'n': params['n'],
-            'lookback': params['lookback'],
-            'CAGR': perf['CAGR'],
-            'Sharpe': perf['Sharpe'],
-            'MaxDrawdown': perf['MaxDrawdown'],
-            'Turnover': perf['Turnover']
-        })
-    df = pd.DataFrame(rows)
+def optimize_etf_momentum(prices: pd.DataFrame, universe: List[str], param_space: Dict[str, Iterable], top_k: int = 5,
+                          initial_capital: float = 100_000, n_jobs: int = 1, batch_size: int = 1) -> pd.DataFrame:
+    """Grid-search `n`/`lookback` and return the `top_k` rows by Sharpe, then CAGR.
+
+    The grid is iterated lazily; `n_jobs > 1` spreads it over a process pool
+    (see `utils.search.iter_search`).
+    """
+    evaluate = partial(_evaluate_etf, prices=prices, universe=universe, initial_capital=initial_capital)
+    df = run_search(evaluate, iter_parameter_grid(param_space), n_jobs=n_jobs, batch_size=batch_size)
+    df = df[['n', 'lookback', 'CAGR', 'Sharpe', 'MaxDrawdown', 'Turnover']]
     df = df.sort_values(by=['Sharpe','CAGR'], ascending=False).head(top_k)
     return df.reset_index(drop=True)
 
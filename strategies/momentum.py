@@ -3,6 +3,8 @@ import pandas as pd
 import numpy as np
 from dataclasses import dataclass, field
 from typing import List, Dict, Any
+from utils.schedule import RebalanceSchedule
+from backtest.ledger import TradeLedger
 
 
 def trailing_return(prices: pd.DataFrame, start_idx: int, end_idx: int) -> pd.Series:
@@ -28,17 +30,23 @@ class MonthlyTopNMomentum:
 class MomentumRebalanceEngine:
     strategy: MonthlyTopNMomentum
     initial_capital: float = 10_000
-    trade_log: List[Dict[str, Any]] = field(default_factory=list)
+    trade_log: TradeLedger = field(default_factory=lambda: TradeLedger(symbol_field='ticker'))
     history: List[Dict[str, Any]] = field(default_factory=list)
+    schedule: RebalanceSchedule = field(default_factory=lambda: RebalanceSchedule(freq='MS'))
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.trade_log, TradeLedger):
+            ledger = TradeLedger(symbol_field='ticker')
+            ledger.extend(self.trade_log)
+            self.trade_log = ledger
 
     def run(self, prices: pd.DataFrame) -> pd.DataFrame:
         prices = prices.sort_index()
-        rebalance_points = prices.resample('MS').first().index
+        plan = self.schedule.map(prices.index)
         equity = self.initial_capital
         prev_holdings: Dict[str, float] = {}
-        for i, date in enumerate(rebalance_points):
-            pos_arr = prices.index.get_indexer([date], method='nearest')
-            pos = pos_arr[0]
+        for i, date in enumerate(plan.points):
+            pos = plan.pos[i]
             if pos <= 0:
                 continue
             # Actual trading date corresponding to this rebalance
@@ -47,11 +55,8 @@ class MomentumRebalanceEngine:
             if not tickers:
                 continue
             allocation = equity / len(tickers)
-            # Determine next rebalance calendar date and map to trading index
-            cal_next = rebalance_points[i+1] if i < len(rebalance_points)-1 else prices.index[-1]
-            next_pos_arr = prices.index.get_indexer([cal_next], method='nearest')
-            next_pos = next_pos_arr[0]
-            actual_next = prices.index[next_pos]
+            # next rebalance point, already mapped to the trading index
+            actual_next = prices.index[plan.next_pos[i]]
             start_prices = prices.loc[actual_date, tickers]
             # target shares
             target_shares = {t: allocation / start_prices[t] for t in tickers}
@@ -66,14 +71,9 @@ class MomentumRebalanceEngine:
                 if t not in tickers and prev_holdings[t] != 0:
                     trades[t] = -prev_holdings[t]
             # log trades
-            for t, sh in trades.items():
-                self.trade_log.append({
-                    'date': date,
-                    'ticker': t,
-                    'shares': sh,
-                    'price': start_prices.get(t, np.nan),
-                    'notional': sh * start_prices.get(t, np.nan)
-                })
+            traded = list(trades)
+            self.trade_log.extend(date, traded, [trades[t] for t in traded],
+                                  start_prices.reindex(traded).to_numpy(dtype=float))
             # evolve portfolio to next rebalance
             period_slice = prices.loc[actual_date:actual_next, tickers].ffill()
             if period_slice.empty:
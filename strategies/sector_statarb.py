@@ -6,6 +6,7 @@ from typing import List, Dict, Any, Tuple
 from .statarb import hedge_ratio
 from utils import zscore as _zscore
 from analytics.performance import summarize_performance
+from backtest.ledger import TradeLedger
 
 @dataclass
 class PairDefinition:
@@ -37,7 +38,7 @@ class MultiPairStatArb:
     def run(self, prices: pd.DataFrame) -> Dict[str, Any]:
         equity = 0.0
         pair_results = {}
-        trades_records = []
+        trades_records = TradeLedger()
         equity_curves = []
         alloc = self.per_pair_capital or (self.capital / len(self.pairs))
         for p in self.pairs:
@@ -57,7 +58,7 @@ class MultiPairStatArb:
             combined = pd.concat(equity_curves, axis=1).fillna(method='ffill').sum(axis=1)
             combined.name = 'equity'
             returns = combined.pct_change().fillna(0)
-            perf = summarize_performance(combined, returns, pd.DataFrame(trades_records))
+            perf = summarize_performance(combined, returns, trades_records)
         else:
             combined = pd.Series(dtype=float, name='equity')
             returns = pd.Series(dtype=float)
@@ -66,7 +67,7 @@ class MultiPairStatArb:
             'pair_results': pair_results,
             'portfolio_equity': pd.DataFrame({'equity': combined, 'returns': returns}),
             'performance': perf,
-            'trades': pd.DataFrame(trades_records)
+            'trades': trades_records.to_frame()
         }
 
     def _run_pair(self, prices: pd.DataFrame, p: PairDefinition) -> pd.DataFrame:
@@ -10,3 +10,49 @@ def test_backtester_equity_monotonic_when_only_buys():
     assert len(equity) == 4
     # equity should track marked value; final equity > initial cash if price rose
     assert equity.iloc[-1] > 100
+
+
+def test_lot_queue_fifo_and_running_size():
+    from backtest.simple import LotQueue, Trade
+    lots = LotQueue(capacity=2)
+    for i in range(5):
+        lots.push(10.0 + i, float(i + 1))
+    assert len(lots) == 5 and lots.total_size == 15.0
+    assert lots.popleft() == Trade(entry_price=10.0, size=1.0)
+    lots.append(Trade(entry_price=20.0, size=6.0))
+    assert [t.entry_price for t in lots] == [11.0, 12.0, 13.0, 14.0, 20.0]
+    assert lots[-1].size == 6.0 and lots.total_size == 20.0
+    while lots:
+        lots.popleft()
+    assert lots.total_size == 0.0
+
+
+
+def test_open_trades_accepts_and_behaves_like_a_list():
+    from backtest.simple import Trade
+    trades = [Trade(entry_price=10.0, size=2.0), Trade(entry_price=11.0, size=3.0), Trade(entry_price=12.0, size=4.0)]
+    bt = SimpleFIFOBacktester(open_trades=list(trades))
+    assert bt.open_trades == trades and bt.open_trades.total_size == 9.0
+    assert bt.open_trades[1:] == trades[1:]
+    bt.step(13.0, 1)  # sells the earliest lot
+    assert bt.open_trades == trades[1:] and bt.mark_to_market(13.0) == bt.cash + 7.0 * 13.0
+    assert bt.open_trades.pop() == trades[2] and bt.open_trades.pop(0) == trades[1]
+    bt.open_trades.extend(trades)
+    assert bt.open_trades.pop(1) == trades[1] and bt.open_trades == [trades[0], trades[2]]
+    assert bt.open_trades.total_size == 6.0
+
+def test_run_many_matches_individual_runs():
+    import numpy as np
+    rng = np.random.default_rng(0)
+    prices = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (300, 6)), axis=0)), columns=list('ABCDEF'))
+    signals = pd.DataFrame(rng.choice([-1, 0, 1], size=prices.shape), columns=prices.columns)
+    fractions = np.linspace(0.1, 0.6, 6)
+    bt = SimpleFIFOBacktester(initial_cash=1000, min_cash=1, commission_bps=5, slippage_bps=2)
+    equity = bt.run_many(prices, signals, trade_fraction=fractions)
+    assert equity.shape == prices.shape
+    for col, fraction in zip(prices.columns, fractions):
+        single = SimpleFIFOBacktester(initial_cash=1000, trade_fraction=fraction, min_cash=1,
+                                      commission_bps=5, slippage_bps=2)
+        pd.testing.assert_series_equal(equity[col], single.run(prices[col], signals[col]), check_names=False)
+        assert bt.batch_state.loc[col, 'cash'] == single.cash
+        assert bt.batch_state.loc[col, 'open_lots'] == len(single.open_trades)
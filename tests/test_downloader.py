@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data import ChunkedDownloader, PriceProvider, SyntheticProvider, get_cached_prices
+
+
+def test_chunked_download_matches_single_request_and_isolates_failures():
+    tickers = [f'T{i:02d}' for i in range(23)]
+    reference = SyntheticProvider(seed=3).fetch(tickers, '2024-01-01', '2024-03-01')
+    provider = SyntheticProvider(seed=3, flaky={'T04': 2, 'T17': 99}, missing={'T09'})
+    assert isinstance(provider, PriceProvider)
+    waits = []
+    downloader = ChunkedDownloader(provider, chunk_size=5, max_workers=4, retries=2, backoff=0.1, sleep=waits.append)
+    out = downloader.download(tickers, '2024-01-01', '2024-03-01')
+    expected = [t for t in tickers if t not in ('T09', 'T17')]
+    assert list(out.columns) == expected
+    pd.testing.assert_frame_equal(out, reference[expected], check_freq=False)
+    assert downloader.failed == ['T17']
+    # T04 recovered on its third attempt: backoff 0.1 then 0.2
+    assert waits.count(0.1) >= 1 and max(waits) <= 0.2
+    assert max(len(c) for c in provider.calls) == 5
+
+
+def test_get_cached_prices_with_offline_provider(tmp_path):
+    cache = str(tmp_path / 'cache')
+    provider = SyntheticProvider(seed=1)
+    first = get_cached_prices(['AAA', 'BBB'], '2024-01-01', '2024-02-01', cache_dir=cache, provider=provider)
+    assert list(first.columns) == ['AAA', 'BBB'] and first.index[-1] < pd.Timestamp('2024-02-01')
+    first.ffill(inplace=True)  # callers may edit the returned frame in place
+    n_calls = len(provider.calls)
+    # a new ticker is backfilled and later days are appended; the rest comes from disk
+    both = get_cached_prices(['BBB', 'CCC'], '2024-01-10', '2024-02-15', cache_dir=cache, provider=provider)
+    assert len(provider.calls) > n_calls
+    reference = SyntheticProvider(seed=1).fetch(['BBB', 'CCC'], '2024-01-01', '2024-02-15')
+    pd.testing.assert_frame_equal(both, reference.loc['2024-01-10':], check_freq=False)
+
+
+def test_price_cache_serves_repeats_from_memory_until_ttl(tmp_path):
+    from data import PriceCache
+    now = [0.0]
+    provider = SyntheticProvider(seed=2)
+    cache = PriceCache(str(tmp_path / 'cache'), provider=provider, maxsize=2, ttl=60, clock=lambda: now[0])
+    first = cache.get(['AAA', 'BBB'], '2024-01-01', '2024-03-01')
+    n_calls = len(provider.calls)
+    repeat = cache.get(['AAA', 'BBB'], '2024-01-01', '2024-03-01')
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert repeat is not first and np.shares_memory(repeat.to_numpy(), first.to_numpy())
+    # one caller's edits never reach what the next caller gets
+    repeat['CCC'] = 1.0
+    with pytest.raises(ValueError):
+        repeat.iloc[0, 0] = -1.0
+    pd.testing.assert_frame_equal(cache.get(['AAA', 'BBB'], '2024-01-01', '2024-03-01'), first)
+    # within the TTL, other slices of stored tickers come from disk without a freshness check
+    sub = cache.get(['BBB'], '2024-02-01', '2024-03-01')
+    pd.testing.assert_frame_equal(sub, first.loc['2024-02-01':, ['BBB']])
+    assert len(provider.calls) == n_calls
+    cache.get(['CCC'], '2024-01-01', '2024-03-01')
+    assert len(cache) == 2 and len(provider.calls) > n_calls
+    now[0] = 61.0
+    n_calls = len(provider.calls)
+    again = cache.get(['AAA', 'BBB'], '2024-01-01', '2024-03-01')
+    # rechecked after the TTL; the store already reaches the last business day, so nothing is fetched
+    assert again is not first and len(provider.calls) == n_calls
+    pd.testing.assert_frame_equal(again, first)
+
+
+def test_price_cache_extends_past_stored_end_within_ttl(tmp_path):
+    from data import PriceCache
+    provider = SyntheticProvider(seed=5)
+    cache = PriceCache(str(tmp_path / 'cache'), provider=provider, ttl=3600, clock=lambda: 0.0)
+    short = cache.get(['AAA'], '2024-01-01', '2024-02-01')
+    assert short.index[-1] == pd.Timestamp('2024-01-31')
+    longer = cache.get(['AAA'], '2024-01-01', '2024-06-01')
+    assert longer.index[-1] == pd.Timestamp('2024-05-31')
+    reference = SyntheticProvider(seed=5).fetch(['AAA'], '2024-01-01', '2024-06-01')
+    pd.testing.assert_frame_equal(longer, reference, check_freq=False)
+    # the end date itself has no bar; once checked, later reads inside the TTL stay local
+    n_calls = len(provider.calls)
+    pd.testing.assert_frame_equal(cache.get(['AAA'], '2024-03-01', '2024-06-01'), reference.loc['2024-03-01':],
+                                  check_freq=False)
+    assert len(provider.calls) == n_calls
+
+
+def test_empty_range_is_not_retried_or_fetched(tmp_path):
+    provider = SyntheticProvider(seed=6)
+    waits = []
+    downloader = ChunkedDownloader(provider, chunk_size=2, retries=3, sleep=waits.append)
+    out = downloader.download(['AAA', 'BBB', 'CCC'], '2024-01-06', '2024-01-08')  # a weekend
+    assert out.empty and downloader.failed == [] and waits == []
+    assert len(provider.calls) == 2
+    cache = str(tmp_path / 'cache')
+    get_cached_prices(['AAA'], '2024-01-01', '2024-01-06', cache_dir=cache, provider=provider)
+    n_calls = len(provider.calls)
+    # the store ends on Friday 2024-01-05; nothing is left to fetch before Monday
+    out = get_cached_prices(['AAA'], '2024-01-01', '2024-01-08', cache_dir=cache, provider=provider)
+    assert len(provider.calls) == n_calls and out.index[-1] == pd.Timestamp('2024-01-05')
+
+
+def test_partial_universe_update_extends_every_stored_ticker(tmp_path):
+    cache = str(tmp_path / 'cache')
+    provider = SyntheticProvider(seed=7)
+    get_cached_prices(['AAA', 'BBB'], '2020-01-01', '2020-06-30', cache_dir=cache, provider=provider)
+    get_cached_prices(['AAA'], '2020-01-01', '2020-12-31', cache_dir=cache, provider=provider)
+    later = get_cached_prices(['BBB'], '2020-01-01', '2020-12-31', cache_dir=cache, provider=provider)
+    reference = SyntheticProvider(seed=7).fetch(['BBB'], '2020-01-01', '2020-12-31')
+    pd.testing.assert_frame_equal(later, reference, check_freq=False)
+
+
+def test_synthetic_provider_overlapping_requests_agree():
+    fields = ['Open', 'High', 'Low', 'Close', 'Volume']
+    provider = SyntheticProvider(seed=8)
+    short = provider.fetch(['AAA', 'BBB'], '2020-01-01', '2020-03-01', fields=fields)
+    longer = provider.fetch(['AAA', 'BBB'], '2020-01-01', '2020-06-01', fields=fields)
+    later = provider.fetch(['AAA', 'BBB'], '2020-02-03', '2020-06-01', fields=fields)
+    pd.testing.assert_frame_equal(short, longer.loc[short.index], check_freq=False)
+    pd.testing.assert_frame_equal(later, longer.loc[later.index], check_freq=False)
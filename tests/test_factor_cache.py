@@ -0,0 +1,38 @@
+import pandas as pd
+import numpy as np
+from functools import partial
+from factors import momentum_factor
+from factors.cache import FactorCache, factor_key, price_fingerprint
+
+
+def test_factor_cache_lru_eviction_and_spill(tmp_path):
+    cache = FactorCache(maxsize=2, spill_dir=str(tmp_path))
+    for i in range(3):
+        cache.put(('f', i), pd.Series([float(i)]))
+    assert len(cache) == 2
+    assert ('f', 0) in cache  # evicted from memory but spilled to disk
+    assert cache.get(('f', 0)).iloc[0] == 0.0
+    assert cache.get(('missing',)) is None
+    assert cache.hits == 1 and cache.misses == 1
+
+    cache.flush()
+    fresh = FactorCache(maxsize=2, spill_dir=str(tmp_path))
+    assert fresh.get(('f', 2)).iloc[0] == 2.0
+
+
+def test_factor_key_and_fingerprint_distinguish_inputs():
+    assert factor_key(partial(momentum_factor, lookback=126)) == factor_key(partial(momentum_factor, lookback=126))
+    assert factor_key(partial(momentum_factor, lookback=126)) != factor_key(partial(momentum_factor, lookback=63))
+    assert factor_key(lambda px: momentum_factor(px, 126)) != factor_key(lambda px: momentum_factor(px, 63))
+
+    def mk(k):
+        return lambda p: p.pct_change(k)
+    assert factor_key(mk(np.int64(5))) != factor_key(mk(np.int64(60)))
+    assert factor_key(mk(np.int64(5))) == factor_key(mk(np.int64(5)))
+    assert factor_key(mk(np.arange(3))) is None  # not describable: never cached
+    idx = pd.date_range('2024-01-01', periods=5, freq='B')
+    prices = pd.DataFrame({'A': np.arange(5.0), 'B': np.ones(5)}, index=idx)
+    assert price_fingerprint(prices) == price_fingerprint(prices.copy())
+    changed = prices.copy()
+    changed.iloc[2, 0] = 99.0
+    assert price_fingerprint(prices) != price_fingerprint(changed)
@@ -0,0 +1,98 @@
+import pandas as pd
+import numpy as np
+from engines import FactorPortfolioEngine, FactorConfig
+
+
+def _make_prices(rows: int = 320, cols: int = 8):
+    idx = pd.date_range('2022-01-03', periods=rows, freq='B')
+    rng = np.random.default_rng(42)
+    data = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, (rows, cols)), axis=0))
+    return pd.DataFrame(data, index=idx, columns=[f'T{i}' for i in range(cols)])
+
+
+def test_factor_engine_runs_on_business_day_calendar():
+    prices = _make_prices()
+    engine = FactorPortfolioEngine(config=FactorConfig(weights={'momentum': 0.6, 'low_vol': 0.4}, top_n=3))
+    out = engine.run(prices)
+    assert not out['equity'].empty
+    assert not out['trades'].empty
+    assert set(out['performance']) == {'CAGR', 'Sharpe', 'MaxDrawdown', 'Turnover'}
+
+
+def test_factor_engine_panel_mode_matches_per_date():
+    prices = _make_prices()
+    weights = {'momentum': 0.3, 'low_vol': 0.2, 'value': 0.2, 'quality': 0.2, 'size': 0.1}
+    cfg = FactorConfig(weights=weights, top_n=3, long_short=True, short_fraction=0.5)
+    per_date = FactorPortfolioEngine(config=cfg).run(prices)
+    panel = FactorPortfolioEngine(config=cfg, panel=True).run(prices)
+    pd.testing.assert_frame_equal(per_date['equity'], panel['equity'])
+    pd.testing.assert_frame_equal(per_date['trades'], panel['trades'])
+
+
+def test_factor_engine_equity_marks_each_day_once():
+    prices = _make_prices()
+    engine = FactorPortfolioEngine(config=FactorConfig(weights={'momentum': 1.0}, top_n=2), panel=True)
+    out = engine.run(prices)
+    equity = out['equity']
+    assert equity.index.is_unique and equity.index.is_monotonic_increasing
+    assert equity.index[-1] == prices.index[-1]
+    first = equity.index[0]
+    pd.testing.assert_index_equal(equity.index, prices.loc[first:].index, check_names=False)
+    # a rebalance only reallocates: equity on the next day follows the held shares
+    trades = out['trades']
+    second = trades['date'].drop_duplicates().iloc[1]
+    held = trades[trades['date'] < second].groupby('symbol')['shares'].sum()
+    held = held[held.abs() > 1e-9]
+    assert np.isclose(equity.loc[second, 'equity'], (held * prices.loc[second, held.index]).sum())
+
+
+def test_factor_engine_cache_reused_across_weightings():
+    from factors.cache import FactorCache
+    prices = _make_prices()
+    cache = FactorCache(maxsize=10_000)
+    first_cfg = FactorConfig(weights={'momentum': 0.6, 'low_vol': 0.4}, top_n=3)
+    uncached = FactorPortfolioEngine(config=first_cfg).run(prices)
+    cached = FactorPortfolioEngine(config=first_cfg, cache=cache).run(prices)
+    pd.testing.assert_frame_equal(uncached['equity'], cached['equity'])
+    misses = cache.misses
+    assert misses > 0 and cache.hits == 0
+    second_cfg = FactorConfig(weights={'momentum': 0.2, 'low_vol': 0.8}, top_n=3)
+    FactorPortfolioEngine(config=second_cfg, cache=cache).run(prices)
+    assert cache.misses == misses
+    assert cache.hits == misses
+    # different prices must not hit entries computed for the old panel
+    FactorPortfolioEngine(config=second_cfg, cache=cache).run(prices * 1.01)
+    assert cache.misses == 2 * misses
+
+
+def test_factor_engine_run_batch_matches_individual_runs():
+    prices = _make_prices()
+    names = ['momentum', 'low_vol', 'value']
+    weights = np.array([[0.6, 0.4, 0.0], [0.2, 0.3, 0.5], [1.0, 0.0, 0.0]])
+    top_n = [2, 3, 4]
+    long_short = [False, True, False]
+    engine = FactorPortfolioEngine(panel=True)
+    batch = engine.run_batch(prices, weights, top_n=top_n, long_short=long_short,
+                             short_fraction=0.5, factor_names=names)
+    assert len(batch) == len(weights)
+    for j in range(len(weights)):
+        cfg = FactorConfig(weights=dict(zip(names, weights[j])), top_n=top_n[j],
+                           long_short=long_short[j], short_fraction=0.5)
+        perf = FactorPortfolioEngine(config=cfg, panel=True).run(prices)['performance']
+        for metric, value in perf.items():
+            assert np.isclose(batch.loc[j, metric], value)
+    configs = [FactorConfig(weights={'momentum': 1.0}, top_n=2)]
+    assert len(engine.run_batch(prices, configs)) == 1
+
+
+def test_factor_engine_quarterly_and_custom_schedule():
+    from utils.schedule import RebalanceSchedule
+    prices = _make_prices()
+    quarterly = FactorPortfolioEngine(config=FactorConfig(weights={'momentum': 1.0}, top_n=2, rebalance_freq='Q'))
+    assert quarterly.run(prices)['trades']['date'].nunique() <= 5
+    dates = [prices.index[100], prices.index[200]]
+    custom = FactorPortfolioEngine(config=FactorConfig(weights={'momentum': 1.0}, top_n=2),
+                                   schedule=RebalanceSchedule(dates=dates))
+    out = custom.run(prices)
+    assert set(out['trades']['date']) == set(dates)
+    assert out['equity'].index[0] == dates[0]
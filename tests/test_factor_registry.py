@@ -0,0 +1,65 @@
+import pandas as pd
+import numpy as np
+import pytest
+from factors import DEFAULT_REGISTRY, FactorRegistry, FactorSpec
+from engines import FactorPortfolioEngine, FactorConfig
+
+
+def _make_prices(rows: int = 300):
+    idx = pd.date_range('2022-01-03', periods=rows, freq='B')
+    rng = np.random.default_rng(11)
+    data = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (rows, 5)), axis=0))
+    prices = pd.DataFrame(data, index=idx, columns=list('ABCDE'))
+    prices.iloc[:80, 1] = np.nan
+    return prices
+
+
+def test_default_specs_on_tail_match_full_history():
+    prices = _make_prices()
+    for name in DEFAULT_REGISTRY:
+        spec = DEFAULT_REGISTRY[name]
+        for pos in (10, 64, 127, 128, 200, len(prices) - 1):
+            tail = spec.tail(prices, pos)
+            assert len(tail) == min(spec.lookback, pos + 1)
+            assert np.shares_memory(tail.to_numpy(), prices.to_numpy())
+            pd.testing.assert_series_equal(spec(tail), spec(prices.iloc[:pos + 1]))
+    assert DEFAULT_REGISTRY.max_lookback() == 128
+    assert DEFAULT_REGISTRY.max_lookback(['value', 'size']) == 63
+
+
+def test_padded_tails_cover_forward_filled_gaps():
+    from factors.registry import fill_starts
+    prices = _make_prices()
+    prices.iloc[100:250, 2] = np.nan  # a gap longer than any declared lookback
+    prices.iloc[180:185, 3] = np.nan
+    starts = fill_starts(prices)
+    for name in DEFAULT_REGISTRY:
+        spec = DEFAULT_REGISTRY[name]
+        panel = spec.panel(prices)
+        for pos in (120, 200, 240, 255, 270, len(prices) - 1):
+            tail = spec.tail(prices, pos, starts)
+            expected = spec(prices.iloc[:pos + 1])
+            pd.testing.assert_series_equal(spec(tail), expected)
+            np.testing.assert_allclose(panel.iloc[pos].to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-12)
+    # without gaps the padded tail is just the declared lookback
+    clean = fill_starts(_make_prices().iloc[80:])
+    assert (clean == np.arange(len(clean))).all()
+
+def test_engine_passes_declared_tail_and_shared_returns():
+    prices = _make_prices()
+    seen = []
+
+    def mean_return(returns: pd.DataFrame, window: int) -> pd.Series:
+        seen.append(len(returns))
+        return returns.tail(window).mean()
+
+    registry = FactorRegistry([FactorSpec('trend', mean_return, lookback=20, inputs=('returns',), params={'window': 20})])
+    engine = FactorPortfolioEngine(factor_funcs=registry.factor_funcs(), panel_funcs={},
+                                   config=FactorConfig(weights={'trend': 1.0}, top_n=2))
+    out = engine.run(prices)
+    assert seen and max(seen) == 20
+    assert not out['trades'].empty
+    with pytest.raises(ValueError):
+        FactorSpec('bad', mean_return, lookback=0)
+    with pytest.raises(ValueError):
+        FactorSpec('bad', mean_return, lookback=5, inputs=('volume',))
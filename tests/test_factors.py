@@ -10,3 +10,77 @@ def test_factor_composite_rank():
     comp = composite_rank({'mom': mom, 'vol': vol}, {'mom': 0.6, 'vol': 0.4})
     assert not comp.empty
     assert comp.index.isin(prices.columns).all()
+
+
+def test_factor_panels_match_per_date_factors():
+    from factors import (momentum_factor_panel, volatility_factor_panel, value_factor,
+                         value_factor_panel, quality_factor, quality_factor_panel,
+                         size_factor, size_factor_panel)
+    idx = pd.date_range('2023-01-01', periods=160, freq='B')
+    rng = np.random.default_rng(0)
+    prices = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(idx), 4)), axis=0)),
+                          index=idx, columns=list('ABCD'))
+    pairs = [
+        (lambda px: momentum_factor(px, lookback=60), momentum_factor_panel(prices, lookback=60)),
+        (lambda px: volatility_factor(px, lookback=60), volatility_factor_panel(prices, lookback=60)),
+        (value_factor, value_factor_panel(prices)),
+        (quality_factor, quality_factor_panel(prices)),
+        (size_factor, size_factor_panel(prices)),
+    ]
+    for func, panel in pairs:
+        assert panel.shape == prices.shape
+        for t in (5, 40, 61, 62, 100, len(idx) - 1):
+            expected = func(prices.iloc[:t + 1])
+            np.testing.assert_allclose(panel.iloc[t].values, expected.values, rtol=1e-9, atol=1e-12)
+
+
+def test_factor_context_memoizes_and_matches_pandas():
+    from factors import FactorContext, quality_factor, volatility_factor
+    idx = pd.date_range('2023-01-01', periods=120, freq='B')
+    rng = np.random.default_rng(1)
+    prices = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(idx), 3)), axis=0)),
+                          index=idx, columns=list('ABC'))
+    prices.iloc[10:15, 1] = np.nan
+    ctx = FactorContext(prices)
+    rets = prices.pct_change()
+    assert ctx.returns() is ctx.returns()
+    for window in (5, 20, 63):
+        pd.testing.assert_frame_equal(ctx.rolling_std(window), rets.rolling(window, min_periods=2).std(), rtol=1e-9, atol=1e-12)
+        pd.testing.assert_frame_equal(ctx.rolling_mean(window), prices.rolling(window, min_periods=1).mean(), rtol=1e-9)
+    pd.testing.assert_series_equal(volatility_factor(ctx, lookback=60), volatility_factor(prices, lookback=60))
+    pd.testing.assert_series_equal(quality_factor(ctx), quality_factor(prices))
+
+
+
+def test_panel_rolling_stats_stay_accurate_on_long_high_priced_history():
+    from factors import size_factor, size_factor_panel, volatility_factor, volatility_factor_panel
+    idx = pd.date_range('1990-01-01', periods=8000, freq='B')
+    rng = np.random.default_rng(3)
+    # steady drift with tiny noise: a large mean against a small variance
+    prices = pd.DataFrame(1e6 * np.exp(np.cumsum(rng.normal(1e-3, 1e-6, (len(idx), 2)), axis=0)),
+                          index=idx, columns=list('AB'))
+    vol = volatility_factor_panel(prices, lookback=20)
+    size = size_factor_panel(prices)
+    for t in (100, 4000, len(idx) - 1):
+        np.testing.assert_allclose(vol.iloc[t].values, volatility_factor(prices.iloc[:t + 1], lookback=20).values, rtol=1e-9)
+        np.testing.assert_allclose(size.iloc[t].values, size_factor(prices.iloc[:t + 1]).values, rtol=1e-12)
+
+def test_composite_rank_top_n_matches_full_ranking():
+    from factors import top_bottom_indices
+    rng = np.random.default_rng(2)
+    idx = [f'S{i}' for i in range(200)]
+    factors = {name: pd.Series(np.round(rng.normal(size=len(idx)), 1), index=idx) for name in ('mom', 'vol')}
+    factors['vol'].iloc[::7] = np.nan
+    weights = {'mom': 0.7, 'vol': 0.3}
+    full = composite_rank(factors, weights)
+    assert full.is_monotonic_decreasing
+    # ties keep input order
+    for _, group in full.groupby(full, sort=False):
+        assert list(group.index) == sorted(group.index, key=idx.index)
+    for n in (1, 10, 99, 150, 250):
+        partial = composite_rank(factors, weights, top_n=n)
+        assert list(partial.head(n).index) == list(full.head(n).index)
+        assert list(partial.tail(n).index) == list(full.tail(n).index)
+    top, bottom = top_bottom_indices(full.reindex(idx).to_numpy(), 5)
+    assert [idx[i] for i in top] == list(full.index[:5])
+    assert [idx[i] for i in bottom] == list(full.index[-5:])
@@ -14,3 +14,44 @@ def test_stochastic_columns():
     out = stochastic_oscillator(df, k_period=2, d_period=2)
     assert set(out.columns) == {"k", "d"}
     assert len(out) == len(df)
+
+
+def test_panel_indicators_match_per_ticker():
+    import numpy as np
+    from indicators import bollinger_bands_panel, stochastic_oscillator_panel, rolling_max, rolling_min
+    rng = np.random.default_rng(0)
+    idx = pd.date_range('2024-01-01', periods=60, freq='B')
+    close = pd.DataFrame(100 + np.cumsum(rng.normal(size=(60, 4)), axis=0), index=idx, columns=list('ABCD'))
+    high = close + rng.random(close.shape)
+    low = close - rng.random(close.shape)
+    high.iloc[10, 1] = np.nan
+    bands = bollinger_bands_panel(close, window=5)
+    stoch = stochastic_oscillator_panel({'High': high, 'Low': low, 'Close': close}, k_period=7, d_period=3)
+    for t in close.columns:
+        pd.testing.assert_frame_equal(bands.xs(t, axis=1, level=1), bollinger_bands(close[t], window=5),
+                                      check_names=False)
+        single = stochastic_oscillator(pd.DataFrame({'High': high[t], 'Low': low[t], 'Close': close[t]}), 7, 3)
+        pd.testing.assert_frame_equal(stoch.xs(t, axis=1, level=1), single, check_names=False)
+    for window in (1, 3, 7, 60, 61):
+        np.testing.assert_array_equal(rolling_max(high.to_numpy(), window), high.rolling(window).max().to_numpy())
+        np.testing.assert_array_equal(rolling_min(low.to_numpy(), window), low.rolling(window).min().to_numpy())
+
+
+def test_online_indicators_match_batch():
+    import numpy as np
+    from indicators import OnlineBollinger, OnlineStochastic
+    rng = np.random.default_rng(1)
+    close = pd.Series(100 + np.cumsum(rng.normal(size=200)))
+    close.iloc[50] = np.nan
+    df = pd.DataFrame({'High': close + rng.random(200), 'Low': close - rng.random(200), 'Close': close})
+    df.iloc[120:125, :] = df.iloc[119].to_numpy()  # flat bars: zero range
+    bands = bollinger_bands(close, window=10)
+    stoch = stochastic_oscillator(df, k_period=5, d_period=3)
+    boll, sto = OnlineBollinger(window=10), OnlineStochastic(k_period=5, d_period=3)
+    for t in range(len(close)):
+        np.testing.assert_allclose(boll.update(close.iloc[t]), bands.iloc[t].to_numpy(), rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(sto.update(*df.iloc[t]), stoch.iloc[t].to_numpy(), rtol=1e-9, atol=1e-12)
+    warm = OnlineBollinger(window=10).warm_up(close.iloc[:150])
+    np.testing.assert_allclose(warm.update(close.iloc[150]), bands.iloc[150].to_numpy(), rtol=1e-9)
+    warm = OnlineStochastic(k_period=5, d_period=3).warm_up(df.iloc[:150])
+    np.testing.assert_allclose(warm.update(*df.iloc[150]), stoch.iloc[150].to_numpy(), rtol=1e-9)
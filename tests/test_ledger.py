@@ -0,0 +1,51 @@
+import pandas as pd
+import numpy as np
+from backtest.ledger import TradeLedger
+from analytics.performance import turnover
+
+
+def test_trade_ledger_grows_and_converts_without_copy():
+    ledger = TradeLedger(capacity=2)
+    ledger.append('2024-01-02', 'AAA', 10, 5.0)
+    ledger.extend('2024-01-03', ['BBB', 'AAA', 'CCC'], [1.0, -10.0, 2.0], [20.0, 6.0, np.nan])
+    assert len(ledger) == 4
+    assert ledger.symbols == ['AAA', 'BBB', 'CCC']
+    df = ledger.to_frame(categorical=True)
+    assert list(df.columns) == ['date', 'symbol', 'shares', 'price', 'notional']
+    assert isinstance(df['symbol'].dtype, pd.CategoricalDtype)
+    assert list(df['symbol']) == ['AAA', 'BBB', 'AAA', 'CCC']
+    assert df['notional'].iloc[2] == -60.0
+    assert np.shares_memory(df['shares'].to_numpy(), ledger._shares)
+    assert df['date'].iloc[1] == pd.Timestamp('2024-01-03')
+
+
+def test_turnover_accepts_ledger():
+    ledger = TradeLedger(symbol_field='ticker')
+    idx = pd.date_range('2024-01-01', periods=60, freq='B')
+    rng = np.random.default_rng(0)
+    for d in idx[::5]:
+        ledger.extend(d, ['X', 'Y'], rng.normal(size=2), [10.0, np.nan])
+    equity = pd.Series(np.linspace(100, 120, len(idx)), index=idx)
+    frame = ledger.to_frame()
+    assert frame['ticker'].dtype == object
+    assert np.isclose(turnover(ledger, equity), turnover(frame, equity))
+    assert np.isclose(turnover(ledger), turnover(frame))
+    assert turnover(TradeLedger()) == 0.0
+
+
+def test_trade_ledger_is_list_of_dicts_compatible():
+    ledger = TradeLedger(symbol_field='ticker')
+    ledger.append({'date': pd.Timestamp('2024-01-02'), 'ticker': 'AAA', 'shares': 2.0, 'price': 5.0, 'notional': 10.0})
+    ledger.extend('2024-01-03', ['BBB'], [-1.0], [4.0])
+    rows = list(ledger)
+    assert rows[0] == {'date': pd.Timestamp('2024-01-02'), 'ticker': 'AAA', 'shares': 2.0, 'price': 5.0, 'notional': 10.0}
+    assert ledger[-1]['ticker'] == 'BBB' and ledger[-1]['notional'] == -4.0
+    pd.testing.assert_frame_equal(pd.DataFrame(ledger), ledger.to_frame(), check_dtype=False)
+    # list operations the former List[dict] field supported
+    assert ledger[:1] == rows[:1] and ledger == rows and rows == ledger
+    assert ledger + [] == rows and [] + ledger == rows
+    ledger += [rows[0]]
+    ledger.extend(rows[:1])
+    assert len(ledger) == 4 and ledger[2:] == [rows[0], rows[0]]
+    ledger.clear()
+    assert len(ledger) == 0 and ledger == []
@@ -14,3 +14,13 @@ def test_momentum_engine_trade_log_and_metrics():
     assert len(engine.trade_log) > 0
     # equity must remain positive
     assert (result['equity'] > 0).all()
+
+
+def test_momentum_engine_accepts_list_trade_log():
+    idx = pd.date_range('2023-01-01', periods=120, freq='B')
+    data = pd.DataFrame({f'T{i}': (1 + 0.0005*i) ** np.arange(len(idx)) for i in range(5)}, index=idx)
+    seed = {'date': idx[0], 'ticker': 'T0', 'shares': 1.0, 'price': 1.0, 'notional': 1.0}
+    engine = MomentumRebalanceEngine(strategy=MonthlyTopNMomentum(n=2, lookback=20), trade_log=[seed])
+    engine.run(data)
+    assert engine.trade_log[0] == seed and len(engine.trade_log) > 1
+    assert pd.DataFrame(engine.trade_log[1:])['ticker'].isin(data.columns).all()
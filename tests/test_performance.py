@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+from analytics import summarize_performance, summarize_performance_batch
+from backtest.ledger import TradeLedger
+
+
+def test_summarize_performance_batch_matches_per_run():
+    rng = np.random.default_rng(0)
+    idx = pd.bdate_range('2021-01-01', periods=300)
+    equity = pd.DataFrame(1e6 * np.exp(np.cumsum(rng.normal(0, 0.01, (300, 4)), axis=0)), index=idx)
+    ledger = TradeLedger()
+    ledger.extend(idx[10], ['A', 'B'], [100.0, -50.0], [10.0, 20.0])
+    ledger.extend(idx[200], ['A'], [-100.0], [12.0])
+    # one trade falls on a weekend: it takes the previous trade day's equity
+    frame = pd.DataFrame({'date': [idx[5], pd.Timestamp('2021-03-06'), idx[250]],
+                          'notional': [5e4, -2e4, np.nan]})
+    trades = [ledger, frame, None, TradeLedger()]
+    batch = summarize_performance_batch(equity, trades=trades)
+    returns = equity.pct_change().fillna(0)
+    for j in equity.columns:
+        expected = summarize_performance(equity[j], returns[j], trades[j])
+        for metric, value in expected.items():
+            assert np.isclose(batch.loc[j, metric], value, rtol=1e-10), (j, metric)
+
+
+def test_rolling_metrics_and_trackers_match_windowed_calls():
+    from analytics import (sharpe_ratio, max_drawdown, rolling_sharpe, rolling_volatility, drawdown_curve,
+                           rolling_turnover, RollingSharpeTracker, DrawdownTracker, RollingTurnoverTracker)
+    rng = np.random.default_rng(1)
+    idx = pd.bdate_range('2020-01-01', periods=400)
+    returns = pd.Series(rng.normal(0.0005, 0.01, len(idx)), index=idx)
+    returns.iloc[100:120] = 0.0  # flat stretch: zero volatility -> Sharpe 0
+    returns.iloc[:40] = 1e-9 + 5e-9 * (-1.0) ** np.arange(40)  # tiny but non-zero volatility
+    equity = 100 * (1 + returns).cumprod()
+    window = 20
+    sharpe = rolling_sharpe(returns, window, min_periods=window)
+    # 35: a stdev of 5e-9 is not zero for either function
+    for t in (window - 1, 35, 110, 119, 125, len(idx) - 1):
+        assert np.isclose(sharpe.iloc[t], sharpe_ratio(returns.iloc[t - window + 1:t + 1]), rtol=1e-6, atol=1e-9)
+    assert sharpe.iloc[35] > 1
+    sharpe = rolling_sharpe(returns, window, periods_per_year=252, min_periods=window)
+    vol = rolling_volatility(returns, window, periods_per_year=252, min_periods=window)
+    tracker = RollingSharpeTracker(window, periods_per_year=252)
+    for t, r in enumerate(returns):
+        tracker.update(r)
+        if t >= window - 1:
+            assert np.isclose(tracker.sharpe, sharpe.iloc[t], atol=1e-6)
+            assert np.isclose(tracker.volatility, vol.iloc[t], rtol=1e-6, atol=1e-12)
+    curve = drawdown_curve(equity)
+    dd = DrawdownTracker()
+    for value, expected in zip(equity, curve['drawdown']):
+        assert np.isclose(dd.update(value), expected)
+    assert np.isclose(dd.max_drawdown, max_drawdown(equity)) and dd.duration == curve['duration'].iloc[-1]
+    trades = pd.DataFrame({'date': idx[::10], 'notional': 1000.0})
+    turnover = rolling_turnover(trades, equity, window, periods_per_year=252)
+    turnover_tracker = RollingTurnoverTracker(window)
+    traded = pd.Series(0.0, index=idx)
+    traded.iloc[::10] = 1000.0
+    for t in range(len(idx)):
+        assert np.isclose(turnover_tracker.update(traded.iloc[t], equity.iloc[t]), turnover.iloc[t])
+
+
+def test_bootstrap_paths_and_confidence_intervals():
+    from analytics import (bootstrap_indices, path_metrics, bootstrap_metrics, bootstrap_confidence,
+                           sharpe_ratio, max_drawdown)
+    rng = np.random.default_rng(3)
+    returns = pd.Series(rng.normal(0.0005, 0.01, 500), index=pd.bdate_range('2020-01-01', periods=500))
+    idx = bootstrap_indices(500, 50, block_size=10, method='stationary', rng=np.random.default_rng(0))
+    assert idx.shape == (50, 500) and idx.min() >= 0 and idx.max() < 500
+    # within a block rows advance by one (wrapping); a new block starts at a random offset
+    steps = (np.diff(idx, axis=1) % 500) == 1
+    assert 0.85 < steps.mean() < 0.95
+    block = bootstrap_indices(500, 5, block_size=25, method='block', rng=np.random.default_rng(0))
+    assert ((np.diff(block.reshape(5, 20, 25), axis=2) % 500) == 1).all()
+    single = path_metrics(returns.to_numpy(), 252).iloc[0]
+    assert np.isclose(single['Sharpe'], sharpe_ratio(pd.Series(returns.to_numpy())))
+    assert np.isclose(single['MaxDrawdown'], max_drawdown(pd.concat([pd.Series([1.0]), (1 + returns).cumprod()])))
+    sims = bootstrap_metrics(returns, n_paths=300, chunk_size=64, seed=7)
+    assert sims.shape == (300, 3)
+    pd.testing.assert_frame_equal(sims, bootstrap_metrics(returns, n_paths=300, chunk_size=64, seed=7))
+    ci = bootstrap_confidence(returns, n_paths=300, seed=7)
+    assert (ci['lower'] <= ci['upper']).all()
+    assert ci.loc['Sharpe', 'lower'] < ci.loc['Sharpe', 'estimate'] < ci.loc['Sharpe', 'upper']
+
+
+def test_rolling_trackers_skip_leading_nan():
+    from analytics import rolling_sharpe, RollingSharpeTracker, RollingTurnoverTracker
+    rng = np.random.default_rng(5)
+    equity = pd.Series(100 * np.cumprod(1 + rng.normal(0.0005, 0.01, 60)))
+    returns = equity.pct_change()  # leading NaN
+    window = 20
+    expected = rolling_sharpe(returns, window, periods_per_year=252, min_periods=window)
+    tracker = RollingSharpeTracker(window, periods_per_year=252)
+    out = np.array([tracker.update(r) for r in returns])
+    np.testing.assert_allclose(out, expected.to_numpy(), atol=1e-6)
+    assert np.isnan(out[:window]).all() and np.isfinite(out[window:]).all()
+    expanding = RollingSharpeTracker(None, periods_per_year=252)
+    assert np.isfinite([expanding.update(r) for r in returns][-1])
+    turnover = RollingTurnoverTracker(window)
+    turnover.update(np.nan, 100.0)
+    assert np.isclose(turnover.update(1000.0, 100.0), 10.0 * 252 / window)
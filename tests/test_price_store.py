@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+import pandas as pd
+from data import PriceStore
+
+
+def _prices(start, periods, tickers, seed=0):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range(start, periods=periods, freq='B')
+    return pd.DataFrame(100 + rng.normal(size=(periods, len(tickers))).cumsum(axis=0), index=idx, columns=tickers)
+
+
+def test_price_store_append_and_selective_read(tmp_path):
+    root = str(tmp_path / 'store')
+    first = _prices('2024-01-01', 30, ['AAA', 'BBB'])
+    store = PriceStore(root)
+    assert store.append(first) == 30
+    pd.testing.assert_frame_equal(store.read(), first, check_freq=False)
+    # later days plus a new ticker with history; overlapping rows are not rewritten
+    later = _prices('2024-02-05', 10, ['AAA', 'BBB', 'CCC'], seed=1)
+    assert later.index[0] <= first.index[-1]
+    added = store.append(later)
+    assert added == int((later.index > first.index[-1]).sum())
+    reopened = PriceStore(root)
+    assert reopened.tickers == ['AAA', 'BBB', 'CCC']
+    full = reopened.read()
+    pd.testing.assert_frame_equal(full.loc[:first.index[-1], ['AAA', 'BBB']], first, check_freq=False)
+    new_rows = later.loc[later.index > first.index[-1]]
+    pd.testing.assert_frame_equal(full.loc[new_rows.index], new_rows, check_freq=False)
+    expected_ccc = later['CCC'].reindex(full.index)
+    pd.testing.assert_series_equal(full['CCC'], expected_ccc, check_freq=False)
+    window = reopened.read(['CCC', 'AAA', 'ZZZ'], start='2024-01-10', end='2024-02-12')
+    assert list(window.columns) == ['CCC', 'AAA']
+    pd.testing.assert_frame_equal(window, full.loc['2024-01-10':'2024-02-12', ['CCC', 'AAA']])
+    assert reopened.read(start='2030-01-01').empty
+    # a torn append (bytes past the committed row count) is ignored and trimmed
+    with open(tmp_path / 'store' / 'dates.i8', 'ab') as fh:
+        fh.write(b'\0' * 8)
+    assert len(PriceStore(root).read()) == len(full)
+    PriceStore(root).append(_prices('2024-06-03', 2, ['AAA'], seed=2))
+    tail = PriceStore(root).read(start='2024-06-01')
+    assert len(tail) == 2 and tail[['BBB', 'CCC']].isna().all().all()
+
+
+def test_ohlcv_store_field_views_and_indicators(tmp_path):
+    from data import SyntheticProvider, get_cached_ohlcv
+    from indicators import stochastic_oscillator, stochastic_oscillator_panel
+    cache = str(tmp_path / 'ohlcv')
+    provider = SyntheticProvider(seed=4)
+    bars = get_cached_ohlcv(['AAA', 'BBB', 'CCC'], '2024-01-01', '2024-04-01', cache_dir=cache, provider=provider,
+                            copy=False)
+    assert list(bars) == ['Open', 'High', 'Low', 'Close', 'Volume']
+    reference = provider.fetch(['AAA', 'BBB', 'CCC'], '2024-01-01', '2024-04-01', fields=list(bars))
+    for field, frame in bars.items():
+        assert not frame.to_numpy().flags.writeable  # read-only view of the mapped file
+        pd.testing.assert_frame_equal(frame, reference[field], check_freq=False, check_names=False)
+    stoch = stochastic_oscillator_panel(bars, k_period=5, d_period=3)
+    single = stochastic_oscillator(pd.DataFrame({f: bars[f]['BBB'] for f in ('High', 'Low', 'Close')}), 5, 3)
+    pd.testing.assert_frame_equal(stoch.xs('BBB', axis=1, level=1), single, check_names=False)
+
+    store = PriceStore(cache)
+    store.append(provider.fetch(['DDD'], '2024-01-01', '2024-04-01', fields=store.fields))
+    before = store.read_array()
+    assert before.shape == (5, len(store), 4)
+    assert store.read(['BBB', 'CCC'], copy=False).to_numpy().flags.writeable is False
+    assert store.read(['CCC', 'DDD'], copy=False).to_numpy().flags.writeable  # spans two groups: copied
+    assert store.read(['BBB', 'CCC']).to_numpy().flags.writeable  # default: a writable copy
+    store.compact()
+    np.testing.assert_array_equal(PriceStore(cache).read_array(), before)
+    assert not PriceStore(cache).read(field='Volume', copy=False).to_numpy().flags.writeable
+
+
+def test_price_store_upgrades_original_layout(tmp_path):
+    import json
+    root = tmp_path / 'v1'
+    root.mkdir()
+    prices = _prices('2024-01-01', 10, ['AAA', 'BBB'])
+    # layout written by the first version of the store: one raw Close file per ticker
+    (root / 'dates.i8').write_bytes(prices.index.as_unit('ns').asi8.astype('<i8').tobytes())
+    for k, t in enumerate(prices.columns):
+        (root / f'col_{k:05d}.f8').write_bytes(prices[t].to_numpy().astype('<f8').tobytes())
+    (root / 'meta.json').write_text(json.dumps({'rows': 10, 'columns': {'AAA': 'col_00000.f8', 'BBB': 'col_00001.f8'}}))
+    store = PriceStore(str(root))
+    assert store.fields == ('Close',)
+    pd.testing.assert_frame_equal(store.read(), prices, check_freq=False)
+    store.append(_prices('2024-01-15', 3, ['AAA', 'CCC'], seed=1))
+    reopened = PriceStore(str(root))
+    assert len(reopened) == 13 and reopened.tickers == ['AAA', 'BBB', 'CCC']
+    reopened.compact()
+    pd.testing.assert_frame_equal(PriceStore(str(root)).read().iloc[:10, :2], prices, check_freq=False)
+    meta = json.loads((root / 'meta.json').read_text())
+    meta['version'] = 99
+    (root / 'meta.json').write_text(json.dumps(meta))
+    with pytest.raises(ValueError, match='rebuild'):
+        PriceStore(str(root))
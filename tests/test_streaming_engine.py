@@ -0,0 +1,40 @@
+import pandas as pd
+import numpy as np
+import pytest
+from engines import FactorPortfolioEngine, FactorConfig, StreamingFactorEngine
+
+
+def _make_prices():
+    # calendar-daily index so every month end is a trading row
+    idx = pd.date_range('2022-01-01', '2023-03-31', freq='D')
+    rng = np.random.default_rng(7)
+    data = 100 * np.exp(np.cumsum(rng.normal(0.0002, 0.01, (len(idx), 6)), axis=0))
+    prices = pd.DataFrame(data, index=idx, columns=[f'T{i}' for i in range(6)])
+    prices.iloc[:40, 2] = np.nan
+    return prices
+
+
+def test_streaming_engine_matches_batch_run():
+    prices = _make_prices()
+    weights = {'momentum': 0.3, 'low_vol': 0.2, 'value': 0.2, 'quality': 0.2, 'size': 0.1}
+    cfg = FactorConfig(weights=weights, top_n=2)
+    batch = FactorPortfolioEngine(config=cfg).run(prices)
+    stream = StreamingFactorEngine(config=cfg)
+    for date, bar in prices.iterrows():
+        stream.update(bar)
+    pd.testing.assert_frame_equal(batch['equity'], stream.equity)
+    # the batch engine also rebalances on the final (still open) period end
+    expected = batch['trades']
+    expected = expected[expected['date'] < prices.index[-1]]
+    key = ['date', 'symbol']
+    pd.testing.assert_frame_equal(expected.sort_values(key).reset_index(drop=True),
+                                  stream.trades.sort_values(key).reset_index(drop=True))
+
+
+def test_streaming_engine_rejects_out_of_order_bars_and_unknown_factors():
+    prices = _make_prices()
+    engine = StreamingFactorEngine().warm_up(prices.iloc[:50])
+    with pytest.raises(ValueError):
+        engine.update(prices.iloc[10])
+    with pytest.raises(ValueError):
+        StreamingFactorEngine(config=FactorConfig(weights={'custom': 1.0}))
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+from data import MembershipIndex, UniverseSnapshots
+
+
+def test_membership_index_point_in_time():
+    idx = MembershipIndex(['2024-03-01', '2024-01-01'], [['A', 'C'], ['A', 'B']])
+    assert idx.as_of('2023-12-31') == ()
+    assert idx.as_of('2024-01-01') == ('A', 'B')
+    assert idx.as_of('2024-02-29 15:30') == ('A', 'B')
+    assert idx.as_of('2024-03-01') == ('A', 'C')
+    assert idx.as_of('2030-01-01') == ('A', 'C')
+    assert MembershipIndex(['2024-01-01'], [['A']], backfill=True).as_of('2020-01-01') == ('A',)
+    dates = pd.date_range('2023-12-29', '2024-03-05', freq='B')
+    mask = idx.mask(dates)
+    assert list(mask.columns) == ['A', 'B', 'C']
+    for d in dates:
+        assert set(mask.columns[mask.loc[d]]) == set(idx.as_of(d))
+
+
+def test_universe_snapshots_ttl_and_offline_fallback(tmp_path):
+    now = [1_700_000_000.0]
+    lists = [['AAA', 'BBB'], ['AAA', 'BBB'], ['AAA', 'CCC']]
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        if not lists:
+            raise ConnectionError('offline')
+        return lists.pop(0)
+
+    snaps = UniverseSnapshots(str(tmp_path), ttl=3600, fetch=fetch, clock=lambda: now[0])
+    with pytest.raises(ValueError):
+        UniverseSnapshots(str(tmp_path / 'x'), fetch=lambda: (_ for _ in ()).throw(ValueError())).current()
+    assert snaps.current() == ['AAA', 'BBB']
+    assert snaps.current() == ['AAA', 'BBB'] and len(calls) == 1
+    now[0] += 86400
+    assert snaps.current() == ['AAA', 'BBB'] and len(calls) == 2
+    assert len(snaps.snapshots()) == 1  # unchanged list: no new version
+    now[0] += 86400
+    assert snaps.current() == ['AAA', 'CCC']
+    now[0] += 86400
+    reopened = UniverseSnapshots(str(tmp_path), ttl=3600, fetch=fetch, clock=lambda: now[0])
+    assert reopened.current() == ['AAA', 'CCC'] and len(calls) == 4
+    index = reopened.index()
+    assert len(index) == 2
+    first, second = (s['as_of'] for s in reopened.snapshots())
+    assert index.as_of(first) == ('AAA', 'BBB') and index.as_of(second) == ('AAA', 'CCC')
+
+
+def test_universe_snapshots_back_off_after_failed_fetch(tmp_path):
+    now = [1_700_000_000.0]
+    calls = []
+
+    def offline():
+        calls.append(1)
+        raise ConnectionError('offline')
+
+    UniverseSnapshots(str(tmp_path), clock=lambda: now[0], fetch=lambda: ['AAA']).current()
+    now[0] += 2 * 86400
+    snaps = UniverseSnapshots(str(tmp_path), ttl=3600, fetch=offline, clock=lambda: now[0], retry_interval=600)
+    assert snaps.current() == ['AAA'] and len(calls) == 1
+    now[0] += 300
+    assert snaps.current() == ['AAA'] and len(calls) == 1
+    # the failure is persisted, so a fresh process waits too
+    other = UniverseSnapshots(str(tmp_path), ttl=3600, fetch=offline, clock=lambda: now[0], retry_interval=600)
+    assert other.current() == ['AAA'] and len(calls) == 1
+    now[0] += 301
+    assert other.current() == ['AAA'] and len(calls) == 2
@@ -24,6 +24,26 @@ def test_zscore_rolling_series():
     assert z.isna().sum() == 0
 
 
+def test_cross_sectional_normalization_matches_pandas():
+    from utils import cross_sectional_zscore, cross_sectional_rank, winsorized_zscore
+    rng = np.random.default_rng(0)
+    panel = pd.DataFrame(np.round(rng.normal(size=(50, 12)), 1))
+    panel[rng.random(panel.shape) < 0.3] = np.nan  # per-date universes
+    panel.iloc[0] = np.nan
+    panel.iloc[1] = 3.0
+    body = panel.iloc[2:]
+    z = cross_sectional_zscore(panel)
+    expected = body.sub(body.mean(axis=1), axis=0).div(body.std(axis=1, ddof=0), axis=0)
+    pd.testing.assert_frame_equal(z.iloc[2:], expected)
+    assert z.iloc[0].isna().all() and (z.iloc[1] == 0).all()
+    pd.testing.assert_frame_equal(cross_sectional_rank(panel), panel.rank(axis=1, pct=True))
+    q = body.quantile([0.1, 0.9], axis=1)
+    clipped = body.clip(q.loc[0.1], q.loc[0.9], axis=0)
+    expected = clipped.sub(clipped.mean(axis=1), axis=0).div(clipped.std(axis=1, ddof=0), axis=0)
+    pd.testing.assert_frame_equal(winsorized_zscore(panel, 0.1, 0.9).iloc[2:], expected)
+    assert isinstance(cross_sectional_rank(panel.to_numpy()), np.ndarray)
+
+
 def test_rolling_beta():
     x = pd.Series(np.arange(100).astype(float))
     y = 2 * x + np.random.normal(0, 0.1, size=len(x))
@@ -37,3 +57,74 @@ def test_parameter_grid():
     assert isinstance(grid, list)
     assert len(grid) == 2
     assert all('a' in g and 'b' in g for g in grid)
+
+
+def test_rebalance_schedule_matches_get_indexer():
+    from utils.schedule import RebalanceSchedule
+    idx = pd.date_range('2023-01-01', periods=400, freq='B')
+    frame = pd.DataFrame({'a': 1.0}, index=idx)
+    for freq in ['M', 'MS', 'W-FRI', 'Q', 'QS']:
+        plan = RebalanceSchedule(freq=freq).map(idx)
+        points = frame.resample(RebalanceSchedule(freq=freq).rule).last().index
+        assert (plan.points == points).all()
+        assert (plan.pos == idx.get_indexer(points, method='nearest')).all()
+        assert (RebalanceSchedule(freq=freq, align='previous').map(idx).pos == idx.get_indexer(points, method='pad')).all()
+        assert plan.next_pos[-1] == len(idx) - 1
+        assert (plan.next_pos[:-1] == plan.pos[1:]).all()
+        assert (plan.end_pos[:-1] == idx.searchsorted(points[1:], side='right') - 1).all()
+
+
+def test_rebalance_schedule_custom_calendar():
+    from utils.schedule import RebalanceSchedule
+    idx = pd.date_range('2024-01-01', periods=30, freq='B')
+    plan = RebalanceSchedule(dates=['2024-01-06', '2024-01-02', '2030-01-01'], align='next').map(idx)
+    assert list(plan.points) == list(pd.to_datetime(['2024-01-02', '2024-01-06', '2030-01-01']))
+    assert list(plan.pos) == [1, 5, -1]
+
+
+def test_rolling_beta_matches_polyfit_and_panel():
+    from utils import rolling_beta_panel
+    rng = np.random.default_rng(0)
+    bench = pd.Series(rng.normal(0, 0.01, 200))
+    panel = pd.DataFrame({c: b * bench + rng.normal(0, 0.005, 200) for c, b in zip('ABC', (0.5, 1.0, 2.0))})
+    panel.iloc[50, 1] = np.nan
+    window = 30
+    rb = rolling_beta(bench, panel['A'], window=window)
+    for i in (window - 1, 100, 199):
+        expected = np.polyfit(bench.iloc[i - window + 1:i + 1], panel['A'].iloc[i - window + 1:i + 1], 1)[0]
+        assert np.isclose(rb.iloc[i], expected, rtol=1e-9)
+    betas = rolling_beta_panel(panel, bench, window=window)
+    pd.testing.assert_series_equal(betas['A'], rb, check_names=False)
+    assert betas['B'].iloc[50:50 + window].isna().all() and betas['B'].iloc[50 + window:].notna().all()
+    pairwise = rolling_beta_panel(panel, window=window)
+    pd.testing.assert_series_equal(pairwise[('C', 'A')], rolling_beta(panel['A'], panel['C'], window), check_names=False)
+    assert rolling_beta(pd.Series(np.ones(40)), bench.iloc[:40], window=10).isna().all()
+
+
+def _score(params):
+    return {'score': params['a'] * 10 + params['b']}
+
+
+def test_parameter_search_lazy_sampled_and_parallel(tmp_path):
+    from utils import (iter_parameter_grid, grid_size, grid_point, ParamRange, random_parameters,
+                       latin_hypercube, run_search, write_search)
+    space = {'a': [1, 2, 3], 'b': [4, 5], 'c': ['x', 'y']}
+    grid = parameter_grid(space)
+    assert list(iter_parameter_grid(space)) == grid
+    assert grid_size(space) == len(grid) == 12
+    assert [grid_point(space, i) for i in range(12)] == grid
+    lhs = list(latin_hypercube({'a': [1, 2, 3, 4], 'x': ParamRange(0.0, 1.0)}, n=8, seed=0))
+    assert sorted(p['a'] for p in lhs) == [1, 1, 2, 2, 3, 3, 4, 4]
+    assert sorted(int(p['x'] * 8) for p in lhs) == list(range(8))
+    sampled = list(random_parameters({'k': ParamRange(1, 100, log=True, integer=True)}, n=50, seed=1))
+    assert all(1 <= p['k'] < 100 and isinstance(p['k'], int) for p in sampled)
+    assert ParamRange(0, 5, integer=True).scale(np.array([0.0, 0.999, 1.0])) == [0, 4, 4]
+    serial = run_search(_score, iter_parameter_grid(space), n_jobs=1)
+    pooled = run_search(_score, iter_parameter_grid(space), n_jobs=2, batch_size=5, max_in_flight=1)
+    pd.testing.assert_frame_equal(serial, pooled)
+    assert serial['trial'].tolist() == list(range(12))
+    assert (serial['score'] == serial['a'] * 10 + serial['b']).all()
+    out = tmp_path / 'search.csv'
+    assert write_search(str(out), _score, iter_parameter_grid(space), n_jobs=2, batch_size=3) == 12
+    written = pd.read_csv(out).sort_values('trial').reset_index(drop=True)
+    pd.testing.assert_frame_equal(written, serial)
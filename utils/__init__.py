@@ -2,13 +2,23 @@
 
 Expose small reusable helpers used throughout the project:
 - `zscore`: global and rolling z-score normalization
-- `rolling_beta`: rolling regression beta estimator
-- `parameter_grid`: grid search helper
+- `cross_sectional_zscore` / `cross_sectional_rank` / `winsorized_zscore`:
+  per-date normalization of a whole date x asset factor panel in one call
+- `rolling_beta` / `rolling_beta_panel`: O(n) rolling regression betas for one
+  pair, or a whole panel against a benchmark or pairwise
+- `parameter_grid` / `iter_parameter_grid`: grid search helpers (list or lazy)
+- `random_parameters` / `latin_hypercube` / `run_search` / `write_search`:
+  sampled search spaces evaluated over a process pool with bounded in-flight
+  work, collected into a DataFrame or streamed to CSV
+- `RebalanceSchedule`: rebalance calendar mapped onto trading-row positions
 
 Import like: from utils import zscore
 """
 from .stats import zscore
-from .stats import rolling_beta
-from .grid import parameter_grid
+from .stats import cross_sectional_zscore, cross_sectional_rank, winsorized_zscore
+from .stats import rolling_beta, rolling_beta_panel
+from .grid import parameter_grid, iter_parameter_grid, grid_size, grid_point
+from .search import ParamRange, random_parameters, latin_hypercube, iter_search, run_search, write_search
+from .schedule import RebalanceSchedule
 
-__all__ = ["zscore", "rolling_beta", "parameter_grid"]
+__all__ = ["zscore", "cross_sectional_zscore", "cross_sectional_rank", "winsorized_zscore", "rolling_beta", "rolling_beta_panel", "parameter_grid", "iter_parameter_grid", "grid_size", "grid_point", "ParamRange", "random_parameters", "latin_hypercube", "iter_search", "run_search", "write_search", "RebalanceSchedule"]
@@ -1,5 +1,35 @@
 from __future__ import annotations
-from typing import Dict, Iterable, List
+import math
+from itertools import product
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence
+
+
+def iter_parameter_grid(param_dict: Mapping[str, Iterable]) -> Iterator[Dict[str, Any]]:
+    """Lazily yield the parameter dicts of a grid, in `parameter_grid` order.
+
+    Only the per-key value lists are held in memory, never the product.
+    """
+    keys = list(param_dict.keys())
+    for combo in product(*(list(v) for v in param_dict.values())):
+        yield dict(zip(keys, combo))
+
+
+def grid_size(param_dict: Mapping[str, Sequence]) -> int:
+    """Number of points in the grid without enumerating it."""
+    return math.prod(len(list(v)) for v in param_dict.values())
+
+
+def grid_point(param_dict: Mapping[str, Sequence], i: int) -> Dict[str, Any]:
+    """The `i`-th dict of `parameter_grid(param_dict)` (mixed-radix decode, O(keys))."""
+    values = [list(v) for v in param_dict.values()]
+    size = math.prod(len(v) for v in values)
+    if not 0 <= i < size:
+        raise IndexError(f"grid index {i} out of range for {size} points")
+    combo = []
+    for v in reversed(values):
+        i, r = divmod(i, len(v))
+        combo.append(v[r])
+    return dict(zip(param_dict.keys(), reversed(combo)))
 
 
 def parameter_grid(param_dict: Dict[str, Iterable]) -> List[Dict[str, object]]:
@@ -7,9 +37,6 @@ def parameter_grid(param_dict: Dict[str, Iterable]) -> List[Dict[str, object]]:
 
     Example: parameter_grid({'n':[2,3], 'lookback':[60,120]})
     """
-    from itertools import product
-    keys = list(param_dict.keys())
-    grids: List[Dict[str, object]] = []
-    for combo in product(*param_dict.values()):
-        grids.append({k: v for k, v in zip(keys, combo)})
-    return grids
+    return list(iter_parameter_grid(param_dict))
+
+__all__ = ['iter_parameter_grid', 'grid_size', 'grid_point', 'parameter_grid']
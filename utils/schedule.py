@@ -0,0 +1,117 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Friendly aliases for pandas resample rules.
+FREQ_ALIASES = {
+    'W': 'W-FRI',
+    'Q': 'Q-DEC',
+    'QE': 'Q-DEC',
+    'A': 'A-DEC',
+    'Y': 'A-DEC',
+}
+
+ALIGN_MODES = ('nearest', 'previous', 'next')
+
+
+@dataclass
+class RebalancePoints:
+    """Calendar rebalance points mapped onto row positions of a trading index.
+
+    Attributes
+    - points: calendar rebalance points (resample labels or custom dates).
+    - pos: aligned trading-row position of each point (-1 when none exists).
+    - next_pos: aligned position of the following point; the last point maps
+      to the final row.
+    - end_pos: last trading row on or before the following point (the final
+      row for the last point), i.e. where a holding period ends.
+    """
+
+    points: pd.DatetimeIndex
+    pos: np.ndarray
+    next_pos: np.ndarray
+    end_pos: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+
+@dataclass
+class RebalanceSchedule:
+    freq: str = 'M'
+    dates: Optional[Sequence] = None
+    align: str = 'nearest'
+    """Rebalance calendar shared by the portfolio engines.
+
+    Attributes
+    - freq: pandas resample rule ('M', 'MS', 'W-FRI', 'Q', 'QS', ...); 'W',
+      'Q' and 'A'/'Y' are accepted as aliases. Points are the resample bin
+      labels over the trading index, exactly as `prices.resample(freq)` would
+      produce them.
+    - dates: optional custom calendar; when given it replaces `freq`.
+    - align: how a point that is not a trading day maps onto the index:
+      'nearest' (ties go to the later row, like `get_indexer(method='nearest')`),
+      'previous' (last row on or before) or 'next' (first row on or after).
+
+    `map(index)` resolves every point, its successor and the holding-period
+    end with a single `searchsorted` call, so engine loops can index plain
+    integer arrays instead of scanning the index per rebalance.
+    """
+
+    def __post_init__(self) -> None:
+        if self.align not in ALIGN_MODES:
+            raise ValueError(f"align must be one of {ALIGN_MODES}, got {self.align!r}")
+
+    @property
+    def rule(self) -> str:
+        return FREQ_ALIASES.get(self.freq.upper(), self.freq)
+
+    def calendar_points(self, index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+        """Calendar rebalance points covering `index`."""
+        if self.dates is not None:
+            return pd.DatetimeIndex(sorted(pd.to_datetime(list(self.dates))))
+        if len(index) == 0:
+            return pd.DatetimeIndex([])
+        return pd.Series(0, index=index).resample(self.rule).size().index
+
+    def map(self, index: pd.DatetimeIndex) -> RebalancePoints:
+        """Map calendar points onto row positions of the sorted trading `index`."""
+        index = pd.DatetimeIndex(index)
+        points = self.calendar_points(index)
+        n = len(index)
+        if len(points) == 0:
+            empty = np.array([], dtype=int)
+            return RebalancePoints(points=points, pos=empty, next_pos=empty.copy(), end_pos=empty.copy())
+        # one pass: the last row on or before each point
+        left = index.searchsorted(points, side='right') - 1
+        exact = np.zeros(len(points), dtype=bool)
+        valid = left >= 0
+        exact[valid] = index[left[valid]] == points[valid]
+        right = np.where(exact, left, left + 1)
+        pos = self._align(index, points, left, right)
+        end_pos = np.append(left[1:], n - 1).astype(int)
+        next_pos = np.append(pos[1:], n - 1).astype(int)
+        return RebalancePoints(points=points, pos=pos, next_pos=next_pos, end_pos=end_pos)
+
+    def _align(self, index: pd.DatetimeIndex, points: pd.DatetimeIndex,
+               left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        n = len(index)
+        if n == 0:
+            return np.full(len(points), -1)
+        has_left = left >= 0
+        has_right = right < n
+        if self.align == 'previous':
+            return np.where(has_left, left, -1)
+        if self.align == 'next':
+            return np.where(has_right, right, -1)
+        values = index.asi8
+        target = points.asi8
+        left_dist = np.where(has_left, target - values[np.clip(left, 0, n - 1)], np.iinfo(np.int64).max)
+        right_dist = np.where(has_right, values[np.clip(right, 0, n - 1)] - target, np.iinfo(np.int64).max)
+        pos = np.where(left_dist < right_dist, left, right)
+        return np.where(pos >= n, -1, pos)
+
+__all__ = ['RebalanceSchedule', 'RebalancePoints']
@@ -0,0 +1,160 @@
+from __future__ import annotations
+import csv
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+Evaluator = Callable[[Dict[str, Any]], Mapping[str, Any]]
+
+
+@dataclass(frozen=True)
+class ParamRange:
+    """Continuous search dimension for `random_parameters` / `latin_hypercube`.
+
+    Values are drawn from [low, high), on a log scale with `log=True`, and
+    rounded to int with `integer=True`. Any other space value is treated as a
+    discrete sequence of choices.
+    """
+
+    low: float
+    high: float
+    log: bool = False
+    integer: bool = False
+
+    def scale(self, u: np.ndarray) -> List[Any]:
+        """Map uniform [0, 1) draws onto the range."""
+        if self.log:
+            lo, hi = math.log(self.low), math.log(self.high)
+            x = np.exp(lo + u * (hi - lo))
+        else:
+            x = self.low + u * (self.high - self.low)
+        if self.integer:
+            # the integers in [low, high); the clip only absorbs rounding at the edges
+            return [int(v) for v in np.clip(np.floor(x), math.ceil(self.low), math.ceil(self.high) - 1)]
+        return x.tolist()
+
+
+def _materialize(space: Mapping[str, Any], u: np.ndarray) -> Iterator[Dict[str, Any]]:
+    """Turn an (n, dims) matrix of uniform draws into parameter dicts."""
+    columns = []
+    for j, spec in enumerate(space.values()):
+        if isinstance(spec, ParamRange):
+            columns.append(spec.scale(u[:, j]))
+        else:
+            choices = list(spec)
+            picks = np.minimum((u[:, j] * len(choices)).astype(np.int64), len(choices) - 1)
+            columns.append([choices[k] for k in picks])
+    keys = list(space.keys())
+    for combo in zip(*columns):
+        yield dict(zip(keys, combo))
+
+
+def random_parameters(space: Mapping[str, Any], n: int, seed: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """`n` independent uniform draws from `space` (with replacement).
+
+    Discrete sequences are sampled uniformly over their items; `ParamRange`
+    dimensions continuously. Reproducible for a given `seed`.
+    """
+    rng = np.random.default_rng(seed)
+    return _materialize(space, rng.random((n, len(space))))
+
+
+def latin_hypercube(space: Mapping[str, Any], n: int, seed: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """`n` Latin-hypercube samples from `space`.
+
+    Each dimension is cut into `n` equal strata and every stratum is hit
+    exactly once, so marginals are covered evenly with far fewer points than
+    a grid (a discrete dimension with k items gets each item ~n/k times).
+    """
+    rng = np.random.default_rng(seed)
+    dims = len(space)
+    strata = np.argsort(rng.random((n, dims)), axis=0)
+    u = (strata + rng.random((n, dims))) / max(n, 1)
+    return _materialize(space, u)
+
+
+def _batched(items: Iterable, size: int) -> Iterator[List]:
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _evaluate_batch(evaluate: Evaluator, batch: Sequence[Tuple[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    return [{'trial': i, **params, **evaluate(params)} for i, params in batch]
+
+
+def iter_search(evaluate: Evaluator, params: Iterable[Dict[str, Any]], n_jobs: Optional[int] = None,
+                batch_size: int = 1, max_in_flight: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Evaluate parameter dicts and yield result rows as they complete.
+
+    Each row is `{'trial': i, **params, **evaluate(params)}`, where `i` is
+    the position in `params`. `params` is consumed lazily (e.g. from
+    `iter_parameter_grid` or the samplers above): work is submitted to a
+    process pool of `n_jobs` workers (default: CPU count) in batches of
+    `batch_size`, with at most `max_in_flight` batches (default
+    `2 * n_jobs`) pending, so memory stays bounded for any number of points.
+    `evaluate` must be picklable (a module-level function or a `partial` of
+    one). `n_jobs=1` runs inline without a pool.
+    """
+    batches = _batched(enumerate(params), max(int(batch_size), 1))
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1:
+        for batch in batches:
+            yield from _evaluate_batch(evaluate, batch)
+        return
+    limit = max_in_flight or 2 * n_jobs
+    pool = ProcessPoolExecutor(max_workers=n_jobs)
+    try:
+        pending = set()
+        for batch in batches:
+            if len(pending) >= limit:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+            pending.add(pool.submit(_evaluate_batch, evaluate, batch))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def run_search(evaluate: Evaluator, params: Iterable[Dict[str, Any]], n_jobs: Optional[int] = None,
+               batch_size: int = 1, max_in_flight: Optional[int] = None) -> pd.DataFrame:
+    """`iter_search` collected into a DataFrame, one row per trial in input order."""
+    rows = list(iter_search(evaluate, params, n_jobs, batch_size, max_in_flight))
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame(rows).sort_values('trial', kind='stable').reset_index(drop=True)
+
+
+def write_search(path: str, evaluate: Evaluator, params: Iterable[Dict[str, Any]], n_jobs: Optional[int] = None,
+                 batch_size: int = 1, max_in_flight: Optional[int] = None) -> int:
+    """Stream `iter_search` rows to a CSV file as they complete; return the row count.
+
+    Rows are written in completion order (sort by 'trial' to restore input
+    order); the header comes from the first row. Nothing is kept in memory,
+    so this suits spaces too large for `run_search`.
+    """
+    count = 0
+    with open(path, 'w', newline='') as fh:
+        writer = None
+        for row in iter_search(evaluate, params, n_jobs, batch_size, max_in_flight):
+            if writer is None:
+                writer = csv.DictWriter(fh, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+            count += 1
+    return count
+
+__all__ = [
+    'ParamRange', 'random_parameters', 'latin_hypercube',
+    'iter_search', 'run_search', 'write_search',
+]
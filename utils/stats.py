@@ -1,4 +1,5 @@
 from __future__ import annotations
+import warnings
 from typing import Optional
 
 import pandas as pd
@@ -53,16 +54,160 @@ def zscore(data: pd.Series | pd.DataFrame,
     return out
 
 
+def _panel_values(panel: pd.DataFrame | np.ndarray) -> np.ndarray:
+    values = np.array(panel, dtype=float)
+    if values.ndim != 2:
+        raise ValueError("expected a 2D date x asset panel")
+    return values
+
+
+def _like(panel: pd.DataFrame | np.ndarray, values: np.ndarray) -> pd.DataFrame | np.ndarray:
+    if isinstance(panel, pd.DataFrame):
+        return pd.DataFrame(values, index=panel.index, columns=panel.columns)
+    return values
+
+
+def cross_sectional_zscore(panel: pd.DataFrame | np.ndarray, ddof: int = 0) -> pd.DataFrame | np.ndarray:
+    """Z-score every row (date) of a date x asset panel across its assets.
+
+    NaNs mark assets outside that date's universe: they are skipped in the
+    moments and stay NaN, so universes may vary per date. A row with zero
+    spread maps its valid entries to 0 (like `zscore` on a constant Series);
+    a row with too few values for `ddof` is all NaN.
+    """
+    values = _panel_values(panel)
+    valid = ~np.isnan(values)
+    n = valid.sum(axis=1, keepdims=True)
+    x = np.where(valid, values, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mu = x.sum(axis=1, keepdims=True) / n
+        dev = np.where(valid, values - mu, 0.0)
+        sigma = np.sqrt((dev * dev).sum(axis=1, keepdims=True) / (n - ddof))
+        out = np.where(valid, dev / sigma, np.nan)
+    flat = np.isclose(sigma, 0)[:, 0]
+    out[flat] = np.where(valid[flat], 0.0, np.nan)
+    return _like(panel, out)
+
+
+def cross_sectional_rank(panel: pd.DataFrame | np.ndarray, pct: bool = True) -> pd.DataFrame | np.ndarray:
+    """Rank every row of a date x asset panel across its assets.
+
+    Ties get their average rank and NaNs stay NaN, matching
+    `DataFrame.rank(axis=1, pct=pct)`; with `pct` the ranks are divided by the
+    number of valid assets on that date. One sort for the whole panel.
+    """
+    values = _panel_values(panel)
+    rows, cols = values.shape
+    out = np.full_like(values, np.nan)
+    if values.size == 0:
+        return _like(panel, out)
+    order = np.argsort(values, axis=1, kind='stable')  # NaNs sort last
+    ordered = np.take_along_axis(values, order, axis=1)
+    # tie groups: a new group starts at each row start and at each change in value
+    starts = np.ones_like(ordered, dtype=bool)
+    starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    group = np.cumsum(starts.ravel()) - 1
+    position = np.tile(np.arange(1, cols + 1, dtype=float), rows)
+    avg = np.bincount(group, weights=position) / np.bincount(group)
+    ranks = avg[group].reshape(rows, cols)
+    np.put_along_axis(out, order, ranks, axis=1)
+    valid = ~np.isnan(values)
+    out[~valid] = np.nan
+    if pct:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out /= valid.sum(axis=1, keepdims=True)
+    return _like(panel, out)
+
+
+def winsorized_zscore(panel: pd.DataFrame | np.ndarray, lower: float = 0.01, upper: float = 0.99,
+                      ddof: int = 0) -> pd.DataFrame | np.ndarray:
+    """Cross-sectional z-score after clipping each date to its own quantiles.
+
+    Values below the `lower` / above the `upper` quantile of their row
+    (linear interpolation over the valid assets, as `Series.quantile`) are
+    clipped before `cross_sectional_zscore`, limiting the pull of outliers.
+    """
+    if not 0 <= lower <= upper <= 1:
+        raise ValueError("expected 0 <= lower <= upper <= 1")
+    values = _panel_values(panel)
+    ordered = np.sort(values, axis=1)  # NaNs sort last
+    n = (~np.isnan(values)).sum(axis=1, keepdims=True)
+    bounds = []
+    for q in (lower, upper):
+        h = np.maximum(n - 1, 0) * q
+        lo = np.floor(h).astype(int)
+        hi = np.minimum(lo + 1, np.maximum(n - 1, 0))
+        a = np.take_along_axis(ordered, lo, axis=1)
+        b = np.take_along_axis(ordered, hi, axis=1)
+        bounds.append(a + (b - a) * (h - lo))
+    clipped = np.clip(values, bounds[0], bounds[1])
+    return _like(panel, cross_sectional_zscore(clipped, ddof=ddof))
+
+
+def _rolling_beta_values(x: np.ndarray, y: np.ndarray, window: int) -> np.ndarray:
+    """Rolling OLS slope of y on x along axis 0 from windowed sums, O(n).
+
+    `x` and `y` broadcast against each other (n, ...). Both are centred on
+    their mean first (the slope is shift-invariant) so the running sums stay
+    well conditioned for price-level inputs. Windows holding a non-finite
+    value or a constant `x` are NaN; the first `window - 1` rows are NaN.
+    """
+    if window < 1:
+        raise ValueError("window must be >= 1")
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    n = x.shape[0]
+    out = np.full(x.shape, np.nan)
+    if n < window:
+        return out
+    finite = np.isfinite(x) & np.isfinite(y)
+    with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # columns without finite pairs
+        xc = np.where(finite, x - np.nanmean(np.where(finite, x, np.nan), axis=0), 0.0)
+        yc = np.where(finite, y - np.nanmean(np.where(finite, y, np.nan), axis=0), 0.0)
+
+    def window_sums(a: np.ndarray) -> np.ndarray:
+        c = np.cumsum(a, axis=0)
+        c = np.concatenate([np.zeros((1,) + a.shape[1:]), c])
+        return c[window:] - c[:-window]
+
+    bad = window_sums((~finite).astype(float)) > 0
+    sx, sy, sxx = window_sums(xc), window_sums(yc), window_sums(xc * xc)
+    cov = window_sums(xc * yc) - sx * sy / window
+    var = sxx - sx * sx / window
+    with np.errstate(invalid='ignore', divide='ignore'):
+        beta = cov / var
+    # a constant x leaves only rounding noise in `var`
+    beta[bad | (var <= 1e-12 * sxx)] = np.nan
+    out[window - 1:] = beta
+    return out
+
+
 def rolling_beta(x: pd.Series, y: pd.Series, window: int = 60) -> pd.Series:
-    """Estimate rolling beta of y ~ x using simple OLS per window."""
-    betas: list[float] = []
-    idx = x.index
-    for i in range(window, len(x) + 1):
-        xx = x.iloc[i - window:i].values
-        yy = y.iloc[i - window:i].values
-        if np.all(np.isfinite(xx)) and np.all(np.isfinite(yy)):
-            beta = np.polyfit(xx, yy, 1)[0]
-        else:
-            beta = np.nan
-        betas.append(beta)
-    return pd.Series([np.nan] * (window - 1) + betas, index=idx)
+    """Estimate rolling beta of y ~ x using simple OLS per window.
+
+    Computed from rolling sums of x, y, xy and xx in O(n); `x` and `y` are
+    paired by position. Windows with a missing value (or a constant `x`)
+    give NaN, as do the first `window - 1` rows.
+    """
+    beta = _rolling_beta_values(x.to_numpy(dtype=float), np.asarray(y, dtype=float)[:len(x)], window)
+    return pd.Series(beta, index=x.index)
+
+
+def rolling_beta_panel(returns: pd.DataFrame, benchmark: Optional[pd.Series] = None,
+                       window: int = 60) -> pd.DataFrame:
+    """Rolling betas for a whole returns panel in one vectorized call.
+
+    With a `benchmark` Series (aligned on the index), returns a date x asset
+    frame of each column's beta on the benchmark. Without one, returns the
+    pairwise betas as (asset, regressor) MultiIndex columns, where column
+    (a, b) is the rolling beta of `a` on `b`; that needs memory for
+    n_dates x n_assets^2 values.
+    """
+    values = returns.to_numpy(dtype=float)
+    if benchmark is not None:
+        bench = benchmark.reindex(returns.index).to_numpy(dtype=float)
+        beta = _rolling_beta_values(bench[:, None], values, window)
+        return pd.DataFrame(beta, index=returns.index, columns=returns.columns)
+    beta = _rolling_beta_values(values[:, None, :], values[:, :, None], window)
+    columns = pd.MultiIndex.from_product([returns.columns, returns.columns], names=['asset', 'regressor'])
+    return pd.DataFrame(beta.reshape(len(returns), -1), index=returns.index, columns=columns)